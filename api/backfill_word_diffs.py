@@ -0,0 +1,59 @@
+import asyncio
+from sqlalchemy import select, update
+from database import SessionLocal, engine
+from models import Correction
+from services.stats import rebuild_correction_stats
+from services.user import bump_history_versions
+from utils.diff import count_changes, word_diff
+
+"""
+Word Diff Backfill Script
+
+This script stores the word diff of corrections created before diffs were
+stored with each correction, in batches, and recomputes their change counts
+from it. The history version of every user it touches is bumped, so cached
+history pages are revalidated. Until it runs,
+GET /corrections/{id}?include_diff=true computes the missing diffs on every
+read. The statistics are rebuilt at the end, since the change counts may
+differ from the previous word matcher.
+
+Usage:
+    python backfill_word_diffs.py
+"""
+
+BATCH_SIZE = 500
+
+async def backfill_word_diffs_async():
+    """
+    Stores the missing word diffs and rebuilds the correction statistics.
+    """
+    done = 0
+    last_id = 0
+    async with SessionLocal() as db:
+        while True:
+            rows = (await db.execute(
+                select(Correction.id, Correction.user_id, Correction.original_text, Correction.corrected_text)
+                .where(Correction.id > last_id, Correction.word_diff.is_(None))
+                .order_by(Correction.id)
+                .limit(BATCH_SIZE)
+            )).all()
+            if not rows:
+                break
+            values = []
+            for row_id, _, original, corrected in rows:
+                diff = await asyncio.to_thread(word_diff, original or "", corrected or "")
+                values.append({"id": row_id, "word_diff": diff, "change_count": count_changes(diff)})
+            await db.execute(update(Correction), values)
+            # Change counts are part of the summaries: cached history pages must be revalidated
+            await bump_history_versions(db, (row[1] for row in rows if row[1] is not None))
+            await db.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"Stored {done} word diffs", flush=True)
+        if done:
+            await rebuild_correction_stats(db)
+    print(f"Backfilled word diffs of {done} corrections.")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(backfill_word_diffs_async())
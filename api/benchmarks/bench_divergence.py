@@ -0,0 +1,135 @@
+import os
+import random
+import sys
+import time
+
+"""
+Correction Validation Benchmark
+
+Times the sentence-level divergence check on 100k-character texts, for the
+answers a model typically gives: light corrections, a few rewritten or
+invented sentences, merged sentences, and a complete rewrite. The same text
+without any punctuation checks that run-on sentences stay linear too.
+
+Usage:
+    python benchmarks/bench_divergence.py
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+os.environ.setdefault("MODEL_NAME", "bench")
+
+from utils.divergence import split_segments, validate_correction
+
+TEXT_CHARS = 100_000
+REPEATS = 5
+
+WORDS = (
+    "le la les un une des et ou mais donc car est sont nous vous ils maison jardin "
+    "voiture matin soir travail projet équipe réunion rapport client produit marché "
+    "semaine journée question réponse problème solution idée exemple texte phrase"
+).split()
+
+def make_sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 24))]
+    return " ".join(words).capitalize() + rng.choice(".!?")
+
+def make_text(rng: random.Random) -> list:
+    sentences = []
+    length = 0
+    while length < TEXT_CHARS:
+        sentence = make_sentence(rng)
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return sentences
+
+def join(sentences: list) -> str:
+    # A paragraph break every five sentences
+    return "".join(s + ("\n\n" if i % 5 == 4 else " ") for i, s in enumerate(sentences)).strip()
+
+def typo(sentence: str, rng: random.Random) -> str:
+    words = sentence.split()
+    # The last word carries the punctuation that ends the sentence
+    index = rng.randrange(len(words) - 1)
+    words[index] = words[index][::-1]
+    return " ".join(words)
+
+def scenarios(original: list, rng: random.Random) -> dict:
+    light = [typo(s, rng) if rng.random() < 0.5 else s for s in original]
+    rewritten = [make_sentence(rng) if rng.random() < 0.05 else s for s in light]
+    invented = []
+    for sentence in light:
+        invented.append(sentence)
+        if rng.random() < 0.05:
+            invented.append(make_sentence(rng))
+    merged = []
+    joined = False
+    for sentence in light:
+        # Pairs of sentences joined with a comma, as models do
+        joined = bool(merged) and not joined and rng.random() < 0.1
+        if joined:
+            merged[-1] = merged[-1][:-1] + ", " + sentence[0].lower() + sentence[1:]
+        else:
+            merged.append(sentence)
+    return {
+        "identical": original,
+        "light corrections": light,
+        "5% rewritten": rewritten,
+        "5% invented": invented,
+        "10% merged": merged,
+        "complete rewrite": [make_sentence(rng) for _ in original]
+    }
+
+def run_on(sentences: list) -> str:
+    # The whole text as one unpunctuated line
+    return " ".join(s.rstrip(".!?").lower() for s in sentences)
+
+def word_edits(text: str, rate: float, rng: random.Random) -> str:
+    # Words reversed, dropped or followed by an extra word, each at a third of the rate
+    words = []
+    for word in text.split():
+        draw = rng.random()
+        if draw < rate / 3:
+            words.append(word[::-1])
+        elif draw < rate * 2 / 3:
+            continue
+        elif draw < rate:
+            words.extend((word, rng.choice(WORDS)))
+        else:
+            words.append(word)
+    return " ".join(words)
+
+def run_on_scenarios(original: str, rng: random.Random) -> dict:
+    return {
+        "run-on identical": original,
+        "run-on 2% edits": word_edits(original, 0.02, rng),
+        "run-on 10% edits": word_edits(original, 0.1, rng)
+    }
+
+def time_validation(name: str, original: str, corrected: str) -> None:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        _, rejected, _ = validate_correction(original, corrected)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{name:<20} {rejected:>8} {best * 1000:>9.1f} {len(original) / best / 1e6:>7.2f}")
+
+def main() -> None:
+    rng = random.Random(7)
+    original_sentences = make_text(rng)
+    original = join(original_sentences)
+    print(f"Original: {len(original)} chars, {len(split_segments(original))} sentences, {len(original.split())} words")
+    print(f"{'scenario':<20} {'rejected':>8} {'best ms':>9} {'MB/s':>7}")
+    for name, sentences in scenarios(original_sentences, rng).items():
+        time_validation(name, original, join(sentences))
+    original = run_on(original_sentences)
+    for name, corrected in run_on_scenarios(original, rng).items():
+        time_validation(name, original, corrected)
+
+if __name__ == "__main__":
+    main()
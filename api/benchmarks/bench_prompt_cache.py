@@ -0,0 +1,107 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+import httpx
+
+"""
+Prompt Prefix Reuse Benchmark
+
+Sends the same texts to a running Ollama with two prompt layouts and compares
+the prompt evaluation Ollama reports:
+
+- legacy: the language hint first, the instructions and the text in one
+  prompt, so the prefix changes whenever the language does;
+- templated: the fixed instructions as system prompt, then the language hint
+  and the text, so every request starts with the same tokens and Ollama can
+  reuse the cached evaluation of the prefix.
+
+Languages alternate between requests, which is the worst case for the legacy
+layout. Needs a reachable Ollama with the model pulled.
+
+Usage:
+    python benchmarks/bench_prompt_cache.py [--url http://localhost:11434/api/generate] [--model llama3.2] [--requests 20]
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.prompts import LANGUAGE_HINTS, SYSTEM_PREFIX, build_prompt
+
+TEXTS = {
+    "fr": "Je pense que les enfant sont aller a l'école ce matin mais il pleuvait beaucoups.",
+    "en": "I think teh children has gone to school this morning but it was raining alot."
+}
+
+def legacy_prompt(text: str, language: str) -> str:
+    # Layout used before prompt version 2
+    head, body = SYSTEM_PREFIX.split("\n\n", 1)
+    return (
+        f"{head}\n    \n{LANGUAGE_HINTS[language]}\n\n{body}\n\n"
+        f"## TEXTE À CORRIGER:\n{text}\n\n## RÉPONSE (texte corrigé uniquement):"
+    )
+
+def run(client: httpx.Client, url: str, model: str, layout: str, requests: int) -> Dict[str, List[float]]:
+    """
+    Sends the requests of one layout and collects Ollama's prompt statistics.
+
+    Args:
+        client (httpx.Client): The HTTP client
+        url (str): The Ollama generate endpoint
+        model (str): The model to use
+        layout (str): "legacy" or "templated"
+        requests (int): Number of requests
+
+    Returns:
+        Dict[str, List[float]]: Evaluated prompt tokens, prompt eval and total latency per request
+    """
+    results: Dict[str, List[float]] = {"tokens": [], "prompt_ms": [], "total_ms": []}
+    languages = list(TEXTS)
+    for index in range(requests):
+        language = languages[index % len(languages)]
+        payload = {
+            "model": model,
+            "stream": False,
+            "keep_alive": "30m",
+            "options": {"temperature": 0.1, "num_predict": 64}
+        }
+        if layout == "legacy":
+            payload["prompt"] = legacy_prompt(TEXTS[language], language)
+        else:
+            payload["system"] = SYSTEM_PREFIX
+            payload["prompt"] = build_prompt(TEXTS[language], language)
+
+        start = time.perf_counter()
+        response = client.post(url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        results["tokens"].append(data.get("prompt_eval_count", 0))
+        results["prompt_ms"].append(data.get("prompt_eval_duration", 0) / 1e6)
+        results["total_ms"].append((time.perf_counter() - start) * 1000)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=os.environ.get("OLLAMA_API_URL", "http://localhost:11434/api/generate"))
+    parser.add_argument("--model", default=os.environ.get("MODEL_NAME", "llama3.2"))
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with httpx.Client(timeout=300) as client:
+        # Load the model first so neither layout pays the load time
+        client.post(args.url, json={"model": args.model, "prompt": "", "keep_alive": "30m"}).raise_for_status()
+        print(f"{args.model}, {args.requests} requests per layout, alternating languages")
+        print(f"{'layout':<10} {'eval tokens':>12} {'prompt eval ms':>15} {'request ms':>11}")
+        for layout in ("legacy", "templated"):
+            results = run(client, args.url, args.model, layout, args.requests)
+            # The first request of each layout fills the cache
+            steady = {key: values[1:] or values for key, values in results.items()}
+            print(
+                f"{layout:<10} {statistics.mean(steady['tokens']):>12.1f}"
+                f" {statistics.mean(steady['prompt_ms']):>15.1f}"
+                f" {statistics.median(steady['total_ms']):>11.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
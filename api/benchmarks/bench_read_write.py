@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+"""
+Mixed Read/Write Benchmark
+
+Runs concurrent history readers next to writers committing one correction at
+a time, and compares two connection layouts:
+
+- shared: reads and writes share one pool, as before the split (15 connections);
+- split: reads use the read-only pool, writes the dedicated writer pool.
+
+Each layout runs in its own process since the pools are configured at import.
+Reports read throughput and latency percentiles, and write throughput.
+
+Usage:
+    python benchmarks/bench_read_write.py [--readers 16] [--writers 4] [--seconds 5]
+"""
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_ROWS = 2_000
+TEXT = "lorem ipsum dolor sit amet " * 40
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+async def run_layout(layout: str, readers: int, writers: int, seconds: float) -> None:
+    """
+    Seeds a database and measures one layout. Runs inside the child process.
+
+    Args:
+        layout (str): "shared" or "split"
+        readers (int): Concurrent reader loops
+        writers (int): Concurrent writer loops
+        seconds (float): Measurement duration
+    """
+    from database import ReadSessionLocal, SessionLocal, engine, read_engine
+    from migrations import upgrade_schema
+    from models import User
+    from services.correction import get_user_correction_rows
+    from services.writer import insert_corrections
+
+    engine.echo = False
+    read_engine.echo = False
+    await upgrade_schema()
+    async with SessionLocal() as db:
+        db.add(User(email="bench@example.com", username="bench", hashed_password="x"))
+        await db.commit()
+        row = {"user_id": 1, "original_text": TEXT, "corrected_text": TEXT}
+        for _ in range(SEED_ROWS // 500):
+            await insert_corrections(db, [dict(row) for _ in range(500)])
+
+    read_factory = ReadSessionLocal if layout == "split" else SessionLocal
+    latencies: List[float] = []
+    writes = 0
+    deadline = time.perf_counter() + seconds
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            async with read_factory() as db:
+                await get_user_correction_rows(db, 1, 0, 50)
+            latencies.append(time.perf_counter() - start)
+
+    async def writer():
+        nonlocal writes
+        while time.perf_counter() < deadline:
+            async with SessionLocal() as db:
+                await insert_corrections(db, [{"user_id": 1, "original_text": TEXT, "corrected_text": TEXT}])
+            writes += 1
+
+    await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+    print(
+        f"{layout:<7} reads/s {len(latencies) / seconds:8.1f}"
+        f"  read p50 {statistics.median(latencies) * 1000:7.2f} ms"
+        f"  p99 {percentile(latencies, 0.99) * 1000:7.2f} ms"
+        f"  writes/s {writes / seconds:7.1f}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--layout", choices=("shared", "split"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        sys.path.insert(0, API_DIR)
+        asyncio.run(run_layout(args.layout, args.readers, args.writers, args.seconds))
+        return
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per layout")
+    for layout, write_pool in (("shared", 15), ("split", 1)):
+        with tempfile.TemporaryDirectory(prefix="styleguard-bench-") as tmpdir:
+            env = dict(os.environ)
+            env.update({
+                "DATABASE_URL": f"sqlite:///{tmpdir}/bench.db",
+                "SHARED_STORE_PATH": f"{tmpdir}/shared.db",
+                "SECRET_KEY": "bench",
+                "ALGORITHM": "HS256",
+                "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+                "OLLAMA_API_URL": "http://127.0.0.1:9/api/generate",
+                "MODEL_NAME": "bench",
+                "WRITE_POOL_SIZE": str(write_pool),
+            })
+            subprocess.run(
+                [
+                    sys.executable, os.path.abspath(__file__), "--layout", layout,
+                    "--readers", str(args.readers), "--writers", str(args.writers),
+                    "--seconds", str(args.seconds)
+                ],
+                cwd=API_DIR,
+                env=env,
+                check=True
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+from typing import Dict, List, Tuple
+
+"""
+Correction Scheduler Simulation
+
+Replays a mixed workload of short messages and long documents through the
+correction scheduler with a simulated Ollama whose service time grows with the
+text length, and compares median and tail latency for FIFO ordering,
+shortest-job-first without aging and shortest-job-first with aging.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--jobs 800] [--load 0.85] [--concurrency 2]
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+os.environ.setdefault("MODEL_NAME", "bench")
+
+from utils.scheduler import CorrectionScheduler
+
+# Simulated service time: fixed overhead plus a per-character cost, in seconds
+BASE_SECONDS = 0.002
+SECONDS_PER_CHAR = 0.00001
+LONG_SHARE = 0.15
+
+def make_workload(jobs: int, seed: int) -> List[int]:
+    rng = random.Random(seed)
+    return [
+        rng.randint(3_000, 12_000) if rng.random() < LONG_SHARE else rng.randint(50, 400)
+        for _ in range(jobs)
+    ]
+
+def service_time(size: int) -> float:
+    return BASE_SECONDS + size * SECONDS_PER_CHAR
+
+async def simulate(
+    sizes: List[int],
+    scheduler: CorrectionScheduler,
+    arrival_rate: float,
+    seed: int
+) -> List[Tuple[int, float]]:
+    """
+    Submits the workload with Poisson arrivals and measures each job's latency.
+
+    Args:
+        sizes (List[int]): Input length of every job, in arrival order
+        scheduler (CorrectionScheduler): The scheduler under test
+        arrival_rate (float): Mean arrivals per second
+        seed (int): Seed of the arrival process
+
+    Returns:
+        List[Tuple[int, float]]: Input length and end-to-end latency per job
+    """
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    results = []
+
+    async def job(size: int) -> None:
+        start = loop.time()
+        async with scheduler.slot(size):
+            await asyncio.sleep(service_time(size))
+        results.append((size, loop.time() - start))
+
+    tasks = []
+    for size in sizes:
+        tasks.append(asyncio.create_task(job(size)))
+        await asyncio.sleep(rng.expovariate(arrival_rate))
+    await asyncio.gather(*tasks)
+    return results
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def report(name: str, results: List[Tuple[int, float]]) -> None:
+    groups: Dict[str, List[float]] = {
+        "all": [latency for _, latency in results],
+        "short": [latency for size, latency in results if size < 1_000],
+        "long": [latency for size, latency in results if size >= 1_000]
+    }
+    cells = []
+    for group, latencies in groups.items():
+        cells.append(
+            f"{group} p50 {statistics.median(latencies) * 1000:7.1f}"
+            f" p99 {percentile(latencies, 0.99) * 1000:7.1f}"
+        )
+    print(f"{name:<14} | " + " | ".join(cells) + "   (ms)")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=800)
+    parser.add_argument("--load", type=float, default=0.85, help="Offered load relative to capacity")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--aging", type=float, default=20_000.0, help="Characters gained per second of waiting")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    sizes = make_workload(args.jobs, args.seed)
+    mean_service = statistics.mean(service_time(size) for size in sizes)
+    arrival_rate = args.load * args.concurrency / mean_service
+    print(
+        f"{args.jobs} jobs, {LONG_SHARE:.0%} long, load {args.load}, "
+        f"concurrency {args.concurrency}, mean service {mean_service * 1000:.1f} ms"
+    )
+
+    policies = {
+        # An overwhelming aging rate makes the enqueue time the only criterion
+        "fifo": CorrectionScheduler(args.concurrency, 1e12, {}),
+        "sjf": CorrectionScheduler(args.concurrency, 0.0, {}),
+        "sjf+aging": CorrectionScheduler(args.concurrency, args.aging, {})
+    }
+    for name, scheduler in policies.items():
+        report(name, await simulate(sizes, scheduler, arrival_rate, args.seed))
+
+if __name__ == "__main__":
+    asyncio.run(main())
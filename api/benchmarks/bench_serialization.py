@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+"""
+History Serialization Benchmark
+
+Compares the ORM + Pydantic response path with the row-tuple + fast JSON path
+used by the correction routes, across page sizes and text lengths.
+
+Usage:
+    python benchmarks/bench_serialization.py
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmpdir = tempfile.mkdtemp(prefix="styleguard-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+os.environ.setdefault("MODEL_NAME", "bench")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from database import Base, SessionLocal, engine
+from models import Correction, User
+from schemas.correction import CorrectionResponse
+from services.correction import get_user_corrections, get_user_correction_rows
+from utils.responses import dumps
+
+PAGE_SIZES = (10, 50, 200)
+TEXT_LENGTHS = (100, 2_000, 20_000)
+REPEATS = 20
+
+engine.echo = False
+adapter = TypeAdapter(List[CorrectionResponse])
+
+async def populate(user_id: int, text_length: int, count: int) -> None:
+    """
+    Inserts a user and its corrections with texts of the given length.
+    """
+    text = ("lorem ipsum dolor sit amet " * (text_length // 27 + 1))[:text_length]
+    async with SessionLocal() as db:
+        db.add(User(id=user_id, email=f"u{user_id}@bench", username=f"u{user_id}", hashed_password=""))
+        db.add_all(
+            Correction(user_id=user_id, original_text=text, corrected_text=text)
+            for _ in range(count)
+        )
+        await db.commit()
+
+async def orm_path(user_id: int, limit: int) -> bytes:
+    """
+    Reproduces the response_model path: ORM hydration, validation, re-encoding.
+    """
+    async with SessionLocal() as db:
+        corrections = await get_user_corrections(db, user_id, 0, limit)
+        validated = adapter.validate_python(corrections, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+async def fast_path(user_id: int, limit: int) -> bytes:
+    """
+    Reproduces the optimized path: column select and direct JSON encoding.
+    """
+    async with SessionLocal() as db:
+        return dumps(await get_user_correction_rows(db, user_id, 0, limit))
+
+async def measure(path, user_id: int, limit: int) -> float:
+    """
+    Returns the median duration in milliseconds of a response path.
+    """
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await path(user_id, limit)
+        durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    return durations[len(durations) // 2]
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"{'text length':>12} {'page size':>10} {'orm+pydantic':>14} {'rows+fast':>12} {'speedup':>8}")
+    for user_id, text_length in enumerate(TEXT_LENGTHS, start=1):
+        await populate(user_id, text_length, max(PAGE_SIZES))
+        for limit in PAGE_SIZES:
+            slow = await measure(orm_path, user_id, limit)
+            fast = await measure(fast_path, user_id, limit)
+            print(f"{text_length:>12} {limit:>10} {slow:>12.2f}ms {fast:>10.2f}ms {slow / fast:>7.1f}x")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
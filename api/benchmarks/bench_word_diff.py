@@ -0,0 +1,58 @@
+import json
+import os
+import random
+import sys
+import time
+
+"""
+Word Diff Benchmark
+
+Times the word-level diff stored with each correction on 100k-character
+texts, for the same answers as the validation benchmark. The diff reuses
+the alignment of answer validation, so only the time added on top of the
+validation is reported, with the size of the stored diff next to the size
+of the corrected text. Validation rejects the complete rewrite whole, so that
+row times word_diff on the raw answer instead, alignment included.
+
+Usage:
+    python benchmarks/bench_word_diff.py
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_divergence import REPEATS, join, make_text, run_on, run_on_scenarios, scenarios
+from utils.diff import count_changes, diff_blocks, word_diff
+from utils.divergence import validate_correction
+
+def time_diff(name: str, original: str, answer: str, raw: bool = False) -> None:
+    corrected, _, blocks = validate_correction(original, answer)
+    if raw:
+        corrected = answer
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        diff = word_diff(original, answer) if raw else diff_blocks(blocks)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    size = len(json.dumps(diff).encode("utf-8"))
+    print(
+        f"{name:<22} {count_changes(diff):>8} {size / 1024:>8.1f} {len(corrected.encode('utf-8')) / 1024:>8.1f} "
+        f"{best * 1000:>9.1f} {len(original) / best / 1e6:>7.2f}"
+    )
+
+def main() -> None:
+    rng = random.Random(7)
+    original_sentences = make_text(rng)
+    original = join(original_sentences)
+    print(f"Original: {len(original)} chars")
+    print(f"{'scenario':<22} {'changes':>8} {'diff KB':>8} {'text KB':>8} {'best ms':>9} {'MB/s':>7}")
+    for name, sentences in scenarios(original_sentences, rng).items():
+        raw = name == "complete rewrite"
+        time_diff(f"{name} (raw)" if raw else name, original, join(sentences), raw)
+    original = run_on(original_sentences)
+    for name, answer in run_on_scenarios(original, rng).items():
+        time_diff(name, original, answer)
+
+if __name__ == "__main__":
+    main()
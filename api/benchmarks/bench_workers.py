@@ -0,0 +1,121 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+"""
+Worker Scaling Benchmark
+
+Starts the API with an increasing number of uvicorn worker processes and measures
+the throughput of CPU-bound endpoints: login (bcrypt) and a history page (JSON
+serialization). Throughput should scale with the worker count up to the number
+of available cores.
+
+Usage:
+    python benchmarks/bench_workers.py [max_workers]
+"""
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+CONCURRENCY = 32
+DURATION = 10.0
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+def server_env(tmpdir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.db",
+        "SHARED_STORE_PATH": f"{tmpdir}/shared.db",
+        "SECRET_KEY": "bench",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+        "OLLAMA_API_URL": "http://127.0.0.1:9/api/generate",
+        "MODEL_NAME": "bench",
+    })
+    return env
+
+async def wait_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+async def seed(client: httpx.AsyncClient, env: dict) -> dict:
+    """
+    Registers the benchmark user and inserts history rows directly.
+    """
+    await client.post("/auth/register", json={"email": EMAIL, "username": "bench", "password": PASSWORD})
+    response = await client.post("/auth/token", data={"username": EMAIL, "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    text = "lorem ipsum dolor sit amet " * 80
+    subprocess.run(
+        [sys.executable, "-c", (
+            "import sqlite3, sys; c = sqlite3.connect(sys.argv[1]); "
+            "c.executemany('INSERT INTO corrections (user_id, original_text, corrected_text, created_at) "
+            "VALUES (1, ?, ?, CURRENT_TIMESTAMP)', [(sys.argv[2], sys.argv[2])] * 50); c.commit()"
+        ), env["DATABASE_URL"].replace("sqlite:///", ""), text],
+        check=True
+    )
+    return headers
+
+async def hammer(client: httpx.AsyncClient, request) -> float:
+    """
+    Sends requests from CONCURRENCY concurrent loops and returns requests per second.
+    """
+    done = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def loop():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            response = await request(client)
+            response.raise_for_status()
+            done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(CONCURRENCY)))
+    return done / (time.perf_counter() - start)
+
+async def run(workers: int) -> tuple:
+    with tempfile.TemporaryDirectory(prefix="styleguard-bench-") as tmpdir:
+        env = server_env(tmpdir)
+        subprocess.run([sys.executable, "create_tables_async.py"], cwd=API_DIR, env=env,
+                       check=True, stdout=subprocess.DEVNULL)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            limits = httpx.Limits(max_connections=CONCURRENCY)
+            async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=60) as client:
+                await wait_ready(client)
+                headers = await seed(client, env)
+                login = await hammer(client, lambda c: c.post(
+                    "/auth/token", data={"username": EMAIL, "password": PASSWORD}))
+                history = await hammer(client, lambda c: c.get(
+                    "/corrections/?limit=50", headers=headers))
+                return login, history
+        finally:
+            server.terminate()
+            server.wait()
+
+async def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    counts = sorted({1, 2, 4, max_workers} & set(range(1, max_workers + 1)))
+    print(f"cpu count: {os.cpu_count()}")
+    print(f"{'workers':>8} {'login req/s':>12} {'history req/s':>14}")
+    for workers in counts:
+        login, history = await run(workers)
+        print(f"{workers:>8} {login:>12.1f} {history:>14.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,278 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Iterator, Optional, Set, Tuple
+from fastapi import HTTPException
+from utils.ollama import correct_text_with_telemetry
+from utils.ollama_client import close_client
+from utils.scheduler import correction_scheduler
+from utils.diff import count_changes
+
+"""
+Bulk Correction Script
+
+This script corrects document sets offline, through the same Ollama pipeline
+as the API (language detection, prompt templates, model routing, retries and
+circuit breaker) but without HTTP or authentication.
+
+Inputs are text files, directories (walked recursively for --extensions) and
+JSONL files whose records hold the text in --text-field. Items are streamed:
+at most a few times --concurrency of them are in memory at once. Every result
+is appended to the output JSONL as soon as it is ready, and the output doubles
+as the checkpoint: an interrupted run started again with the same output
+skips the items already corrected and retries the failed ones, appending
+their new record after the failed one.
+
+Usage:
+    python bulk_correct.py docs/ articles.jsonl --output corrected.jsonl [--concurrency 4]
+"""
+
+# Item ID, its text, and why it could not be read (text is None then)
+Item = Tuple[str, Optional[str], Optional[str]]
+
+def _read_jsonl(path: str, text_field: str, id_field: str) -> Iterator[Item]:
+    # A bad line becomes an item with an error, the rest of the file is still read
+    with open(path, "rb") as source:
+        for line_number, raw in enumerate(source, 1):
+            fallback_id = f"{path}:{line_number}"
+            try:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("not a JSON object")
+                item_id = record.get(id_field)
+                item_id = str(item_id) if item_id is not None else fallback_id
+                text = record.get(text_field)
+                if not isinstance(text, str):
+                    yield item_id, None, f"line {line_number}: no text in field {text_field!r}"
+                    continue
+            except ValueError as e:
+                # Covers invalid UTF-8 and JSON
+                yield fallback_id, None, f"line {line_number}: {e}"
+                continue
+            yield item_id, text, None
+
+def iter_items(paths: list, extensions: Tuple[str, ...], text_field: str, id_field: str) -> Iterator[Item]:
+    """
+    Yields the items of the inputs, lazily and in a stable order.
+
+    File items are identified by their path, JSONL records by their id field,
+    or by path and line number when they have none. Inputs that cannot be read
+    (invalid UTF-8 or JSON, missing text field) are yielded with an error
+    instead of their text, so they are reported without stopping the run.
+
+    Args:
+        paths (list): Files and directories to read
+        extensions (Tuple[str, ...]): File extensions picked up in directories
+        text_field (str): Field of JSONL records holding the text
+        id_field (str): Field of JSONL records holding their ID
+
+    Yields:
+        Item: The item ID, its text and the read error, if any
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(extensions):
+                        yield from iter_items([os.path.join(root, name)], extensions, text_field, id_field)
+        elif path.endswith(".jsonl"):
+            try:
+                yield from _read_jsonl(path, text_field, id_field)
+            except OSError as e:
+                yield path, None, str(e)
+        else:
+            try:
+                with open(path, encoding="utf-8") as source:
+                    text = source.read()
+            except (OSError, ValueError) as e:
+                yield path, None, str(e)
+                continue
+            yield path, text, None
+
+def load_checkpoint(output: str) -> Set[str]:
+    """
+    Reads the IDs of the items already corrected from a previous run's output.
+
+    A line cut short by an interruption is removed, so appending starts clean.
+    Other unreadable lines are skipped.
+
+    Args:
+        output (str): Path of the output JSONL
+
+    Returns:
+        Set[str]: IDs of the corrected items; failed items are not included
+    """
+    done: Set[str] = set()
+    corrupt = 0
+    if not os.path.exists(output):
+        return done
+    with open(output, "rb+") as existing:
+        valid_end = 0
+        for line in existing:
+            if not line.endswith(b"\n"):
+                break
+            valid_end += len(line)
+            try:
+                result = json.loads(line)
+                if "error" not in result:
+                    done.add(str(result["id"]))
+            except (ValueError, KeyError, TypeError):
+                # Not a record of ours: its item, if any, is corrected again
+                corrupt += 1
+        existing.truncate(valid_end)
+    if corrupt:
+        print(f"Warning: ignored {corrupt} unreadable lines in {output}")
+    return done
+
+class Progress:
+    """
+    Counts processed items and prints throughput at a fixed interval.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval (float): Seconds between two progress lines
+        """
+        self.interval = interval
+        self.start = time.monotonic()
+        self.last_report = self.start
+        self.corrected = 0
+        self.failed = 0
+        self.skipped = 0
+        self.characters = 0
+
+    def report(self, final: bool = False) -> None:
+        now = time.monotonic()
+        if not final and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = max(now - self.start, 1e-9)
+        print(
+            f"{'Done' if final else 'Progress'}: {self.corrected} corrected, {self.failed} failed, "
+            f"{self.skipped} skipped in {elapsed:.0f}s "
+            f"({self.corrected / elapsed:.2f} items/s, {self.characters / elapsed:.0f} chars/s)",
+            flush=True
+        )
+
+async def correct_item(item_id: str, text: str, language: Optional[str]) -> dict:
+    """
+    Corrects one item and builds its output record.
+
+    Waits and tries again while the Ollama circuit is open, so an outage pauses
+    the run instead of failing every item.
+
+    Args:
+        item_id (str): The item ID
+        text (str): The text to correct
+        language (Optional[str]): Language of every item, detected when None
+
+    Returns:
+        dict: The output record, with an error field if the correction failed
+    """
+    while True:
+        try:
+            corrected, diff, _ = await correct_text_with_telemetry(text, "batch", language)
+            break
+        except HTTPException as e:
+            retry_after = (e.headers or {}).get("Retry-After")
+            if e.status_code != 503 or retry_after is None:
+                return {"id": item_id, "error": e.detail}
+            print(f"Ollama unavailable, retrying in {retry_after}s", flush=True)
+            await asyncio.sleep(int(retry_after))
+        except Exception as e:
+            # One bad item must not stop the run; it is retried by the next run
+            return {"id": item_id, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "id": item_id,
+        "original_length": len(text),
+        "corrected_length": len(corrected),
+        "change_count": count_changes(diff),
+        "corrected_text": corrected
+    }
+
+async def run(args: argparse.Namespace) -> None:
+    """
+    Corrects every input item not already in the output.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments
+    """
+    correction_scheduler.max_concurrency = args.concurrency
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    done = load_checkpoint(args.output)
+    if done:
+        print(f"Resuming: {len(done)} items already corrected in {args.output}")
+
+    progress = Progress(args.progress_interval)
+    # Enough items in flight to keep every Ollama slot busy, few enough to bound memory
+    in_flight = asyncio.Semaphore(args.concurrency * 2)
+    tasks: Set[asyncio.Task] = set()
+    extensions = tuple(f".{ext.lstrip('.')}" for ext in args.extensions.split(","))
+
+    with open(args.output, "a", encoding="utf-8") as output:
+        async def process(item_id: str, text: str) -> None:
+            try:
+                result = await correct_item(item_id, text, args.language)
+            finally:
+                in_flight.release()
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            if "error" in result:
+                progress.failed += 1
+            else:
+                progress.corrected += 1
+                progress.characters += len(text)
+            progress.report()
+
+        try:
+            for item_id, text, error in iter_items(args.inputs, extensions, args.text_field, args.id_field):
+                if item_id in done:
+                    progress.skipped += 1
+                    continue
+                if error is not None:
+                    output.write(json.dumps({"id": item_id, "error": error}, ensure_ascii=False) + "\n")
+                    output.flush()
+                    progress.failed += 1
+                    continue
+                await in_flight.acquire()
+                task = asyncio.create_task(process(item_id, text))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await close_client()
+            progress.report(final=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Correct files, directories and JSONL records offline.")
+    parser.add_argument("inputs", nargs="+", help="Text files, directories or .jsonl files")
+    parser.add_argument("--output", required=True, help="Output JSONL, also used as checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="Corrections sent to Ollama at the same time")
+    parser.add_argument("--extensions", default="txt,md", help="File extensions read from directories")
+    parser.add_argument("--text-field", default="text", help="Field of JSONL records holding the text")
+    parser.add_argument("--id-field", default="id", help="Field of JSONL records holding their ID")
+    parser.add_argument("--language", help="Language of every item, skips detection")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument("--restart", action="store_true", help="Discard the output of a previous run")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print(f"Interrupted, run the same command again to resume from {args.output}", file=sys.stderr)
+        sys.exit(130)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List, Literal, Optional
 
 """
 Configuration Settings Module
@@ -8,6 +10,26 @@ This module manages the application's configuration settings using environment v
 It provides a centralized way to access configuration values throughout the application.
 """
 
+class ModelRoute(BaseModel):
+    """
+    Entry of the model routing table. A route applies when every criterion
+    it sets matches the request; unset criteria match anything.
+    
+    Attributes:
+        model (str): The Ollama model used by the route
+        fallback (Optional[str]): Model used when the preferred one is unavailable
+        min_chars (Optional[int]): Minimum input length in characters
+        max_chars (Optional[int]): Maximum input length in characters
+        languages (Optional[List[str]]): Detected languages the route serves
+        tiers (Optional[List[str]]): User tiers the route serves
+    """
+    model: str
+    fallback: Optional[str] = None
+    min_chars: Optional[int] = None
+    max_chars: Optional[int] = None
+    languages: Optional[List[str]] = None
+    tiers: Optional[List[str]] = None
+
 class Settings(BaseSettings):
     """
     Application settings class that loads and validates environment variables.
@@ -19,6 +41,55 @@ class Settings(BaseSettings):
         access_token_expire_minutes (int): Token expiration time in minutes
         ollama_api_url (str): URL of the Ollama API endpoint
         model_name (str): Name of the language model to use
+        retention_days (int): Default number of days corrections are kept (0 keeps them forever)
+        maintenance_interval_seconds (int): Delay between two database maintenance passes
+        maintenance_batch_size (int): Maximum number of rows deleted per retention transaction
+        incremental_vacuum_pages (int): Number of free pages reclaimed per maintenance pass
+        gzip_minimum_size (int): Responses larger than this many bytes are gzip-compressed
+        shared_store_path (str): SQLite file holding state shared by all worker processes
+        write_batch_window_ms (int): How long correction inserts wait to be group-committed together
+        write_batch_max_size (int): Maximum inserts per group commit, 1 disables the batching writer
+        sqlite_synchronous (str): SQLite synchronous mode, NORMAL trades power-loss durability for speed
+        ollama_breaker_failure_threshold (int): Consecutive Ollama failures that open the circuit
+        ollama_breaker_error_rate (float): Ollama error ratio within the window that opens the circuit
+        ollama_breaker_window_seconds (float): Length of the error-rate window in seconds
+        ollama_breaker_min_requests (int): Calls needed in the window before the error rate applies
+        ollama_breaker_open_seconds (float): How long the circuit fails fast before probing Ollama
+        ollama_breaker_half_open_probes (int): Concurrent probe calls allowed while half-open
+        ollama_api_urls (str): Comma-separated Ollama generate endpoints, overrides ollama_api_url
+        ollama_deadline_seconds (float): Total time budget of a correction, retries included
+        ollama_retry_max_attempts (int): Maximum attempts for idempotent Ollama failures
+        ollama_retry_base_delay (float): Base of the exponential retry backoff in seconds
+        ollama_retry_max_delay (float): Upper bound of a single retry backoff in seconds
+        ollama_hedge_enabled (bool): Send a hedged request to another backend when the first one is unusually slow, needs two ollama_api_urls
+        ollama_hedge_percentile (float): Latency percentile after which the hedged request is sent
+        ollama_hedge_min_samples (int): Latency samples required before hedging starts
+        ollama_max_concurrency (int): Corrections sent to Ollama at the same time by all workers together, others are queued
+        scheduler_aging_rate (float): Characters of priority a queued correction gains per second of waiting
+        scheduler_class_weights (str): Cost multipliers per priority class, as "class=weight,..."
+        scheduler_user_classes (str): Priority class overrides per user ID, as "user_id=class,..."
+        language_profile_decay (float): Weight kept by older observations each time a user's profile is updated
+        language_profile_min_weight (float): Profile weight required before it is trusted
+        language_profile_confidence (float): Share of the dominant language required before the profile is trusted
+        language_short_text_chars (int): Texts up to this length take the language of a confident profile
+        language_sample_chars (int): Characters scanned for detection when the profile is confident
+        language_min_matches (int): Marker words required for a detection to be decisive
+        live_debounce_ms (int): Quiet time before a live-correction revision is sent to Ollama
+        profiling_token (str): Admin token enabling profiling of a request through the X-Profile header, empty disables it
+        profiling_sample_rate (float): Fraction of requests profiled at random, 0 disables sampling
+        profiling_dir (str): Directory receiving request profiles
+        profiling_max_files (int): Number of profiled requests kept in profiling_dir
+        model_routes (List[ModelRoute]): Model routing table, first match wins, model_name when none matches
+        ollama_keep_alive (str): How long Ollama keeps a model and its prompt cache loaded after a request
+        write_pool_size (int): Connections of the writer pool
+        read_pool_size (int): Connections of the read-only pool used by read routes
+        idempotency_ttl_seconds (int): How long the response of an Idempotency-Key is kept for replays
+        idempotency_wait_seconds (float): How long a duplicate waits for the original request, also the lifetime of an unfinished claim
+        idempotency_max_keys_per_user (int): Idempotency keys a user can hold within the TTL, further requests are not remembered
+        shutdown_grace_seconds (float): How long running corrections may take to finish on shutdown before being deferred
+        correction_max_divergence (float): Share of a sentence's words the model may change before the sentence is rejected
+        correction_min_edits (int): Word edits always allowed in a sentence, so short sentences can still be fixed
+        web_concurrency (int): Worker processes started by uvicorn, each gets its share of ollama_max_concurrency
     """
     database_url: str
     secret_key: str
@@ -26,6 +97,55 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int
     ollama_api_url: str
     model_name: str
+    retention_days: int = 0
+    maintenance_interval_seconds: int = 3600
+    maintenance_batch_size: int = 500
+    incremental_vacuum_pages: int = 1000
+    gzip_minimum_size: int = 1024
+    shared_store_path: str = "./styleguard_shared.db"
+    write_batch_window_ms: int = 5
+    write_batch_max_size: int = 64
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "FULL"
+    ollama_breaker_failure_threshold: int = 5
+    ollama_breaker_error_rate: float = 0.5
+    ollama_breaker_window_seconds: float = 30.0
+    ollama_breaker_min_requests: int = 10
+    ollama_breaker_open_seconds: float = 15.0
+    ollama_breaker_half_open_probes: int = 1
+    ollama_api_urls: str = ""
+    ollama_deadline_seconds: float = 60.0
+    ollama_retry_max_attempts: int = 3
+    ollama_retry_base_delay: float = 0.25
+    ollama_retry_max_delay: float = 2.0
+    ollama_hedge_enabled: bool = False
+    ollama_hedge_percentile: float = 0.95
+    ollama_hedge_min_samples: int = 20
+    ollama_max_concurrency: int = 2
+    scheduler_aging_rate: float = 200.0
+    scheduler_class_weights: str = "interactive=1.0,default=1.0,batch=4.0"
+    scheduler_user_classes: str = ""
+    language_profile_decay: float = 0.9
+    language_profile_min_weight: float = 3.0
+    language_profile_confidence: float = 0.75
+    language_short_text_chars: int = 80
+    language_sample_chars: int = 2000
+    language_min_matches: int = 2
+    live_debounce_ms: int = 400
+    profiling_token: str = ""
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "./profiles"
+    profiling_max_files: int = 50
+    model_routes: List[ModelRoute] = []
+    ollama_keep_alive: str = "30m"
+    write_pool_size: int = 1
+    read_pool_size: int = 8
+    idempotency_ttl_seconds: int = 86400
+    idempotency_wait_seconds: float = 300.0
+    idempotency_max_keys_per_user: int = 1000
+    shutdown_grace_seconds: float = 30.0
+    correction_max_divergence: float = 0.4
+    correction_min_edits: int = 4
+    web_concurrency: int = 1
 
     model_config = {
         "env_file": ".env",
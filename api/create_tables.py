@@ -1,24 +1,23 @@
-from database import Base, engine
-from models.user import User
-from models.correction import Correction
+import asyncio
+import sys
+from create_tables_async import init_db_async
 
 """
 Database Initialization Script
 
-This script creates all database tables based on SQLAlchemy models.
-Run this script to initialize or reset the database schema.
+This script brings the database schema up to date based on SQLAlchemy models
+and versioned migrations. Existing data is preserved.
+Pass --reset to drop all tables and start from an empty database.
 """
 
-def init_db():
+def init_db(reset: bool = False):
     """
-    Creates all database tables.
+    Creates missing tables and applies pending migrations.
     
-    This function will drop all existing tables and create new ones
-    based on the current model definitions.
+    Args:
+        reset (bool): Drop every table first. This destroys all data.
     """
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    asyncio.run(init_db_async(reset=reset))
 
 if __name__ == "__main__":
-    init_db()
-    print("Database tables created successfully.") 
\ No newline at end of file
+    init_db(reset="--reset" in sys.argv[1:])
@@ -1,29 +1,35 @@
 import asyncio
-from database import Base, engine
-from models.user import User
-from models.correction import Correction
+import sys
+from database import engine
+from migrations import upgrade_schema, reset_schema
 
 """
 Database Initialization Script (Async Version)
 
-This script creates all database tables based on SQLAlchemy models using async IO.
-Run this script to initialize or reset the database schema.
+This script brings the database schema up to date using async IO.
+It is idempotent and safe to run on every start; existing data is preserved.
+Pass --reset to drop all tables and start from an empty database.
 """
 
-async def init_db_async():
+async def init_db_async(reset: bool = False):
     """
-    Creates all database tables asynchronously.
+    Creates missing tables and indexes and applies pending migrations asynchronously.
     
-    This function will drop all existing tables and create new ones
-    based on the current model definitions.
+    Args:
+        reset (bool): Drop every table first. This destroys all data.
     """
-    async with engine.begin() as conn:
-        # Drop all tables first
-        await conn.run_sync(Base.metadata.drop_all)
-        # Then create all tables
-        await conn.run_sync(Base.metadata.create_all)
-    
-    print("Database tables created successfully.")
+    if reset:
+        await reset_schema()
+        print("Database reset to the latest schema.")
+    else:
+        previous, current = await upgrade_schema()
+        if previous is None:
+            print(f"Database created at schema version {current}.")
+        elif previous == current:
+            print(f"Database schema is up to date (version {current}).")
+        else:
+            print(f"Database schema upgraded from version {previous} to {current}.")
+    await engine.dispose()
 
 if __name__ == "__main__":
-    asyncio.run(init_db_async()) 
\ No newline at end of file
+    asyncio.run(init_db_async(reset="--reset" in sys.argv[1:]))
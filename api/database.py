@@ -1,20 +1,64 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import get_settings
 
 """
 Database Configuration Module
 
-This module sets up the SQLAlchemy engine and session factory for database operations.
+This module sets up the SQLAlchemy engines and session factories for database operations.
+Writes go through a small dedicated writer pool, SQLite only runs one write transaction
+at a time anyway. Reads use a separate read-only pool: in WAL mode readers see the last
+committed state without waiting for a write transaction to finish.
 It also provides the Base class for declarative models.
 """
 
 settings = get_settings()
-engine = create_async_engine(
-    settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///"),
-    echo=True,
-    connect_args={"check_same_thread": False}
-)
+
+def _create_engine(read_only: bool, pool_size: int) -> AsyncEngine:
+    """
+    Creates an engine on the configured database with its connection pragmas.
+
+    Args:
+        read_only (bool): Whether connections refuse writes
+        pool_size (int): Number of pooled connections
+
+    Returns:
+        AsyncEngine: The configured engine
+    """
+    db_engine = create_async_engine(
+        settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///"),
+        echo=True,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0
+    )
+
+    @event.listens_for(db_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Configures SQLite pragmas on every new connection.
+
+        Incremental auto-vacuum only takes effect on databases created after it is set,
+        older ones are rebuilt once by upgrade_schema. It lets the maintenance job
+        reclaim free pages without a blocking full VACUUM.
+        WAL mode and a busy timeout let several worker processes read while one writes.
+        The synchronous level sets how much durability each commit pays for.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return db_engine
+
+engine = _create_engine(read_only=False, pool_size=settings.write_pool_size)
+read_engine = _create_engine(read_only=True, pool_size=settings.read_pool_size)
+
 SessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
@@ -22,15 +66,22 @@ SessionLocal = sessionmaker(
     autoflush=False,
     expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
 async def get_session():
     """
-    Creates and yields a new async database session.
-    
+    Creates and yields a new async database session on the writer pool.
+
     Yields:
         AsyncSession: An async SQLAlchemy session for database operations
-        
+
     Usage:
         async with get_session() as session:
             await session.execute(query)
@@ -39,4 +90,19 @@ async def get_session():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+async def get_read_session():
+    """
+    Creates and yields a new read-only async database session.
+
+    Use it for routes that only read: they never wait for the writer pool.
+
+    Yields:
+        AsyncSession: An async SQLAlchemy session that refuses writes
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
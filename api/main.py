@@ -1,10 +1,24 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError
 from routes import corrections
 from routes.auth import router as auth_router
+from routes.live import router as live_router
+from services.maintenance import maintenance_loop
+from services.correction import resume_pending_corrections
+from services.pending import CorrectionDeferred, deferred_body
+from services.writer import correction_writer
+from config import get_settings
+from utils.metrics import metrics
+from utils.ollama_client import close_client, ollama_breaker
+from utils.profiling import ProfilingMiddleware
+from utils.drain import shutdown_drain
+from utils.timing import ServerTimingMiddleware
 import os
 
 """
@@ -14,10 +28,43 @@ This module initializes the FastAPI application and configures the necessary mid
 and routes for the StyleGuard text correction service.
 """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts background jobs on startup and stops them on shutdown.
+    
+    Corrections deferred by the previous shutdown are resumed in the background.
+    On shutdown, running corrections are drained before the writer stops.
+    
+    Args:
+        app (FastAPI): The application instance
+    """
+    maintenance_task = asyncio.create_task(maintenance_loop())
+    if get_settings().write_batch_max_size > 1:
+        correction_writer.start()
+    shutdown_drain.install_signal_handlers()
+    resume_task = asyncio.create_task(resume_pending_corrections())
+    try:
+        yield
+    finally:
+        await shutdown_drain.wait()
+        for task in (resume_task, maintenance_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # The writer and the client must still be stopped
+                print(f"Error in background task during shutdown: {e}")
+        await correction_writer.stop()
+        await close_client()
+
 app = FastAPI(
     title="StyleGuard API",
     description="A minimalist text correction API that preserves user dialect and expression style",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configuration CORS simple
@@ -29,6 +76,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large history pages
+app.add_middleware(GZipMiddleware, minimum_size=get_settings().gzip_minimum_size)
+
+# Latency breakdown of correction requests in the Server-Timing header
+app.add_middleware(ServerTimingMiddleware, path_prefix="/corrections")
+
+# On-demand profiling, inactive unless PROFILING_TOKEN or PROFILING_SAMPLE_RATE is set
+app.add_middleware(ProfilingMiddleware)
+
 # Exception handlers
 @app.exception_handler(IntegrityError)
 async def integrity_exception_handler(request: Request, exc: IntegrityError):
@@ -47,6 +103,24 @@ async def integrity_exception_handler(request: Request, exc: IntegrityError):
         content={"detail": "Database integrity error. This item may already exist."},
     )
 
+@app.exception_handler(CorrectionDeferred)
+async def deferred_exception_handler(request: Request, exc: CorrectionDeferred):
+    """
+    Handle corrections deferred by a shutdown: they complete after the restart
+    and appear in the history then
+    
+    Args:
+        request: The request whose correction was deferred
+        exc: The exception raised
+        
+    Returns:
+        JSONResponse: An accepted response with the pending job ID
+    """
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=deferred_body(exc.pending_id),
+    )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -67,6 +141,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Include all routes
 app.include_router(auth_router)
 app.include_router(corrections.router)
+app.include_router(live_router)
 
 @app.get("/")
 async def root():
@@ -80,4 +155,32 @@ async def root():
         "status": "online",
         "service": "StyleGuard API",
         "version": "1.0.0"
-    } 
\ No newline at end of file
+    } 
+
+@app.get("/health")
+async def health():
+    """
+    Health endpoint reporting the state of the API dependencies.
+    
+    Returns:
+        dict: The overall status, draining during shutdown, and the Ollama circuit breaker state
+    """
+    ollama = ollama_breaker.snapshot()
+    if shutdown_drain.draining:
+        overall = "draining"
+    else:
+        overall = "ok" if ollama["state"] == "closed" else "degraded"
+    return {
+        "status": overall,
+        "ollama": ollama
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics():
+    """
+    Exposes the metrics of this worker process in the Prometheus text format.
+    
+    Returns:
+        str: The metrics exposition document
+    """
+    return metrics.render()
@@ -0,0 +1,244 @@
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database import Base, engine
+import models  # noqa: F401 - registers every model on Base.metadata
+from utils.text import make_preview
+from utils.diff import count_word_changes
+from services.stats import rebuild_statements
+
+"""
+Schema Migration Module
+
+This module keeps the database schema up to date without touching existing data.
+Missing tables and indexes are created, versioned migrations are applied in order
+and the applied version is recorded in the schema_version table.
+"""
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl: str) -> None:
+    """
+    Adds a column to an existing table unless it is already present.
+
+    Args:
+        conn (Connection): The database connection
+        table (str): The table name
+        column (str): The column name
+        ddl (str): The column type and constraints
+    """
+    columns = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+def _create_index_if_missing(conn: Connection, table: str, name: str) -> None:
+    """
+    Creates an index declared on a model unless it already exists.
+
+    Args:
+        conn (Connection): The database connection
+        table (str): The table the index belongs to
+        name (str): The index name
+    """
+    for index in Base.metadata.tables[table].indexes:
+        if index.name == name:
+            index.create(conn, checkfirst=True)
+            return
+    raise ValueError(f"Index {name} is not declared on table {table}")
+
+def _migration_2(conn: Connection) -> None:
+    _add_column_if_missing(conn, "users", "retention_days", "INTEGER")
+    # Superseded by the covering ix_corrections_user_summary in version 3
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_corrections_user_created ON corrections (user_id, created_at)"
+    )
+
+def _migration_3(conn: Connection) -> None:
+    _add_column_if_missing(conn, "corrections", "preview", "VARCHAR")
+    _add_column_if_missing(conn, "corrections", "original_length", "INTEGER")
+    _add_column_if_missing(conn, "corrections", "corrected_length", "INTEGER")
+    _add_column_if_missing(conn, "corrections", "change_count", "INTEGER")
+
+    # Backfill summary columns in batches to bound memory on large histories
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, original_text, corrected_text FROM corrections "
+                "WHERE id > :last_id AND preview IS NULL ORDER BY id LIMIT 500"
+            ),
+            {"last_id": last_id}
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            text(
+                "UPDATE corrections SET preview = :preview, original_length = :original_length, "
+                "corrected_length = :corrected_length, change_count = :change_count WHERE id = :id"
+            ),
+            [
+                {
+                    "id": row_id,
+                    "preview": make_preview(original or ""),
+                    "original_length": len(original or ""),
+                    "corrected_length": len(corrected or ""),
+                    "change_count": count_word_changes(original or "", corrected or "")
+                }
+                for row_id, original, corrected in rows
+            ]
+        )
+        last_id = rows[-1][0]
+
+    _create_index_if_missing(conn, "corrections", "ix_corrections_user_summary")
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_corrections_user_created")
+
+def _migration_4(conn: Connection) -> None:
+    _add_column_if_missing(conn, "users", "history_version", "INTEGER NOT NULL DEFAULT 0")
+
+def _migration_5(conn: Connection) -> None:
+    _add_column_if_missing(conn, "users", "language_profile", "JSON")
+    _add_column_if_missing(conn, "corrections", "language", "VARCHAR(16)")
+
+def _migration_6(conn: Connection) -> None:
+    _add_column_if_missing(conn, "users", "tier", "VARCHAR(32) NOT NULL DEFAULT 'standard'")
+
+def _migration_7(conn: Connection) -> None:
+    # The correction_stats table is created by create_all, fill it from the history
+    for stmt in rebuild_statements():
+        conn.execute(stmt)
+
+def _migration_9(conn: Connection) -> None:
+    _add_column_if_missing(conn, "corrections", "model", "VARCHAR(64)")
+    _add_column_if_missing(conn, "corrections", "prompt_version", "VARCHAR(16)")
+    for column in ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration", "load_duration"):
+        _add_column_if_missing(conn, "corrections", column, "INTEGER")
+
+def _migration_10(conn: Connection) -> None:
+    # Past corrections get their diff from backfill_word_diffs.py, or on first read
+    _add_column_if_missing(conn, "corrections", "word_diff", "JSON")
+
+# Ordered list of (version, description, upgrade function).
+# Version 1 is the schema as first shipped; migrations must be idempotent.
+MIGRATIONS: List[Tuple[int, str, Optional[Callable[[Connection], None]]]] = [
+    (1, "Initial schema", None),
+    (2, "Per-user retention and history index", _migration_2),
+    (3, "Correction summary columns and covering index", _migration_3),
+    (4, "Per-user history version for ETags", _migration_4),
+    (5, "Per-user language profile and correction language", _migration_5),
+    (6, "User tier for model routing", _migration_6),
+    (7, "Per-user daily correction statistics", _migration_7),
+    (8, "Corrections deferred across restarts", None),
+    (9, "Ollama generation telemetry per correction", _migration_9),
+    (10, "Word-level diff per correction", _migration_10),
+    # VACUUM cannot run in a transaction: upgrade_schema runs it after the migrations
+    (11, "Incremental auto-vacuum on existing databases", None),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def _current_version(conn: Connection) -> Optional[int]:
+    """
+    Reads the recorded schema version, creating the version table if needed.
+
+    Args:
+        conn (Connection): The database connection
+
+    Returns:
+        Optional[int]: The applied version, None if the schema was never versioned
+    """
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at DATETIME NOT NULL)"
+    )
+    return conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar()
+
+def _record_version(conn: Connection, version: int, description: str) -> None:
+    conn.execute(
+        text("INSERT INTO schema_version (version, description, applied_at) VALUES (:v, :d, :t)"),
+        {"v": version, "d": description, "t": datetime.utcnow()}
+    )
+
+def _upgrade(conn: Connection) -> Tuple[Optional[int], int]:
+    """
+    Brings the schema to LATEST_VERSION inside the caller's transaction.
+
+    Args:
+        conn (Connection): The database connection
+
+    Returns:
+        Tuple[Optional[int], int]: The version before and after the upgrade
+    """
+    current = _current_version(conn)
+    if current == LATEST_VERSION:
+        return current, current
+
+    if current is None:
+        if inspect(conn).has_table("users"):
+            # Database created before versioning: treat it as the initial schema
+            current = 1
+            _record_version(conn, 1, MIGRATIONS[0][1])
+        else:
+            Base.metadata.create_all(conn)
+            _record_version(conn, LATEST_VERSION, "Created at latest schema")
+            return None, LATEST_VERSION
+
+    previous = current
+    Base.metadata.create_all(conn)
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        if upgrade is not None:
+            upgrade(conn)
+        _record_version(conn, version, description)
+    return previous, LATEST_VERSION
+
+async def _enable_incremental_vacuum(db_engine: AsyncEngine) -> None:
+    """
+    Rebuilds the database once if it was created without incremental auto-vacuum.
+
+    The auto_vacuum pragma set on each connection only applies to databases
+    created after it; an existing file keeps its mode until a full VACUUM,
+    which copies the whole database and cannot run inside a transaction.
+
+    Args:
+        db_engine (AsyncEngine): The engine of the database to check
+    """
+    async with db_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        mode = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+        if mode == 2:  # INCREMENTAL
+            return
+        print("Rebuilding the database with VACUUM to enable incremental auto-vacuum...")
+        await conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        await conn.exec_driver_sql("VACUUM")
+
+async def upgrade_schema(db_engine: AsyncEngine = engine) -> Tuple[Optional[int], int]:
+    """
+    Creates missing tables and indexes and applies pending migrations.
+
+    Safe to run on every start: an up-to-date database only costs two queries.
+
+    Args:
+        db_engine (AsyncEngine): The engine of the database to upgrade
+
+    Returns:
+        Tuple[Optional[int], int]: The version before and after the upgrade
+    """
+    async with db_engine.begin() as conn:
+        versions = await conn.run_sync(_upgrade)
+    # Checked on every start, so an interrupted VACUUM is retried
+    await _enable_incremental_vacuum(db_engine)
+    return versions
+
+async def reset_schema(db_engine: AsyncEngine = engine) -> None:
+    """
+    Drops every table and recreates the latest schema. Destroys all data.
+
+    Args:
+        db_engine (AsyncEngine): The engine of the database to reset
+    """
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.exec_driver_sql("DROP TABLE IF EXISTS schema_version")
+    await upgrade_schema(db_engine)
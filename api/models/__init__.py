@@ -6,5 +6,7 @@ This package contains all SQLAlchemy models for the StyleGuard application.
 
 from .user import User
 from .correction import Correction
+from .correction_stat import CorrectionStat
+from .pending_correction import PendingCorrection
 
-__all__ = ["User", "Correction"] 
\ No newline at end of file
+__all__ = ["User", "Correction", "CorrectionStat", "PendingCorrection"] 
\ No newline at end of file
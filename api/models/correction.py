@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -20,14 +20,49 @@ class Correction(Base):
         original_text (str): The text submitted for correction
         corrected_text (str): The corrected version of the text
         created_at (datetime): Timestamp of correction creation
+        preview (str): Truncated single-line preview of the original text
+        original_length (int): Length of the original text in characters
+        corrected_length (int): Length of the corrected text in characters
+        change_count (int): Number of word-level changes made by the correction
+        word_diff (list): Compact word-level diff from the original to the corrected text
+        language (str): ISO code of the language the text was corrected as
+        model (str): Ollama model that produced the correction
+        prompt_version (str): Version of the prompt templates used
+        prompt_eval_count (int): Prompt tokens Ollama evaluated
+        prompt_eval_duration (int): Time spent evaluating the prompt, in nanoseconds
+        eval_count (int): Tokens Ollama generated
+        eval_duration (int): Time spent generating, in nanoseconds
+        load_duration (int): Time spent loading the model, in nanoseconds
         user (User): Relationship to the User model
     """
     __tablename__ = "corrections"
+    __table_args__ = (
+        # Serves history pagination, date-range deletion and retention purges.
+        # It covers every summary column so summary listings never read the texts.
+        Index(
+            "ix_corrections_user_summary",
+            "user_id", "created_at", "id",
+            "original_length", "corrected_length", "change_count", "preview"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     original_text = Column(Text)
     corrected_text = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    preview = Column(String)
+    original_length = Column(Integer)
+    corrected_length = Column(Integer)
+    change_count = Column(Integer)
+    word_diff = Column(JSON)
+    language = Column(String(16))
+    model = Column(String(64))
+    prompt_version = Column(String(16))
+    prompt_eval_count = Column(Integer)
+    prompt_eval_duration = Column(Integer)
+    eval_count = Column(Integer)
+    eval_duration = Column(Integer)
+    load_duration = Column(Integer)
     
     user = relationship("User", back_populates="corrections") 
\ No newline at end of file
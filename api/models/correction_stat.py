@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from database import Base
+
+"""
+Correction Statistics Model Module
+
+This module defines the CorrectionStat model, a per-user, per-day and
+per-language aggregate of the corrections table. It is kept up to date when
+corrections are stored or deleted, so usage statistics read one row per day
+and language instead of scanning every correction.
+"""
+
+class CorrectionStat(Base):
+    """
+    Daily correction totals of a user for one language.
+    
+    Attributes:
+        user_id (int): Foreign key to the users table
+        day (date): UTC day the corrections were created on
+        language (str): ISO code of the language, 'unknown' when none was recorded
+        correction_count (int): Number of corrections
+        original_chars (int): Total length of the original texts
+        corrected_chars (int): Total length of the corrected texts
+        change_count (int): Total number of word-level changes
+    """
+    __tablename__ = "correction_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    language = Column(String(16), primary_key=True)
+    correction_count = Column(Integer, nullable=False, default=0)
+    original_chars = Column(Integer, nullable=False, default=0)
+    corrected_chars = Column(Integer, nullable=False, default=0)
+    change_count = Column(Integer, nullable=False, default=0)
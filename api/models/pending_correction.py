@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from database import Base
+
+"""
+Pending Correction Model Module
+
+This module defines the PendingCorrection model: correction work accepted
+but not completed when a worker shut down, kept to be resumed on the next start.
+"""
+
+class PendingCorrection(Base):
+    """
+    Correction waiting to be processed after a restart.
+    
+    Attributes:
+        id (int): Primary key
+        user_id (int): Foreign key to the users table
+        original_text (str): The text to correct
+        priority_class (str): Scheduling class of the original request
+        created_at (datetime): Timestamp the work was deferred at
+    """
+    __tablename__ = "pending_corrections"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    original_text = Column(Text, nullable=False)
+    priority_class = Column(String(32), nullable=False, default="default")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
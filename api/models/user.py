@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -21,6 +21,10 @@ class User(Base):
         hashed_password (str): Bcrypt hashed password
         created_at (datetime): Timestamp of user creation
         updated_at (datetime): Timestamp of last user update
+        retention_days (int): Days to keep corrections, overrides the global policy when set
+        history_version (int): Counter bumped whenever the user's correction history changes
+        language_profile (dict): Rolling language scores of the user's corrections
+        tier (str): Service tier, used to route corrections to a model
         corrections (List[Correction]): List of user's text corrections
     """
     __tablename__ = "users"
@@ -31,5 +35,9 @@ class User(Base):
     hashed_password = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    retention_days = Column(Integer, nullable=True)
+    history_version = Column(Integer, nullable=False, default=0, server_default="0")
+    language_profile = Column(JSON, nullable=True)
+    tier = Column(String(32), nullable=False, default="standard", server_default="standard")
     
     corrections = relationship("Correction", back_populates="user") 
\ No newline at end of file
@@ -0,0 +1,30 @@
+import asyncio
+import sys
+from database import SessionLocal, engine
+from services.stats import rebuild_correction_stats
+
+"""
+Statistics Rebuild Script
+
+This script recomputes the per-user daily correction statistics from the
+corrections table. The statistics are maintained incrementally; run it after
+editing corrections outside the API, or pass --user ID to rebuild one user.
+"""
+
+async def rebuild_stats_async(user_id: int = None):
+    """
+    Recomputes the correction statistics.
+    
+    Args:
+        user_id (int): Only rebuild this user's statistics
+    """
+    async with SessionLocal() as db:
+        rows = await rebuild_correction_stats(db, user_id)
+    scope = f"user {user_id}" if user_id is not None else "all users"
+    print(f"Rebuilt correction statistics for {scope}: {rows} daily rows.")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    user_id = int(args[args.index("--user") + 1]) if "--user" in args else None
+    asyncio.run(rebuild_stats_async(user_id))
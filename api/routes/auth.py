@@ -2,10 +2,10 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from database import get_session
+from database import get_read_session, get_session
 from models import User
-from schemas.user import UserCreate, UserResponse
-from services.user import authenticate_user, create_user, get_user
+from schemas.user import UserCreate, UserUpdate, UserResponse
+from services.user import authenticate_user, create_user, get_user, update_user
 from utils.security import create_token_pair, get_current_user, get_refresh_user
 from config import get_settings
 
@@ -64,7 +64,7 @@ async def register(
 @router.post("/token")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ) -> dict:
     """
     Authenticates a user and returns access and refresh tokens.
@@ -98,7 +98,7 @@ async def login(
 @router.post("/refresh")
 async def refresh_token(
     token: str,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ) -> dict:
     """
     Refreshes an expired access token using a valid refresh token.
@@ -136,4 +136,23 @@ async def get_current_user_info(
     Returns:
         User: The user information
     """
-    return current_user 
\ No newline at end of file
+    return current_user 
+
+@router.patch("/me", response_model=UserResponse)
+async def update_current_user_info(
+    user_update: UserUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+) -> User:
+    """
+    Updates the current authenticated user's information, including the retention policy.
+    
+    Args:
+        user_update (UserUpdate): The fields to update
+        current_user (User): The current authenticated user
+        db (AsyncSession): The database session
+        
+    Returns:
+        User: The updated user information
+    """
+    return await update_user(db, current_user.id, user_update)
@@ -1,16 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from database import get_session
+from typing import List, Literal, Optional, Tuple, Union
+from database import get_read_session, get_session
 from models import User
-from schemas.correction import CorrectionCreate, CorrectionResponse
+from schemas.correction import (
+    CorrectionCreate,
+    CorrectionResponse,
+    CorrectionSummary,
+    CorrectionBulkDelete,
+    CorrectionBulkDeleteResponse,
+    CorrectionStats
+)
 from services.correction import (
     create_correction,
-    get_user_corrections,
-    get_correction,
-    delete_correction
+    get_user_correction_rows,
+    get_user_correction_summaries,
+    get_correction_row,
+    correction_to_dict,
+    delete_correction,
+    delete_corrections
 )
+from services.pending import CorrectionDeferred, deferred_body
+from services.stats import get_user_stats
 from utils.security import get_current_user
+from utils.responses import FastJSONResponse, dumps
+from utils.disconnect import cancel_on_disconnect
+from utils.idempotency import run_idempotent
+from utils.timing import span
+from utils.http_cache import history_etag, is_not_modified, not_modified, cache_headers
 
 """
 Corrections Routes Module
@@ -27,55 +45,174 @@ router = APIRouter(
 
 @router.post("/", response_model=CorrectionResponse)
 async def create_text_correction(
+    request: Request,
     correction: CorrectionCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
     """
     Creates a new text correction.
+    If the client disconnects first, the Ollama call is cancelled and nothing is stored.
+    
+    With an Idempotency-Key header, retries of the request get the response of the
+    first one, marked with Idempotent-Replayed, instead of a new correction. The work
+    then runs to completion even if the client disconnects, since a retry will want it.
+    A correction deferred by a shutdown keeps its key: retries get the same 202.
     
     Args:
+        request (Request): The incoming request, watched for client disconnects
         correction (CorrectionCreate): The text to correct
+        idempotency_key (Optional[str]): Client key identifying retries of the same request
         current_user (User): The authenticated user
         db (AsyncSession): The database session
         
     Returns:
         CorrectionResponse: The correction result
     """
-    return await create_correction(db, correction, current_user.id)
+    if idempotency_key is None:
+        db_correction = await cancel_on_disconnect(
+            request,
+            create_correction(
+                db, correction, current_user.id, "interactive", current_user.language_profile, current_user.tier
+            ),
+            "create_correction"
+        )
+        with span("serialize"):
+            return FastJSONResponse(correction_to_dict(db_correction))
+
+    async def correct() -> Tuple[int, str]:
+        try:
+            db_correction = await create_correction(
+                db, correction, current_user.id, "interactive", current_user.language_profile, current_user.tier
+            )
+        except CorrectionDeferred as e:
+            # The deferred job completes after the restart: retries must not start another one
+            return status.HTTP_202_ACCEPTED, dumps(deferred_body(e.pending_id)).decode("utf-8")
+        with span("serialize"):
+            return status.HTTP_200_OK, dumps(correction_to_dict(db_correction)).decode("utf-8")
+
+    (status_code, body), replayed = await run_idempotent(
+        current_user.id, idempotency_key, correction.original_text, correct
+    )
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None
+    )
 
-@router.get("/", response_model=List[CorrectionResponse])
+@router.get("/", response_model=Union[List[CorrectionResponse], List[CorrectionSummary]])
 async def read_user_corrections(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
+    view: Literal["full", "summary"] = "full",
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Retrieves a user's correction history.
+    Honors If-None-Match with a 304 before reading any correction row.
     
     Args:
+        request (Request): The incoming request
         skip (int): Number of records to skip
         limit (int): Maximum number of records to return
+        view (str): "full" returns the texts, "summary" returns previews and lengths only
         current_user (User): The authenticated user
         db (AsyncSession): The database session
         
     Returns:
-        List[CorrectionResponse]: List of corrections
+        List[CorrectionResponse] | List[CorrectionSummary]: List of corrections,
+        serialized straight from the selected rows
     """
-    return await get_user_corrections(db, current_user.id, skip, limit)
+    etag = history_etag(current_user.id, current_user.history_version, "list", view, skip, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    with span("db_read"):
+        if view == "summary":
+            rows = await get_user_correction_summaries(db, current_user.id, skip, limit)
+        else:
+            rows = await get_user_correction_rows(db, current_user.id, skip, limit)
+    with span("serialize"):
+        return FastJSONResponse(rows, headers=cache_headers(etag))
+
+@router.get("/stats", response_model=CorrectionStats)
+async def read_user_stats(
+    request: Request,
+    days: int = Query(default=30, ge=1, le=366),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Retrieves the user's usage statistics: totals, language breakdown and daily activity.
+    Read from the daily aggregate, so the cost grows with days of activity, not corrections.
+    
+    Args:
+        request (Request): The incoming request
+        days (int): Number of days of activity to return, today included
+        current_user (User): The authenticated user
+        db (AsyncSession): The database session
+        
+    Returns:
+        CorrectionStats: The user's statistics
+    """
+    # The activity window moves with the date, so today is part of the ETag
+    etag = history_etag(
+        current_user.id, current_user.history_version, "stats", days, datetime.utcnow().date()
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    with span("db_read"):
+        stats = await get_user_stats(db, current_user.id, days)
+    with span("serialize"):
+        return FastJSONResponse(stats, headers=cache_headers(etag))
+
+@router.post("/bulk-delete", response_model=CorrectionBulkDeleteResponse)
+async def bulk_remove_corrections(
+    criteria: CorrectionBulkDelete,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Deletes several corrections at once, by ID list and/or creation date range.
+    
+    Args:
+        criteria (CorrectionBulkDelete): The deletion criteria
+        current_user (User): The authenticated user
+        db (AsyncSession): The database session
+        
+    Returns:
+        CorrectionBulkDeleteResponse: The number of deleted corrections
+    """
+    deleted = await delete_corrections(
+        db,
+        current_user.id,
+        ids=criteria.ids,
+        created_after=criteria.created_after,
+        created_before=criteria.created_before
+    )
+    return {"deleted": deleted}
 
 @router.get("/{correction_id}", response_model=CorrectionResponse)
 async def read_correction(
+    request: Request,
     correction_id: int,
+    include_diff: bool = Query(default=False),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Retrieves a specific correction.
+    Honors If-None-Match with a 304 before reading the correction row.
     
     Args:
+        request (Request): The incoming request
         correction_id (int): The ID of the correction
+        include_diff (bool): Also return the word diff stored with the correction
         current_user (User): The authenticated user
         db (AsyncSession): The database session
         
@@ -85,13 +222,21 @@ async def read_correction(
     Raises:
         HTTPException: If correction is not found
     """
-    correction = await get_correction(db, correction_id, current_user.id)
+    etag = history_etag(
+        current_user.id, current_user.history_version, "item-diff" if include_diff else "item", correction_id
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    with span("db_read"):
+        correction = await get_correction_row(db, correction_id, current_user.id, include_diff)
     if not correction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Correction not found"
         )
-    return correction
+    with span("serialize"):
+        return FastJSONResponse(correction, headers=cache_headers(etag))
 
 @router.delete("/{correction_id}")
 async def remove_correction(
@@ -0,0 +1,72 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_read_session
+from schemas.correction import LiveCorrectionMessage
+from services.live import LiveCorrectionSession
+from utils.responses import dumps
+from utils.security import authenticate_access_token
+
+"""
+Live Correction Routes Module
+
+This module exposes the WebSocket channel the editor uses to get corrections
+while the user types.
+"""
+
+router = APIRouter(prefix="/corrections", tags=["corrections"])
+
+@router.websocket("/live")
+async def live_correction(
+    websocket: WebSocket,
+    token: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Live-correction channel.
+
+    Browsers cannot set headers on WebSockets, so the access token is passed
+    as the token query parameter (an Authorization header is accepted too).
+    The client sends {"text", "revision", "final"} messages; the server replies
+    {"revision", "corrected_text", "language"} once a revision settled for the
+    debounce window, {"revision", "error"} on failure and {"revision", "saved"}
+    after a final revision was stored.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection
+        token (Optional[str]): The access token
+        db (AsyncSession): The database session
+    """
+    if token is None:
+        token = websocket.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    try:
+        user = await authenticate_access_token(token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # The connection would otherwise stay checked out for the channel's lifetime
+    await db.commit()
+
+    await websocket.accept()
+
+    async def send(message: dict) -> None:
+        await websocket.send_text(dumps(message).decode("utf-8"))
+
+    session = LiveCorrectionSession(user.id, user.language_profile, send, user.tier)
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = LiveCorrectionMessage.model_validate_json(raw)
+            except ValidationError:
+                await send({"error": "INVALID_MESSAGE"})
+                continue
+            if message.text != session.text:
+                await session.submit(message.text, message.revision)
+            if message.final:
+                await session.finalize()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
@@ -5,8 +5,20 @@ This package contains all Pydantic models for request/response validation
 in the StyleGuard application.
 """
 
-from .user import UserBase, UserCreate, UserUpdate, UserInDB, UserResponse
-from .correction import CorrectionBase, CorrectionCreate, CorrectionInDB, CorrectionResponse
+from .user import UserBase, UserCreate, UserUpdate, UserInDB, UserResponse, LanguageProfile
+from .correction import (
+    CorrectionBase,
+    CorrectionCreate,
+    CorrectionInDB,
+    CorrectionResponse,
+    CorrectionSummary,
+    CorrectionBulkDelete,
+    CorrectionBulkDeleteResponse,
+    LanguageUsage,
+    DailyActivity,
+    CorrectionStats,
+    LiveCorrectionMessage
+)
 
 __all__ = [
     "UserBase",
@@ -14,8 +26,16 @@ __all__ = [
     "UserUpdate",
     "UserInDB",
     "UserResponse",
+    "LanguageProfile",
     "CorrectionBase",
     "CorrectionCreate",
     "CorrectionInDB",
-    "CorrectionResponse"
+    "CorrectionResponse",
+    "CorrectionSummary",
+    "CorrectionBulkDelete",
+    "CorrectionBulkDeleteResponse",
+    "LanguageUsage",
+    "DailyActivity",
+    "CorrectionStats",
+    "LiveCorrectionMessage"
 ] 
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime
+from typing import List, Optional, Union
 
 """
 Correction Schema Module
@@ -44,7 +45,121 @@ class CorrectionInDB(CorrectionBase):
 
 class CorrectionResponse(CorrectionInDB):
     """
-    Schema for correction data in API responses.
-    Inherits all fields from CorrectionInDB.
+    Schema for correction data in API responses, extends CorrectionInDB.
+    
+    Attributes:
+        word_diff (Optional[List[List[Union[int, str]]]]): Word-level diff from the original
+            to the corrected text: [0, n] keeps the next n characters of the original,
+            [-1, text] deletes text and [1, text] inserts text. Returned on creation
+            and by GET /corrections/{id}?include_diff=true
+    """
+    word_diff: Optional[List[List[Union[int, str]]]] = None
+
+class CorrectionSummary(BaseModel):
+    """
+    Schema for the summary projection of a correction, used by history listings.
+    Full texts are fetched on demand with GET /corrections/{id}.
+    
+    Attributes:
+        id (int): Correction ID
+        user_id (int): ID of the user who requested the correction
+        created_at (datetime): Timestamp of correction creation
+        preview (str): Truncated single-line preview of the original text
+        original_length (int): Length of the original text in characters
+        corrected_length (int): Length of the corrected text in characters
+        change_count (int): Number of word-level changes made by the correction
+    """
+    id: int
+    user_id: int
+    created_at: datetime
+    preview: Optional[str] = None
+    original_length: Optional[int] = None
+    corrected_length: Optional[int] = None
+    change_count: Optional[int] = None
+
+class CorrectionBulkDelete(BaseModel):
+    """
+    Schema for bulk deletion of corrections.
+    At least one criterion is required; criteria are combined with AND.
+    
+    Attributes:
+        ids (Optional[List[int]]): IDs of the corrections to delete
+        created_after (Optional[datetime]): Only delete corrections created at or after this date
+        created_before (Optional[datetime]): Only delete corrections created before this date
+    """
+    ids: Optional[List[int]] = Field(default=None, max_length=1000)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_criteria(self):
+        if self.ids is None and self.created_after is None and self.created_before is None:
+            raise ValueError("At least one of ids, created_after or created_before is required")
+        return self
+
+class CorrectionBulkDeleteResponse(BaseModel):
+    """
+    Schema for the result of a bulk deletion.
+    
+    Attributes:
+        deleted (int): Number of corrections removed
+    """
+    deleted: int
+
+class LanguageUsage(BaseModel):
+    """
+    Schema for the corrections of a user in one language.
+    
+    Attributes:
+        language (str): ISO code of the language, 'unknown' when none was recorded
+        corrections (int): Number of corrections
+        characters (int): Total length of the original texts
+    """
+    language: str
+    corrections: int
+    characters: int
+
+class DailyActivity(BaseModel):
+    """
+    Schema for the corrections of a user on one UTC day.
+    
+    Attributes:
+        day (date): The day
+        corrections (int): Number of corrections
+        characters (int): Total length of the original texts
+    """
+    day: date
+    corrections: int
+    characters: int
+
+class CorrectionStats(BaseModel):
+    """
+    Schema for a user's usage statistics.
+    
+    Attributes:
+        total_corrections (int): Number of corrections in the history
+        total_characters (int): Total length of the original texts
+        corrected_characters (int): Total length of the corrected texts
+        total_changes (int): Total number of word-level changes
+        languages (List[LanguageUsage]): Breakdown by language, most used first
+        activity (List[DailyActivity]): Days with corrections in the requested window, oldest first
+    """
+    total_corrections: int
+    total_characters: int
+    corrected_characters: int
+    total_changes: int
+    languages: List[LanguageUsage]
+    activity: List[DailyActivity]
+
+class LiveCorrectionMessage(BaseModel):
+    """
+    Schema for a message sent by the client on the live-correction channel.
+    
+    Attributes:
+        text (str): The current text of the editor
+        revision (Optional[int]): Client revision number, echoed back in replies
+        final (bool): The user settled on this text; store its correction
     """
-    pass 
\ No newline at end of file
+    text: str
+    revision: Optional[int] = None
+    final: bool = False
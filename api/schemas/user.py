@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 """
 User Schema Module
@@ -37,10 +37,20 @@ class UserUpdate(BaseModel):
         email (Optional[EmailStr]): Updated email address
         username (Optional[str]): Updated username
         password (Optional[str]): New password
+        retention_days (Optional[int]): Days to keep corrections, 0 keeps them forever
     """
     email: Optional[EmailStr] = None
     username: Optional[str] = None
     password: Optional[str] = None
+    retention_days: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # Fields left out are not updated, but none of them can be cleared
+        cleared = sorted(field for field in self.model_fields_set if getattr(self, field) is None)
+        if cleared:
+            raise ValueError(f"{', '.join(cleared)} cannot be null")
+        return self
 
 class UserInDB(UserBase):
     """
@@ -58,14 +68,35 @@ class UserInDB(UserBase):
     class Config:
         from_attributes = True
 
+class LanguageProfile(BaseModel):
+    """
+    Schema for a user's rolling language profile.
+    
+    Attributes:
+        dominant (Optional[str]): The language the user writes most in recently
+        confidence (float): Share of the dominant language in the profile
+        weight (float): Decayed number of observations behind the profile
+        scores (Dict[str, float]): Decayed observation count per language
+    """
+    dominant: Optional[str] = None
+    confidence: float = 0.0
+    weight: float = 0.0
+    scores: Dict[str, float] = {}
+
 class UserResponse(UserBase):
     """
     Schema for user data in API responses.
     
     Attributes:
         id (int): User ID
+        retention_days (Optional[int]): Per-user retention policy, None uses the global one
+        language_profile (Optional[LanguageProfile]): Languages detected in recent corrections
+        tier (str): Service tier of the user
     """
     id: int
+    retention_days: Optional[int] = None
+    language_profile: Optional[LanguageProfile] = None
+    tier: str = "standard"
 
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -10,13 +10,30 @@ from .user import (
     get_user_by_email,
     create_user,
     update_user,
-    delete_user
+    delete_user,
+    bump_history_versions,
+    update_language_profiles
 )
 from .correction import (
     create_correction,
     get_user_corrections,
     get_correction,
-    delete_correction
+    get_user_correction_rows,
+    get_user_correction_summaries,
+    get_correction_row,
+    correction_to_dict,
+    delete_correction,
+    delete_corrections
+)
+from .stats import (
+    apply_correction_stats,
+    rebuild_correction_stats,
+    get_user_stats
+)
+from .telemetry import get_generation_report
+from .maintenance import (
+    purge_expired_corrections,
+    run_database_maintenance
 )
 
 __all__ = [
@@ -25,8 +42,21 @@ __all__ = [
     "create_user",
     "update_user",
     "delete_user",
+    "bump_history_versions",
+    "update_language_profiles",
     "create_correction",
     "get_user_corrections",
     "get_correction",
-    "delete_correction"
+    "get_user_correction_rows",
+    "get_user_correction_summaries",
+    "get_correction_row",
+    "correction_to_dict",
+    "delete_correction",
+    "delete_corrections",
+    "apply_correction_stats",
+    "rebuild_correction_stats",
+    "get_user_stats",
+    "get_generation_report",
+    "purge_expired_corrections",
+    "run_database_maintenance"
 ] 
\ No newline at end of file
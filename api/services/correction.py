@@ -1,8 +1,27 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from models import Correction
+from sqlalchemy import select, delete
+from database import ReadSessionLocal, SessionLocal
+from models import Correction, User
 from schemas.correction import CorrectionCreate
-from utils.ollama import correct_text
+from utils.ollama import correct_text_with_telemetry
+from utils.scheduler import SchedulerDraining, correction_scheduler, priority_class_for
+from utils.language import resolve_language
+from utils.timing import span
+from utils.responses import rows_to_dicts
+from utils.text import make_preview
+from utils.diff import count_changes, word_diff
+from services.writer import PROFILE_LANGUAGE, correction_writer, insert_corrections
+from services.user import bump_history_versions
+from services.pending import (
+    CorrectionDeferred,
+    claim_pending_correction,
+    defer_correction,
+    requeue_pending_correction
+)
+from services.stats import STAT_SOURCE_COLUMNS, apply_correction_stats
 from fastapi import HTTPException
 
 """
@@ -15,7 +34,10 @@ in the StyleGuard application.
 async def create_correction(
     db: AsyncSession,
     correction: CorrectionCreate,
-    user_id: int
+    user_id: int,
+    priority_class: str = "default",
+    language_profile: Optional[dict] = None,
+    tier: Optional[str] = None
 ) -> Correction:
     """
     Creates a new correction entry and processes the text through Ollama.
@@ -24,30 +46,143 @@ async def create_correction(
         db (AsyncSession): The database session
         correction (CorrectionCreate): The correction data
         user_id (int): The ID of the user requesting the correction
+        priority_class (str): Scheduling class of the endpoint issuing the request
+        language_profile (Optional[dict]): The user's language profile, biases detection
+        tier (Optional[str]): The user's tier, used for model routing
         
     Returns:
         Correction: The created correction object with the corrected text
         
     Raises:
         HTTPException: If there is an error with Ollama service
+        CorrectionDeferred: If the worker is shutting down; the correction will be
+            completed on the next start
     """
     try:
-        corrected_text = await correct_text(correction.original_text)
-        
-        db_correction = Correction(
-            user_id=user_id,
-            original_text=correction.original_text,
-            corrected_text=corrected_text
-        )
-        
-        db.add(db_correction)
+        # Make sure no connection is held while Ollama works
         await db.commit()
-        await db.refresh(db_correction)
-        return db_correction
+        values = await compute_correction(
+            correction.original_text, user_id, priority_class, language_profile, tier
+        )
+        return await store_correction(db, values)
+    except SchedulerDraining:
+        raise CorrectionDeferred(await defer_correction(user_id, correction.original_text, priority_class))
+    except asyncio.CancelledError:
+        if not correction_scheduler.draining:
+            raise
+        # Cancelled at the end of the shutdown grace period: keep the work for the next start
+        asyncio.current_task().uncancel()
+        raise CorrectionDeferred(await defer_correction(user_id, correction.original_text, priority_class))
     except HTTPException as e:
         # Propage l'exception HTTP avec le code et le détail original
         raise e
 
+async def compute_correction(
+    original_text: str,
+    user_id: int,
+    priority_class: str = "default",
+    language_profile: Optional[dict] = None,
+    tier: Optional[str] = None
+) -> dict:
+    """
+    Corrects a text through Ollama without storing anything.
+    
+    Args:
+        original_text (str): The text to correct
+        user_id (int): The ID of the user requesting the correction
+        priority_class (str): Scheduling class of the endpoint issuing the request
+        language_profile (Optional[dict]): The user's language profile, biases detection
+        tier (Optional[str]): The user's tier, used for model routing
+        
+    Returns:
+        dict: The column values of the correction, ready for store_correction
+        
+    Raises:
+        HTTPException: If there is an error with Ollama service
+    """
+    with span("language"):
+        language, detected = resolve_language(original_text, language_profile)
+    corrected_text, diff, telemetry = await correct_text_with_telemetry(
+        original_text,
+        priority_class_for(user_id, priority_class),
+        language,
+        tier
+    )
+    return {
+        **telemetry,
+        "user_id": user_id,
+        "original_text": original_text,
+        "corrected_text": corrected_text,
+        "preview": make_preview(original_text),
+        "original_length": len(original_text),
+        "corrected_length": len(corrected_text),
+        "change_count": count_changes(diff),
+        "word_diff": diff,
+        "language": language,
+        # Languages taken from the profile would only reinforce it
+        PROFILE_LANGUAGE: language if detected else None
+    }
+
+async def store_correction(db: AsyncSession, values: dict) -> Correction:
+    """
+    Stores a computed correction.
+    
+    The insert goes through the group-commit writer when it is running,
+    otherwise it is committed directly on the given session.
+    
+    Args:
+        db (AsyncSession): The database session
+        values (dict): The column values returned by compute_correction
+        
+    Returns:
+        Correction: The stored correction
+    """
+    with span("db_write"):
+        if correction_writer.running:
+            return await correction_writer.submit(values)
+        return (await insert_corrections(db, [values]))[0]
+
+async def resume_pending_corrections() -> int:
+    """
+    Completes the corrections deferred by a previous shutdown, oldest first.
+    
+    Stops at the first failure, putting the job back: Ollama is likely unavailable
+    or the worker is shutting down again.
+    
+    Returns:
+        int: The number of completed corrections
+    """
+    completed = 0
+    while True:
+        job = await claim_pending_correction()
+        if job is None:
+            break
+        try:
+            async with ReadSessionLocal() as db:
+                user = await db.get(User, job.user_id)
+            if user is None:
+                continue
+            values = await compute_correction(
+                job.original_text, job.user_id, job.priority_class, user.language_profile, user.tier
+            )
+            async with SessionLocal() as db:
+                await store_correction(db, values)
+        except (HTTPException, asyncio.CancelledError) as e:
+            await requeue_pending_correction(job)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            print(f"Stopped resuming pending corrections: {e.detail}")
+            break
+        except Exception as e:
+            # The claim removed the job: put it back before giving up, e.g. on a locked database
+            await requeue_pending_correction(job)
+            print(f"Stopped resuming pending corrections: {e}")
+            break
+        completed += 1
+    if completed:
+        print(f"Resumed {completed} pending corrections")
+    return completed
+
 async def get_user_corrections(
     db: AsyncSession,
     user_id: int,
@@ -75,6 +210,138 @@ async def get_user_corrections(
     )
     return result.scalars().all()
 
+# Columns of CorrectionResponse, selected directly for the fast response path
+RESPONSE_COLUMNS = (
+    Correction.id,
+    Correction.user_id,
+    Correction.original_text,
+    Correction.corrected_text,
+    Correction.created_at
+)
+RESPONSE_KEYS = tuple(column.key for column in RESPONSE_COLUMNS)
+
+# Columns of CorrectionSummary, all served by the ix_corrections_user_summary index
+SUMMARY_COLUMNS = (
+    Correction.id,
+    Correction.user_id,
+    Correction.created_at,
+    Correction.preview,
+    Correction.original_length,
+    Correction.corrected_length,
+    Correction.change_count
+)
+SUMMARY_KEYS = tuple(column.key for column in SUMMARY_COLUMNS)
+
+def correction_to_dict(correction: Correction) -> dict:
+    """
+    Converts a Correction object into the response dictionary.
+    
+    The word diff is included, since the client that just created the
+    correction is about to highlight it.
+    
+    Args:
+        correction (Correction): The correction object
+        
+    Returns:
+        dict: The correction fields exposed by CorrectionResponse
+    """
+    return {key: getattr(correction, key) for key in RESPONSE_KEYS + ("word_diff",)}
+
+async def get_user_correction_rows(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10
+) -> list[dict]:
+    """
+    Retrieves a user's correction history as plain dictionaries.
+    
+    Selects only the response columns and skips ORM hydration, so the result
+    can be serialized directly.
+    
+    Args:
+        db (AsyncSession): The database session
+        user_id (int): The ID of the user
+        skip (int): Number of records to skip for pagination
+        limit (int): Maximum number of records to return
+        
+    Returns:
+        list[dict]: List of correction rows
+    """
+    result = await db.execute(
+        select(*RESPONSE_COLUMNS)
+        .filter(Correction.user_id == user_id)
+        .order_by(Correction.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return rows_to_dicts(RESPONSE_KEYS, result.all())
+
+async def get_user_correction_summaries(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10
+) -> list[dict]:
+    """
+    Retrieves a user's correction history in summary form.
+    
+    The query only reads columns stored in the covering history index,
+    so the large text columns are never loaded.
+    
+    Args:
+        db (AsyncSession): The database session
+        user_id (int): The ID of the user
+        skip (int): Number of records to skip for pagination
+        limit (int): Maximum number of records to return
+        
+    Returns:
+        list[dict]: List of correction summaries
+    """
+    result = await db.execute(
+        select(*SUMMARY_COLUMNS)
+        .filter(Correction.user_id == user_id)
+        .order_by(Correction.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return rows_to_dicts(SUMMARY_KEYS, result.all())
+
+async def get_correction_row(
+    db: AsyncSession,
+    correction_id: int,
+    user_id: int,
+    include_diff: bool = False
+) -> Optional[dict]:
+    """
+    Retrieves a specific correction as a plain dictionary.
+    
+    Args:
+        db (AsyncSession): The database session
+        correction_id (int): The ID of the correction to retrieve
+        user_id (int): The ID of the user who owns the correction
+        include_diff (bool): Also read the stored word diff, computed in a worker
+            thread for corrections stored before diffs were
+        
+    Returns:
+        Optional[dict]: The correction row if found, None otherwise
+    """
+    columns = RESPONSE_COLUMNS + (Correction.word_diff,) if include_diff else RESPONSE_COLUMNS
+    result = await db.execute(
+        select(*columns)
+        .filter(Correction.id == correction_id)
+        .filter(Correction.user_id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    correction = dict(zip((column.key for column in columns), row))
+    if include_diff and correction["word_diff"] is None:
+        correction["word_diff"] = await asyncio.to_thread(
+            word_diff, correction["original_text"] or "", correction["corrected_text"] or ""
+        )
+    return correction
+
 async def get_correction(
     db: AsyncSession,
     correction_id: int,
@@ -114,10 +381,57 @@ async def delete_correction(
     Returns:
         bool: True if correction was deleted, False if not found
     """
-    db_correction = await get_correction(db, correction_id, user_id)
-    if not db_correction:
-        return False
+    deleted = await delete_corrections(db, user_id, ids=[correction_id])
+    return deleted > 0
+
+def _to_utc_naive(value: datetime) -> datetime:
+    """
+    Converts a datetime to naive UTC, the format SQLite stores timestamps in.
+    
+    Args:
+        value (datetime): An aware or naive datetime
         
-    await db.delete(db_correction)
+    Returns:
+        datetime: The naive UTC datetime
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+async def delete_corrections(
+    db: AsyncSession,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> int:
+    """
+    Deletes a user's corrections matching all given criteria in a single statement,
+    bumps the user's history version and subtracts them from the usage statistics.
+    
+    Args:
+        db (AsyncSession): The database session
+        user_id (int): The ID of the user who owns the corrections
+        ids (Optional[List[int]]): Restrict deletion to these correction IDs
+        created_after (Optional[datetime]): Restrict deletion to corrections created at or after this date
+        created_before (Optional[datetime]): Restrict deletion to corrections created before this date
+        
+    Returns:
+        int: The number of deleted corrections
+    """
+    stmt = delete(Correction).where(Correction.user_id == user_id).returning(*STAT_SOURCE_COLUMNS)
+    if ids is not None:
+        if not ids:
+            return 0
+        stmt = stmt.where(Correction.id.in_(ids))
+    if created_after is not None:
+        stmt = stmt.where(Correction.created_at >= _to_utc_naive(created_after))
+    if created_before is not None:
+        stmt = stmt.where(Correction.created_at < _to_utc_naive(created_before))
+    
+    deleted = (await db.execute(stmt)).all()
+    if deleted:
+        await bump_history_versions(db, [user_id])
+        await apply_correction_stats(db, deleted, -1)
     await db.commit()
-    return True 
\ No newline at end of file
+    return len(deleted)
@@ -0,0 +1,135 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+from fastapi import HTTPException
+from config import get_settings
+from database import SessionLocal
+from models import Correction
+from services.correction import compute_correction, correction_to_dict, store_correction
+from utils.metrics import metrics
+
+"""
+Live Correction Module
+
+This module drives the live-correction channel used by the editor. Revisions
+of the text are debounced server-side; a newer revision cancels the pending
+or in-flight correction of the older one, which closes the Ollama request so
+the backend stops generating. Nothing is stored until the client settles on
+a final revision.
+"""
+
+settings = get_settings()
+
+metrics.describe("styleguard_live_revisions_total", "counter", "Revisions received on live-correction channels")
+metrics.describe("styleguard_live_superseded_total", "counter", "Live corrections cancelled by a newer revision, by stage")
+
+class LiveCorrectionSession:
+    """
+    State of one live-correction channel.
+
+    Only the latest revision is ever corrected. Its result is sent to the
+    client and kept until finalize() stores it.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        language_profile: Optional[dict],
+        send: Callable[[dict], Awaitable[None]],
+        tier: Optional[str] = None
+    ):
+        """
+        Args:
+            user_id (int): The ID of the connected user
+            language_profile (Optional[dict]): The user's language profile
+            send (Callable[[dict], Awaitable[None]]): Sends a message to the client
+            tier (Optional[str]): The user's tier, used for model routing
+        """
+        self.user_id = user_id
+        self.language_profile = language_profile
+        self.send = send
+        self.tier = tier
+        self.revision = 0
+        self.text = ""
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight = False
+        self._result: Optional[dict] = None
+        self._result_revision = -1
+        self._saved_revision = -1
+
+    async def _correct(self, revision: int, text: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._in_flight = True
+        try:
+            values = await compute_correction(text, self.user_id, "live", self.language_profile, self.tier)
+        except HTTPException as e:
+            await self.send({"revision": revision, "error": e.detail})
+            return
+        finally:
+            self._in_flight = False
+        self._result = values
+        self._result_revision = revision
+        await self.send({
+            "revision": revision,
+            "corrected_text": values["corrected_text"],
+            "language": values["language"]
+        })
+
+    async def _stop_task(self) -> None:
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, text: str, revision: Optional[int] = None) -> None:
+        """
+        Accepts a new revision of the text and schedules its correction after
+        the debounce window, superseding any older revision.
+
+        Args:
+            text (str): The current text of the editor
+            revision (Optional[int]): The client's revision number, incremented when omitted
+        """
+        metrics.inc("styleguard_live_revisions_total")
+        if self._task is not None and not self._task.done():
+            metrics.inc("styleguard_live_superseded_total", stage="ollama" if self._in_flight else "debounce")
+            await self._stop_task()
+        self.revision = revision if revision is not None else self.revision + 1
+        self.text = text
+        self._task = asyncio.create_task(
+            self._correct(self.revision, text, settings.live_debounce_ms / 1000)
+        )
+
+    async def finalize(self) -> Optional[Correction]:
+        """
+        Stores the correction of the latest revision, correcting it right
+        away if it is still pending.
+
+        Returns:
+            Optional[Correction]: The stored correction, None if the latest revision
+            failed, is empty or was already stored
+        """
+        if not self.text.strip() or self._saved_revision == self.revision:
+            return None
+        if self._result_revision != self.revision:
+            if self._task is not None and not self._task.done() and self._in_flight:
+                await self._task
+            else:
+                # Skip what is left of the debounce window
+                await self._stop_task()
+                await self._correct(self.revision, self.text, 0)
+        if self._result_revision != self.revision:
+            return None
+        async with SessionLocal() as db:
+            correction = await store_correction(db, self._result)
+        self._saved_revision = self.revision
+        await self.send({"revision": self.revision, "saved": correction_to_dict(correction)})
+        return correction
+
+    async def close(self) -> None:
+        """
+        Cancels any pending correction; unsaved revisions are dropped.
+        """
+        await self._stop_task()
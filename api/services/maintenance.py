@@ -0,0 +1,110 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+from sqlalchemy import select, func
+from config import get_settings
+from database import SessionLocal, engine
+from models import User, Correction
+from services.correction import delete_corrections
+from utils.shared_store import shared_store
+
+"""
+Maintenance Service Module
+
+This module enforces correction retention policies and keeps the SQLite
+database healthy (statistics and free pages) through a background job.
+"""
+
+settings = get_settings()
+
+async def purge_expired_corrections(
+    db: AsyncSession,
+    batch_size: int = None
+) -> int:
+    """
+    Deletes corrections older than the retention policy of their owner.
+
+    A user's retention_days overrides the global setting; 0 keeps corrections forever.
+    Rows are removed in small transactions so concurrent writers are never
+    blocked for long.
+
+    Args:
+        db (AsyncSession): The database session
+        batch_size (int): Maximum number of rows deleted per transaction
+
+    Returns:
+        int: The total number of deleted corrections
+    """
+    batch_size = batch_size or settings.maintenance_batch_size
+    effective_days = func.coalesce(User.retention_days, settings.retention_days)
+    policies = (await db.execute(
+        select(User.id, effective_days).where(effective_days > 0)
+    )).all()
+
+    total = 0
+    for user_id, days in policies:
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        while True:
+            ids = (await db.execute(
+                select(Correction.id)
+                .filter(Correction.user_id == user_id)
+                .filter(Correction.created_at < cutoff)
+                .limit(batch_size)
+            )).scalars().all()
+            if not ids:
+                break
+
+            total += await delete_corrections(db, user_id, ids=ids)
+            # Give queued writers a chance to take the database lock
+            await asyncio.sleep(0)
+            if len(ids) < batch_size:
+                break
+    return total
+
+async def run_database_maintenance(db_engine: AsyncEngine = engine) -> None:
+    """
+    Refreshes query planner statistics and reclaims free pages.
+
+    ANALYZE is bounded by analysis_limit so it stays cheap on large tables, and
+    incremental_vacuum only releases a fixed number of pages per pass.
+
+    Args:
+        db_engine (AsyncEngine): The engine of the database to maintain
+    """
+    async with db_engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA analysis_limit=400")
+        await conn.exec_driver_sql("ANALYZE")
+        await conn.exec_driver_sql(
+            f"PRAGMA incremental_vacuum({int(settings.incremental_vacuum_pages)})"
+        )
+        await conn.commit()
+
+async def run_maintenance_pass() -> None:
+    """
+    Purges expired corrections and shared store keys, then maintains the database.
+    """
+    await shared_store.purge_expired()
+    async with SessionLocal() as db:
+        deleted = await purge_expired_corrections(db)
+    if deleted:
+        print(f"Maintenance: purged {deleted} expired corrections")
+    await run_database_maintenance()
+
+async def maintenance_loop() -> None:
+    """
+    Runs maintenance passes until cancelled.
+    
+    When several workers are running, a lease in the shared store ensures
+    only one of them performs each pass.
+    """
+    lease_ttl = max(settings.maintenance_interval_seconds - 1, 1)
+    while True:
+        try:
+            if await shared_store.add("lease:maintenance", os.getpid(), ttl=lease_ttl):
+                await run_maintenance_pass()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error during database maintenance: {e}")
+        await asyncio.sleep(settings.maintenance_interval_seconds)
@@ -0,0 +1,100 @@
+from typing import Optional
+from sqlalchemy import delete, insert, select
+from database import SessionLocal
+from models import PendingCorrection
+
+"""
+Pending Correction Service Module
+
+This module persists correction work that a shutting-down worker could not
+finish, so the next start completes it instead of losing it. Deferred work
+is claimed one job at a time, which lets several workers resume it together.
+"""
+
+class CorrectionDeferred(Exception):
+    """
+    Raised when a correction was persisted to be completed after a restart.
+    """
+
+    def __init__(self, pending_id: int):
+        """
+        Args:
+            pending_id (int): ID of the persisted job
+        """
+        super().__init__(f"Correction deferred as pending job {pending_id}")
+        self.pending_id = pending_id
+
+def deferred_body(pending_id: int) -> dict:
+    """
+    Builds the body of the 202 response sent for a deferred correction.
+
+    Args:
+        pending_id (int): ID of the persisted job
+
+    Returns:
+        dict: The response content
+    """
+    return {"detail": "CORRECTION_DEFERRED", "pending_id": pending_id}
+
+async def defer_correction(user_id: int, original_text: str, priority_class: str) -> int:
+    """
+    Persists a correction to be processed on the next start.
+
+    Uses its own session: the caller's may be in the middle of a cancelled request.
+
+    Args:
+        user_id (int): The ID of the user requesting the correction
+        original_text (str): The text to correct
+        priority_class (str): Scheduling class of the original request
+
+    Returns:
+        int: The ID of the pending job
+    """
+    async with SessionLocal() as db:
+        pending_id = await db.scalar(
+            insert(PendingCorrection)
+            .values(user_id=user_id, original_text=original_text, priority_class=priority_class)
+            .returning(PendingCorrection.id)
+        )
+        await db.commit()
+    print(f"Deferred correction of user {user_id} as pending job {pending_id}")
+    return pending_id
+
+async def claim_pending_correction() -> Optional[PendingCorrection]:
+    """
+    Removes the oldest pending job from the table and returns it.
+
+    The claim is a single DELETE ... RETURNING, so two workers never get the same job.
+
+    Returns:
+        Optional[PendingCorrection]: The claimed job, None when nothing is pending
+    """
+    async with SessionLocal() as db:
+        oldest = select(PendingCorrection.id).order_by(PendingCorrection.id).limit(1).scalar_subquery()
+        result = await db.execute(
+            delete(PendingCorrection)
+            .where(PendingCorrection.id == oldest)
+            .returning(PendingCorrection)
+        )
+        job = result.scalar_one_or_none()
+        await db.commit()
+    return job
+
+async def requeue_pending_correction(job: PendingCorrection) -> None:
+    """
+    Puts back a claimed job that could not be completed.
+
+    Args:
+        job (PendingCorrection): The claimed job
+    """
+    async with SessionLocal() as db:
+        await db.execute(
+            insert(PendingCorrection).values(
+                id=job.id,
+                user_id=job.user_id,
+                original_text=job.original_text,
+                priority_class=job.priority_class,
+                created_at=job.created_at
+            )
+        )
+        await db.commit()
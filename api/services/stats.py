@@ -0,0 +1,218 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Correction, CorrectionStat
+
+"""
+Correction Statistics Service Module
+
+This module maintains the per-user, per-day aggregate of the corrections table
+and answers usage statistics from it. Counters are adjusted in the transaction
+that stores or deletes corrections, so statistics cost one row per day and
+language instead of a scan over the user's whole history. Days are UTC days.
+"""
+
+UNKNOWN_LANGUAGE = "unknown"
+
+# Columns of a correction that feed the aggregate, in the order deltas expect them
+STAT_SOURCE_COLUMNS = (
+    Correction.user_id,
+    Correction.created_at,
+    Correction.language,
+    Correction.original_length,
+    Correction.corrected_length,
+    Correction.change_count
+)
+
+StatKey = Tuple[int, date, str]
+
+def _stat_deltas(rows: Iterable[tuple], sign: int) -> Dict[StatKey, List[int]]:
+    """
+    Sums correction rows into counter deltas per user, day and language.
+
+    Args:
+        rows (Iterable[tuple]): Values of STAT_SOURCE_COLUMNS for each correction
+        sign (int): 1 for stored corrections, -1 for deleted ones
+
+    Returns:
+        Dict[StatKey, List[int]]: Count, original chars, corrected chars and changes per key
+    """
+    deltas: Dict[StatKey, List[int]] = {}
+    for user_id, created_at, language, original_length, corrected_length, change_count in rows:
+        day = (created_at or datetime.utcnow()).date()
+        delta = deltas.setdefault((user_id, day, language or UNKNOWN_LANGUAGE), [0, 0, 0, 0])
+        delta[0] += sign
+        delta[1] += sign * (original_length or 0)
+        delta[2] += sign * (corrected_length or 0)
+        delta[3] += sign * (change_count or 0)
+    return deltas
+
+async def apply_correction_stats(db: AsyncSession, rows: Iterable[tuple], sign: int) -> None:
+    """
+    Adds stored corrections to the aggregate, or subtracts deleted ones.
+
+    Must run in the transaction that stores or deletes the corrections, so the
+    aggregate never disagrees with the table. Days left without corrections
+    are removed.
+
+    Args:
+        db (AsyncSession): The database session
+        rows (Iterable[tuple]): Values of STAT_SOURCE_COLUMNS for each correction
+        sign (int): 1 for stored corrections, -1 for deleted ones
+    """
+    deltas = _stat_deltas(rows, sign)
+    if not deltas:
+        return
+
+    stmt = sqlite_insert(CorrectionStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CorrectionStat.user_id, CorrectionStat.day, CorrectionStat.language],
+        set_={
+            "correction_count": CorrectionStat.correction_count + stmt.excluded.correction_count,
+            "original_chars": CorrectionStat.original_chars + stmt.excluded.original_chars,
+            "corrected_chars": CorrectionStat.corrected_chars + stmt.excluded.corrected_chars,
+            "change_count": CorrectionStat.change_count + stmt.excluded.change_count
+        }
+    )
+    await db.execute(stmt, [
+        {
+            "user_id": user_id,
+            "day": day,
+            "language": language,
+            "correction_count": count,
+            "original_chars": original_chars,
+            "corrected_chars": corrected_chars,
+            "change_count": changes
+        }
+        for (user_id, day, language), (count, original_chars, corrected_chars, changes) in deltas.items()
+    ])
+    if sign < 0:
+        await db.execute(
+            delete(CorrectionStat)
+            .where(CorrectionStat.user_id.in_({user_id for user_id, _, _ in deltas}))
+            .where(CorrectionStat.correction_count <= 0)
+        )
+
+def rebuild_statements(user_id: Optional[int] = None) -> tuple:
+    """
+    Builds the statements recomputing the aggregate from the corrections table.
+
+    Args:
+        user_id (Optional[int]): Only rebuild this user's statistics
+
+    Returns:
+        tuple: The statement clearing the aggregate and the one refilling it
+    """
+    source = (
+        select(
+            Correction.user_id,
+            func.date(Correction.created_at),
+            func.coalesce(Correction.language, UNKNOWN_LANGUAGE),
+            func.count(),
+            func.coalesce(func.sum(Correction.original_length), 0),
+            func.coalesce(func.sum(Correction.corrected_length), 0),
+            func.coalesce(func.sum(Correction.change_count), 0)
+        )
+        .where(Correction.user_id.is_not(None))
+        .group_by(
+            Correction.user_id,
+            func.date(Correction.created_at),
+            func.coalesce(Correction.language, UNKNOWN_LANGUAGE)
+        )
+    )
+    clear = delete(CorrectionStat)
+    if user_id is not None:
+        source = source.where(Correction.user_id == user_id)
+        clear = clear.where(CorrectionStat.user_id == user_id)
+    fill = insert(CorrectionStat).from_select(
+        [
+            CorrectionStat.user_id,
+            CorrectionStat.day,
+            CorrectionStat.language,
+            CorrectionStat.correction_count,
+            CorrectionStat.original_chars,
+            CorrectionStat.corrected_chars,
+            CorrectionStat.change_count
+        ],
+        source
+    )
+    return clear, fill
+
+async def rebuild_correction_stats(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """
+    Recomputes the aggregate from the corrections table in one transaction.
+
+    Args:
+        db (AsyncSession): The database session
+        user_id (Optional[int]): Only rebuild this user's statistics
+
+    Returns:
+        int: The number of aggregate rows written
+    """
+    clear, fill = rebuild_statements(user_id)
+    await db.execute(clear)
+    result = await db.execute(fill)
+    await db.commit()
+    return result.rowcount
+
+async def get_user_stats(db: AsyncSession, user_id: int, days: int = 30) -> dict:
+    """
+    Retrieves a user's usage statistics from the aggregate.
+
+    Totals and the language breakdown cover the whole history, the activity
+    covers the last days only.
+
+    Args:
+        db (AsyncSession): The database session
+        user_id (int): The ID of the user
+        days (int): Number of days of activity to return, today included
+
+    Returns:
+        dict: The fields of CorrectionStats
+    """
+    result = await db.execute(
+        select(
+            CorrectionStat.day,
+            CorrectionStat.language,
+            CorrectionStat.correction_count,
+            CorrectionStat.original_chars,
+            CorrectionStat.corrected_chars,
+            CorrectionStat.change_count
+        )
+        .where(CorrectionStat.user_id == user_id)
+        .order_by(CorrectionStat.day)
+    )
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    totals = [0, 0, 0, 0]
+    languages: Dict[str, List[int]] = {}
+    activity: Dict[date, List[int]] = {}
+    for day, language, count, original_chars, corrected_chars, changes in result.all():
+        totals[0] += count
+        totals[1] += original_chars
+        totals[2] += corrected_chars
+        totals[3] += changes
+        usage = languages.setdefault(language, [0, 0])
+        usage[0] += count
+        usage[1] += original_chars
+        if day >= since:
+            daily = activity.setdefault(day, [0, 0])
+            daily[0] += count
+            daily[1] += original_chars
+
+    return {
+        "total_corrections": totals[0],
+        "total_characters": totals[1],
+        "corrected_characters": totals[2],
+        "total_changes": totals[3],
+        "languages": [
+            {"language": language, "corrections": count, "characters": characters}
+            for language, (count, characters) in sorted(languages.items(), key=lambda item: -item[1][0])
+        ],
+        "activity": [
+            {"day": day.isoformat(), "corrections": count, "characters": characters}
+            for day, (count, characters) in activity.items()
+        ]
+    }
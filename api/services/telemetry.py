@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Correction
+
+"""
+Generation Telemetry Service Module
+
+This module aggregates the Ollama telemetry stored with each correction into
+per-language and per-model figures used to size hardware: generation speed,
+how often a request had to load the model, and GPU time per character.
+"""
+
+# Ollama reports a few milliseconds of load time when the model is already in memory
+COLD_LOAD_NS = 250_000_000
+
+def _per_second(tokens: int, duration_ns: int) -> Optional[float]:
+    return tokens / (duration_ns / 1e9) if duration_ns else None
+
+async def get_generation_report(db: AsyncSession, since: Optional[datetime] = None) -> List[dict]:
+    """
+    Aggregates generation telemetry by language and model.
+
+    Args:
+        db (AsyncSession): The database session
+        since (Optional[datetime]): Only include corrections created at or after this naive UTC date
+
+    Returns:
+        List[dict]: One entry per language and model, most corrections first, with
+        token throughput, cold load incidence and GPU milliseconds per 1000 characters
+    """
+    cold = Correction.load_duration >= COLD_LOAD_NS
+    stmt = (
+        select(
+            Correction.language,
+            Correction.model,
+            func.count(),
+            func.coalesce(func.sum(Correction.original_length), 0),
+            func.coalesce(func.sum(Correction.prompt_eval_count), 0),
+            func.coalesce(func.sum(Correction.prompt_eval_duration), 0),
+            func.coalesce(func.sum(Correction.eval_count), 0),
+            func.coalesce(func.sum(Correction.eval_duration), 0),
+            func.coalesce(func.sum(Correction.load_duration), 0),
+            func.coalesce(func.sum(case((cold, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((cold, Correction.load_duration), else_=0)), 0)
+        )
+        .where(Correction.model.is_not(None))
+        .group_by(Correction.language, Correction.model)
+        .order_by(func.count().desc())
+    )
+    if since is not None:
+        stmt = stmt.where(Correction.created_at >= since)
+
+    report = []
+    for (language, model, count, characters, prompt_tokens, prompt_ns,
+         eval_tokens, eval_ns, load_ns, cold_loads, cold_load_ns) in (await db.execute(stmt)).all():
+        gpu_ns = prompt_ns + eval_ns + load_ns
+        report.append({
+            "language": language or "unknown",
+            "model": model,
+            "corrections": count,
+            "characters": characters,
+            "prompt_tokens_per_second": _per_second(prompt_tokens, prompt_ns),
+            "eval_tokens_per_second": _per_second(eval_tokens, eval_ns),
+            "eval_tokens_per_character": eval_tokens / characters if characters else None,
+            "cold_load_rate": cold_loads / count,
+            "mean_cold_load_seconds": cold_load_ns / cold_loads / 1e9 if cold_loads else None,
+            "gpu_ms_per_1k_characters": gpu_ns / 1e6 / characters * 1000 if characters else None
+        })
+    return report
@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from models import User
 from schemas.user import UserCreate, UserUpdate
 from utils.password import get_password_hash, verify_password
+from utils.language import update_profile
 
 """
 User Service Module
@@ -110,6 +113,9 @@ async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate) -
         
     Returns:
         User: The updated user object
+        
+    Raises:
+        HTTPException: If the email or username belongs to another user
     """
     db_user = await get_user(db, user_id)
     if not db_user:
@@ -118,11 +124,33 @@ async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate) -
     update_data = user_update.dict(exclude_unset=True)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+
+    # Email and username are unique, check them before writing
+    for field, detail in (("email", "Email already registered"), ("username", "Username already taken")):
+        value = update_data.get(field)
+        if value is None or value == getattr(db_user, field):
+            continue
+        taken = await db.execute(
+            select(User.id).filter(getattr(User, field) == value, User.id != user_id)
+        )
+        if taken.first():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
         
     for field, value in update_data.items():
         setattr(db_user, field, value)
         
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        # Taken by a concurrent update since the check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered"
+        ) from e
+    except Exception:
+        await db.rollback()
+        raise
     await db.refresh(db_user)
     return db_user
 
@@ -143,4 +171,49 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
         
     await db.delete(db_user)
     await db.commit()
-    return True 
\ No newline at end of file
+    return True 
+
+async def bump_history_versions(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """
+    Increments the history version of users whose corrections changed.
+    
+    Must run in the same transaction as the change, so ETags derived from
+    the version never outlive the data they describe.
+    
+    Args:
+        db (AsyncSession): The database session
+        user_ids (Iterable[int]): The IDs of the users whose history changed
+    """
+    user_ids = set(user_ids)
+    if user_ids:
+        await db.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(history_version=User.history_version + 1)
+        )
+
+
+async def update_language_profiles(db: AsyncSession, observations: Iterable[Tuple[int, str]]) -> None:
+    """
+    Folds newly detected languages into the users' rolling language profiles.
+    
+    Must run in the transaction that stores the corrections: on SQLite the
+    insert already holds the write lock, so concurrent writers cannot
+    interleave between reading and updating a profile.
+    
+    Args:
+        db (AsyncSession): The database session
+        observations (Iterable[Tuple[int, str]]): User ID and detected language, oldest first
+    """
+    languages: Dict[int, List[str]] = {}
+    for user_id, language in observations:
+        if language and language != "unknown":
+            languages.setdefault(user_id, []).append(language)
+    if not languages:
+        return
+
+    result = await db.execute(select(User.id, User.language_profile).where(User.id.in_(languages)))
+    for user_id, profile in result.all():
+        for language in languages[user_id]:
+            profile = update_profile(profile, language)
+        await db.execute(update(User).where(User.id == user_id).values(language_profile=profile))
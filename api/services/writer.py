@@ -0,0 +1,174 @@
+import asyncio
+from typing import List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import SessionLocal
+from models import Correction
+from services.user import bump_history_versions, update_language_profiles
+from services.stats import STAT_SOURCE_COLUMNS, apply_correction_stats
+
+"""
+Correction Writer Module
+
+This module batches correction inserts into group commits. On SQLite every
+commit is an fsync, so collecting the inserts that arrive within a short
+window and committing them in one transaction multiplies write throughput.
+"""
+
+settings = get_settings()
+
+# Optional key of the submitted values: the detected language to fold into the
+# user's language profile. It is not a column and is stripped before the insert.
+PROFILE_LANGUAGE = "profile_language"
+
+async def insert_corrections(db: AsyncSession, values: List[dict]) -> List[Correction]:
+    """
+    Inserts corrections and commits them in a single transaction.
+
+    Rows are read back with RETURNING, so no refresh query is needed.
+    The history version, language profile and usage statistics of every
+    affected user are updated in the same transaction.
+
+    Args:
+        db (AsyncSession): The database session
+        values (List[dict]): The column values of each correction
+
+    Returns:
+        List[Correction]: The stored corrections, in the order of values
+    """
+    rows = [{key: val for key, val in value.items() if key != PROFILE_LANGUAGE} for value in values]
+    result = await db.scalars(
+        insert(Correction).returning(Correction, sort_by_parameter_order=True),
+        rows
+    )
+    corrections = result.all()
+    await bump_history_versions(db, (value["user_id"] for value in values))
+    await update_language_profiles(db, ((value["user_id"], value.get(PROFILE_LANGUAGE)) for value in values))
+    await apply_correction_stats(
+        db,
+        (tuple(getattr(correction, column.key) for column in STAT_SOURCE_COLUMNS) for correction in corrections),
+        1
+    )
+    await db.commit()
+    return corrections
+
+class CorrectionWriter:
+    """
+    Background writer that group-commits pending correction inserts.
+
+    Callers submit column values and await the stored row. The writer waits
+    up to window_ms after the first pending insert, or until max_batch_size
+    inserts are pending, then commits them all at once.
+    """
+
+    def __init__(self, window_ms: int, max_batch_size: int):
+        """
+        Args:
+            window_ms (int): How long to wait for more inserts after the first one
+            max_batch_size (int): Maximum number of inserts per transaction
+        """
+        self.window = window_ms / 1000
+        self.max_batch_size = max(max_batch_size, 1)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Starts the background writer task.
+        """
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Commits every pending insert and stops the background writer task.
+        """
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        while not self._queue.empty():
+            await self._flush(self._drain(self.max_batch_size))
+
+    async def submit(self, values: dict) -> Correction:
+        """
+        Queues a correction insert and waits for its group commit.
+
+        Args:
+            values (dict): The column values of the correction
+
+        Returns:
+            Correction: The stored correction
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((values, future))
+        return await future
+
+    def _drain(self, limit: int) -> List[Tuple[dict, asyncio.Future]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                batch.append(item)
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                else:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        # Submitters cancelled while queued (client gone) are not written
+        batch = [(values, future) for values, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            async with SessionLocal() as db:
+                # Waiting for the write connection can take a while, check again just before the insert
+                await db.connection()
+                batch = [(values, future) for values, future in batch if not future.done()]
+                if not batch:
+                    return
+                corrections = await insert_corrections(db, [values for values, _ in batch])
+        except Exception as e:
+            print(f"Error writing {len(batch)} corrections: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), correction in zip(batch, corrections):
+            if not future.done():
+                future.set_result(correction)
+
+correction_writer = CorrectionWriter(
+    settings.write_batch_window_ms,
+    settings.write_batch_max_size
+)
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta
+from database import ReadSessionLocal, read_engine
+from services.telemetry import get_generation_report
+
+"""
+Generation Telemetry Report Script
+
+This script prints the Ollama telemetry recorded with corrections, grouped by
+language and model: prompt and generation tokens per second, how often the
+model had to be loaded, and GPU time per 1000 corrected characters.
+
+Usage:
+    python telemetry_report.py [--days 30] [--json]
+"""
+
+# Key in the report, column header, width and number format
+COLUMNS = (
+    ("language", "language", 8, "{}"),
+    ("model", "model", 20, "{}"),
+    ("corrections", "count", 7, "{}"),
+    ("characters", "chars", 10, "{}"),
+    ("prompt_tokens_per_second", "prompt tok/s", 12, "{:.1f}"),
+    ("eval_tokens_per_second", "eval tok/s", 10, "{:.1f}"),
+    ("eval_tokens_per_character", "tok/char", 8, "{:.3f}"),
+    ("cold_load_rate", "cold loads", 10, "{:.1%}"),
+    ("mean_cold_load_seconds", "load s", 6, "{:.1f}"),
+    ("gpu_ms_per_1k_characters", "GPU ms/1k chars", 15, "{:.0f}")
+)
+
+def _line(cells) -> str:
+    return " ".join(
+        cell.ljust(width) if index < 2 else cell.rjust(width)
+        for index, (cell, (_, _, width, _)) in enumerate(zip(cells, COLUMNS))
+    )
+
+async def report(days: int, as_json: bool) -> None:
+    """
+    Prints the telemetry report of the last days.
+
+    Args:
+        days (int): Number of days covered, 0 for the whole history
+        as_json (bool): Print JSON instead of a table
+    """
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    async with ReadSessionLocal() as db:
+        rows = await get_generation_report(db, since)
+    await read_engine.dispose()
+
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print("No correction with telemetry in this period.")
+        return
+    print(_line(label for _, label, _, _ in COLUMNS))
+    for row in rows:
+        print(_line("-" if row[key] is None else fmt.format(row[key]) for key, _, _, fmt in COLUMNS))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report Ollama telemetry by language and model.")
+    parser.add_argument("--days", type=int, default=30, help="Days covered, 0 for the whole history")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+    asyncio.run(report(args.days, args.json))
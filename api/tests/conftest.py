@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import pytest
+
+"""
+Test Configuration
+
+Settings are read from the environment when the application modules are
+first imported, so the test environment is set here, before any of them.
+Every test run works on its own temporary database and shared store.
+
+Usage:
+    cd api && python -m pytest -q
+"""
+
+_tmp = tempfile.mkdtemp(prefix="styleguard-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_tmp, 'styleguard.db')}",
+    "SHARED_STORE_PATH": os.path.join(_tmp, "shared.db"),
+    "SECRET_KEY": "test-secret-key",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "OLLAMA_API_URL": "http://127.0.0.1:9/api/generate",
+    "MODEL_NAME": "test-model",
+    "PROFILING_DIR": os.path.join(_tmp, "profiles"),
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    """
+    An HTTP client on the application, with an empty database.
+    """
+    import httpx
+    from database import engine, read_engine
+    from migrations import reset_schema
+    from main import app
+
+    await reset_schema()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+    await read_engine.dispose()
+
+async def register(client, email: str = "alice@example.com", username: str = "alice", password: str = "secret-pw") -> dict:
+    """
+    Registers a user and logs in.
+
+    Returns:
+        dict: The Authorization header of the user
+    """
+    response = await client.post("/auth/register", json={"email": email, "username": username, "password": password})
+    assert response.status_code == 200, response.text
+    response = await client.post("/auth/token", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
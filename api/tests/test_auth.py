@@ -0,0 +1,61 @@
+import pytest
+from conftest import register
+
+"""
+Tests for updating the current user with PATCH /auth/me.
+"""
+
+@pytest.mark.anyio
+async def test_retention_days_is_updated(client):
+    headers = await register(client)
+
+    response = await client.patch("/auth/me", json={"retention_days": 30}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["retention_days"] == 30
+    assert (await client.get("/auth/me", headers=headers)).json()["retention_days"] == 30
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("body", [
+    {"password": None},
+    {"email": None},
+    {"username": None},
+    {"retention_days": None},
+    {"retention_days": -1},
+    {"email": "not-an-email"},
+])
+async def test_invalid_values_are_rejected(client, body):
+    headers = await register(client)
+
+    response = await client.patch("/auth/me", json=body, headers=headers)
+
+    assert response.status_code == 422
+    user = (await client.get("/auth/me", headers=headers)).json()
+    assert user["email"] == "alice@example.com"
+    assert user["username"] == "alice"
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("body", [{"email": "bob@example.com"}, {"username": "bob"}])
+async def test_taken_email_or_username_is_rejected(client, body):
+    headers = await register(client)
+    await register(client, "bob@example.com", "bob")
+
+    response = await client.patch("/auth/me", json=body, headers=headers)
+
+    assert response.status_code == 400
+    user = (await client.get("/auth/me", headers=headers)).json()
+    assert (user["email"], user["username"]) == ("alice@example.com", "alice")
+
+@pytest.mark.anyio
+async def test_unchanged_email_and_new_password(client):
+    headers = await register(client)
+
+    response = await client.patch(
+        "/auth/me", json={"email": "alice@example.com", "password": "new-secret"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    login = await client.post("/auth/token", data={"username": "alice@example.com", "password": "new-secret"})
+    assert login.status_code == 200
+    login = await client.post("/auth/token", data={"username": "alice@example.com", "password": "secret-pw"})
+    assert login.status_code == 401
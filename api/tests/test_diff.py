@@ -0,0 +1,81 @@
+import random
+from utils.diff import count_changes, diff_blocks, word_diff
+from utils.divergence import validate_correction
+
+"""
+Tests for the word-level diff stored with each correction.
+"""
+
+def _apply(original: str, diff: list) -> str:
+    # Rebuilds the correction the way a client does
+    result = []
+    position = 0
+    for op, value in diff:
+        if op == 0:
+            result.append(original[position:position + value])
+            position += value
+        elif op == -1:
+            assert original[position:position + len(value)] == value
+            position += len(value)
+        else:
+            result.append(value)
+    assert position == len(original)
+    return "".join(result)
+
+def _edit(words: list, rng: random.Random, rate: float) -> list:
+    edited = []
+    for word in words:
+        roll = rng.random()
+        if roll < rate / 3:
+            continue
+        if roll < rate * 2 / 3:
+            edited.append(word.upper())
+        elif roll < rate:
+            edited.extend([word, "really"])
+        else:
+            edited.append(word)
+    return edited
+
+PAIRS = [
+    ("", ""),
+    ("", "Hello there."),
+    ("Hello there.", ""),
+    ("Same text.", "Same text."),
+    ("Teh cat sat.", "The cat sat."),
+    ("  Leading and trailing  ", "Leading and trailing"),
+    ("One sentence. Two sentence.", "One sentence, two sentences."),
+    ("Ça marche très bien 👍 non ?", "Ça marche très bien 👍, non ?"),
+    ("Line one\n\nLine two", "Line one\nLine 2"),
+]
+
+def test_word_diff_round_trip_on_known_pairs():
+    for original, corrected in PAIRS:
+        assert _apply(original, word_diff(original, corrected)) == corrected, (original, corrected)
+
+def test_word_diff_round_trip_on_random_edits():
+    rng = random.Random(50)
+    vocabulary = ["the", "cat", "sat", "on", "mat", "and", "then", "it", "slept", "well"]
+    for _ in range(200):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 80))]
+        punctuated = [word + "." if rng.random() < 0.1 else word for word in words]
+        original = " ".join(punctuated)
+        corrected = " ".join(_edit(punctuated, rng, rng.choice([0.0, 0.05, 0.3, 1.0])))
+        assert _apply(original, word_diff(original, corrected)) == corrected, (original, corrected)
+
+def test_diff_of_validation_blocks_matches_validated_text():
+    original = "Teh cat sat on the mat. It was happy there. The dog slept all day long."
+    answer = "The cat sat on the mat. Nothing about this sentence resembles what was written before. The dog slept all day."
+    corrected, rejected, blocks = validate_correction(original, answer)
+    diff = diff_blocks(blocks)
+    assert rejected == 1
+    assert _apply(original, diff) == corrected
+
+def test_diff_is_compact():
+    diff = word_diff("The cat sat on the mat.", "The cat sat on a mat.")
+    assert diff == [[0, 15], [-1, "the"], [1, "a"], [0, 5]]
+
+def test_count_changes_ignores_whitespace_only_edits():
+    assert count_changes(word_diff("a b c d", "a b c d")) == 0
+    assert count_changes(word_diff("a b c d", "a  b c d")) == 0
+    assert count_changes(word_diff("a b c d", "x b c y")) == 2
+    assert count_changes(word_diff("a b c d", "x y c d")) == 1
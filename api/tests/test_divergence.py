@@ -0,0 +1,45 @@
+from utils.divergence import split_segments, validate_correction
+
+"""
+Tests for the sentence-by-sentence validation of model answers.
+"""
+
+ORIGINAL = "Teh cat sat on the mat. It was happy there. The dog slept all day long."
+
+def test_small_fixes_are_kept():
+    answer = "The cat sat on the mat. It was happy there. The dog slept all day long."
+    corrected, rejected, blocks = validate_correction(ORIGINAL, answer)
+    assert corrected == answer
+    assert rejected == 0
+    assert "".join(before for before, _ in blocks) == ORIGINAL
+
+def test_divergent_sentence_is_replaced_by_the_original():
+    answer = (
+        "The cat sat on the mat. Nothing about this sentence resembles what was written before. "
+        "The dog slept all day long."
+    )
+    corrected, rejected, _ = validate_correction(ORIGINAL, answer)
+    assert rejected == 1
+    assert corrected == "The cat sat on the mat. It was happy there. The dog slept all day long."
+
+def test_invented_sentence_is_removed():
+    answer = "The cat sat on the mat. It was happy there. Here is your corrected text! The dog slept all day long."
+    corrected, rejected, _ = validate_correction(ORIGINAL, answer)
+    assert rejected == 1
+    assert corrected == "The cat sat on the mat. It was happy there. The dog slept all day long."
+
+def test_long_unpunctuated_text_is_cut_into_pieces():
+    words = [f"word{i % 97}" for i in range(5000)]
+    original = " ".join(words)
+    segments = split_segments(original)
+    assert "".join(segments) == original
+    assert max(len(segment.split()) for segment in segments) <= 120
+
+    fixed = list(words)
+    for i in range(0, len(fixed), 250):
+        fixed[i] = "fixed"
+    answer = " ".join(fixed)
+    corrected, rejected, blocks = validate_correction(original, answer)
+    assert rejected == 0
+    assert corrected == answer
+    assert "".join(before for before, _ in blocks) == original
@@ -0,0 +1,30 @@
+import pytest
+from conftest import register
+
+"""
+Tests for conditional GET on the correction history.
+"""
+
+@pytest.mark.anyio
+async def test_etag_revalidation(client):
+    headers = await register(client)
+
+    first = await client.get("/corrections/", headers=headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    for tag in (etag, etag.removeprefix("W/"), f'"other", {etag}'):
+        response = await client.get("/corrections/", headers={**headers, "If-None-Match": tag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    response = await client.get("/corrections/", headers={**headers, "If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+@pytest.mark.anyio
+async def test_wildcard_does_not_hide_a_missing_correction(client):
+    headers = await register(client)
+
+    response = await client.get("/corrections/12345", headers={**headers, "If-None-Match": "*"})
+
+    assert response.status_code == 404
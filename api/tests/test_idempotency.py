@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+import pytest
+import routes.corrections
+import services.correction
+from conftest import register
+from services.pending import CorrectionDeferred, defer_correction
+from utils.diff import diff_blocks
+
+"""
+Tests for Idempotency-Key handling on POST /corrections/.
+"""
+
+@pytest.fixture
+def generations(monkeypatch):
+    """
+    Replaces the Ollama generation, recording each text sent to it.
+    """
+    calls = []
+
+    async def fake_correct(text, priority_class="default", language=None, tier=None):
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        corrected = text.replace("Teh", "The")
+        return corrected, diff_blocks([(text, corrected)]), {"model": "test-model", "prompt_version": "test"}
+
+    monkeypatch.setattr(services.correction, "correct_text_with_telemetry", fake_correct)
+    return calls
+
+@pytest.mark.anyio
+async def test_retry_replays_the_first_response(client, generations):
+    headers = {**await register(client), "Idempotency-Key": str(uuid.uuid4())}
+    body = {"original_text": "Teh cat sat on the mat."}
+
+    first = await client.post("/corrections/", json=body, headers=headers)
+    retry = await client.post("/corrections/", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert first.json()["corrected_text"] == "The cat sat on the mat."
+    assert len(generations) == 1
+
+    history = await client.get("/corrections/", headers=headers)
+    assert len(history.json()) == 1
+
+@pytest.mark.anyio
+async def test_concurrent_retries_share_one_generation(client, generations):
+    headers = {**await register(client), "Idempotency-Key": str(uuid.uuid4())}
+    body = {"original_text": "Teh dog slept."}
+
+    responses = await asyncio.gather(*(client.post("/corrections/", json=body, headers=headers) for _ in range(3)))
+
+    assert [response.status_code for response in responses] == [200] * 3
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum(response.headers.get("Idempotent-Replayed") == "true" for response in responses) == 2
+    assert len(generations) == 1
+
+@pytest.mark.anyio
+async def test_key_reused_for_another_text_is_rejected(client, generations):
+    headers = {**await register(client), "Idempotency-Key": str(uuid.uuid4())}
+
+    first = await client.post("/corrections/", json={"original_text": "Teh cat."}, headers=headers)
+    other = await client.post("/corrections/", json={"original_text": "Another text."}, headers=headers)
+
+    assert first.status_code == 200
+    assert other.status_code == 422
+    assert len(generations) == 1
+
+@pytest.mark.anyio
+async def test_keys_are_per_user(client, generations):
+    key = str(uuid.uuid4())
+    alice = {**await register(client), "Idempotency-Key": key}
+    bob = {**await register(client, "bob@example.com", "bob"), "Idempotency-Key": key}
+    body = {"original_text": "Teh cat sat."}
+
+    first = await client.post("/corrections/", json=body, headers=alice)
+    second = await client.post("/corrections/", json=body, headers=bob)
+
+    assert first.status_code == second.status_code == 200
+    assert "Idempotent-Replayed" not in second.headers
+    assert first.json()["id"] != second.json()["id"]
+    assert len(generations) == 2
+
+@pytest.mark.anyio
+async def test_deferred_correction_keeps_its_key(client, generations, monkeypatch):
+    headers = {**await register(client), "Idempotency-Key": str(uuid.uuid4())}
+    body = {"original_text": "Teh cat sat."}
+    deferrals = []
+
+    async def draining(db, correction, user_id, *args):
+        deferrals.append(correction.original_text)
+        raise CorrectionDeferred(await defer_correction(user_id, correction.original_text, "interactive"))
+
+    monkeypatch.setattr(routes.corrections, "create_correction", draining)
+
+    first = await client.post("/corrections/", json=body, headers=headers)
+    retry = await client.post("/corrections/", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 202
+    assert first.json() == {"detail": "CORRECTION_DEFERRED", "pending_id": first.json()["pending_id"]}
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(deferrals) == 1
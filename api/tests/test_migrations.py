@@ -0,0 +1,91 @@
+import sqlite3
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from migrations import LATEST_VERSION, upgrade_schema
+
+"""
+Tests for the schema upgrade of databases created before versioning.
+"""
+
+# Schema of the first release, before any migration
+BASELINE_DDL = """
+CREATE TABLE users (
+    id INTEGER NOT NULL,
+    email VARCHAR,
+    username VARCHAR,
+    hashed_password VARCHAR,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_users_id ON users (id);
+CREATE UNIQUE INDEX ix_users_username ON users (username);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE TABLE corrections (
+    id INTEGER NOT NULL,
+    user_id INTEGER,
+    original_text TEXT,
+    corrected_text TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_corrections_id ON corrections (id);
+INSERT INTO users (id, email, username, hashed_password) VALUES (1, 'alice@example.com', 'alice', 'x');
+INSERT INTO corrections (id, user_id, original_text, corrected_text)
+    VALUES (1, 1, 'Teh cat sat on the mat.', 'The cat sat on the mat.');
+"""
+
+@pytest.fixture
+def baseline_db(tmp_path):
+    path = tmp_path / "baseline.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_DDL)
+    conn.close()
+    return path
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+@pytest.mark.anyio
+async def test_baseline_database_is_upgraded_to_latest(baseline_db):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{baseline_db}")
+    try:
+        assert await upgrade_schema(engine) == (1, LATEST_VERSION)
+        # A second start finds nothing to do
+        assert await upgrade_schema(engine) == (LATEST_VERSION, LATEST_VERSION)
+    finally:
+        await engine.dispose()
+
+    conn = sqlite3.connect(baseline_db)
+    try:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        assert versions == list(range(1, LATEST_VERSION + 1))
+
+        assert {"retention_days", "history_version", "language_profile", "tier"} <= _columns(conn, "users")
+        assert {
+            "preview", "original_length", "corrected_length", "change_count",
+            "language", "model", "prompt_version", "eval_count", "word_diff"
+        } <= _columns(conn, "corrections")
+
+        # Existing rows are kept and their summary backfilled
+        row = conn.execute(
+            "SELECT original_text, preview, original_length, corrected_length, change_count FROM corrections"
+        ).fetchone()
+        assert row == ("Teh cat sat on the mat.", "Teh cat sat on the mat.", 23, 23, 1)
+        assert conn.execute("SELECT history_version, tier FROM users").fetchone() == (0, "standard")
+        assert conn.execute("SELECT SUM(correction_count) FROM correction_stats WHERE user_id = 1").fetchone() == (1,)
+
+        # Rebuilt once so incremental vacuum works on the upgraded file
+        assert conn.execute("PRAGMA auto_vacuum").fetchone() == (2,)
+    finally:
+        conn.close()
+
+@pytest.mark.anyio
+async def test_new_database_is_created_at_latest(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'new.db'}")
+    try:
+        assert await upgrade_schema(engine) == (None, LATEST_VERSION)
+        assert await upgrade_schema(engine) == (LATEST_VERSION, LATEST_VERSION)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+import services.correction
+from conftest import register
+from database import SessionLocal
+from models import PendingCorrection
+from services.correction import resume_pending_corrections
+from services.pending import defer_correction
+from utils.diff import diff_blocks
+
+"""
+Tests for resuming the corrections deferred by a shutdown.
+"""
+
+async def _pending_count() -> int:
+    async with SessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(PendingCorrection))
+
+@pytest.fixture
+def generation(monkeypatch):
+    async def fake_correct(text, priority_class="default", language=None, tier=None):
+        return text, diff_blocks([(text, text)]), {"model": "test-model", "prompt_version": "test"}
+
+    monkeypatch.setattr(services.correction, "correct_text_with_telemetry", fake_correct)
+
+@pytest.mark.anyio
+async def test_pending_corrections_are_completed(client, generation):
+    headers = await register(client)
+    await defer_correction(1, "First text.", "default")
+    await defer_correction(1, "Second text.", "default")
+
+    assert await resume_pending_corrections() == 2
+
+    assert await _pending_count() == 0
+    history = await client.get("/corrections/", headers=headers)
+    assert len(history.json()) == 2
+
+@pytest.mark.anyio
+async def test_job_is_put_back_when_storing_fails(client, generation, monkeypatch):
+    await register(client)
+    await defer_correction(1, "Some text.", "default")
+
+    async def locked(db, values):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(services.correction, "store_correction", locked)
+
+    assert await resume_pending_corrections() == 0
+    assert await _pending_count() == 1
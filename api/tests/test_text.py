@@ -0,0 +1,84 @@
+import random
+import pytest
+from utils.text import bounded_edit_distance, edit_script
+
+"""
+Tests for the bounded Myers edit distance and edit script.
+"""
+
+def _reference_distance(a, b) -> int:
+    # Insertion/deletion distance from the longest common subsequence
+    lcs = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            lcs[i + 1][j + 1] = lcs[i][j] + 1 if x == y else max(lcs[i][j + 1], lcs[i + 1][j])
+    return len(a) + len(b) - 2 * lcs[-1][-1]
+
+def _apply(script, a, b) -> list:
+    # Rebuilds b from a and the script, checking kept tokens match
+    result = []
+    i = j = 0
+    for op, count in script:
+        if op == 0:
+            assert a[i:i + count] == b[j:j + count]
+            result.extend(a[i:i + count])
+            i += count
+            j += count
+        elif op == -1:
+            i += count
+        else:
+            result.extend(b[j:j + count])
+            j += count
+    assert i == len(a) and j == len(b)
+    return result
+
+def _random_pairs(count: int):
+    rng = random.Random(49)
+    for _ in range(count):
+        a = [rng.choice("abcde") for _ in range(rng.randint(0, 12))]
+        b = list(a)
+        for _ in range(rng.randint(0, 6)):
+            position = rng.randint(0, len(b))
+            if b and rng.random() < 0.5:
+                del b[min(position, len(b) - 1)]
+            else:
+                b.insert(position, rng.choice("abcdef"))
+        yield a, b
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0),
+    ("abc", "abc", 0),
+    ("abc", "", 3),
+    ("", "abc", 3),
+    ("abc", "abd", 2),
+    ("kitten", "sitting", 5),
+    ("the cat sat".split(), "the black cat sat".split(), 1),
+])
+def test_bounded_edit_distance_known_values(a, b, expected):
+    assert bounded_edit_distance(a, b, 10) == expected
+
+def test_bounded_edit_distance_matches_reference():
+    for a, b in _random_pairs(500):
+        expected = _reference_distance(a, b)
+        for bound in range(expected + 2):
+            result = bounded_edit_distance(a, b, bound)
+            assert result == (expected if expected <= bound else None), (a, b, bound)
+
+def test_bounded_edit_distance_gives_up_past_the_bound():
+    a = ["word"] * 10000
+    b = ["other"] * 10000
+    assert bounded_edit_distance(a, b, 50) is None
+    assert bounded_edit_distance(a, a[:-3], 2) is None
+    assert bounded_edit_distance(a, a[:-3], 3) == 3
+
+def test_edit_script_is_shortest_and_rebuilds_target():
+    for a, b in _random_pairs(500):
+        expected = _reference_distance(a, b)
+        script = edit_script(a, b, expected)
+        assert script is not None, (a, b)
+        assert sum(count for op, count in script if op) == expected
+        assert _apply(script, a, b) == b
+        # Runs are merged: no two neighbours share an operation
+        assert all(x[0] != y[0] for x, y in zip(script, script[1:]))
+        if expected:
+            assert edit_script(a, b, expected - 1) is None
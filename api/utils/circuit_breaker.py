@@ -0,0 +1,169 @@
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+from utils.metrics import metrics
+
+"""
+Circuit Breaker Module
+
+This module implements a circuit breaker that stops calling a failing
+dependency. While the circuit is open, calls fail immediately instead of
+waiting for connect errors or timeouts; once the cool-down elapses a limited
+number of probe calls decide whether to close it again.
+"""
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+metrics.describe("styleguard_circuit_state", "gauge", "Circuit state (0 closed, 1 half-open, 2 open)")
+metrics.describe("styleguard_circuit_transitions_total", "counter", "Circuit state transitions")
+metrics.describe("styleguard_circuit_rejected_total", "counter", "Calls rejected while the circuit was open")
+
+class CircuitBreaker:
+    """
+    Circuit breaker tripping on consecutive failures or on a high error rate.
+
+    Callers ask allow() before each call and report the outcome with
+    record_success() or record_failure().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        error_rate_threshold: float,
+        window_seconds: float,
+        min_requests: int,
+        open_seconds: float,
+        half_open_probes: int
+    ):
+        """
+        Args:
+            name (str): The dependency name, used as metrics label
+            failure_threshold (int): Consecutive failures that open the circuit
+            error_rate_threshold (float): Failure ratio within the window that opens the circuit
+            window_seconds (float): Length of the sliding error-rate window
+            min_requests (int): Calls needed in the window before the error rate is considered
+            open_seconds (float): How long the circuit stays open before probing
+            half_open_probes (int): Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        metrics.set("styleguard_circuit_state", 0, circuit=name)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        print(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        if state != HALF_OPEN:
+            self._probes_in_flight = 0
+        metrics.set("styleguard_circuit_state", _STATE_VALUES[state], circuit=self.name)
+        metrics.inc("styleguard_circuit_transitions_total", circuit=self.name, to=state)
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def retry_after(self) -> float:
+        """
+        Returns the number of seconds until the circuit will accept a probe.
+
+        Returns:
+            float: Remaining cool-down, 0 if calls are currently allowed
+        """
+        if self.state != OPEN:
+            return 0.0
+        return max(self.opened_at + self.open_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """
+        Decides whether a call may proceed.
+
+        Returns:
+            bool: True if the call may be sent to the dependency
+        """
+        if self.state == OPEN and self.retry_after() == 0:
+            self._transition(HALF_OPEN)
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            return True
+        metrics.inc("styleguard_circuit_rejected_total", circuit=self.name)
+        return False
+
+    def record_success(self) -> None:
+        """
+        Reports a successful call.
+        """
+        now = time.monotonic()
+        self.consecutive_failures = 0
+        self._outcomes.append((now, True))
+        self._trim(now)
+        if self.state == HALF_OPEN:
+            self._outcomes.clear()
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """
+        Reports a failed call, opening the circuit when a threshold is crossed.
+        """
+        now = time.monotonic()
+        self.consecutive_failures += 1
+        self._outcomes.append((now, False))
+        self._trim(now)
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        error_rate = failures / len(self._outcomes)
+        if (
+            self.consecutive_failures >= self.failure_threshold
+            or (len(self._outcomes) >= self.min_requests and error_rate >= self.error_rate_threshold)
+        ):
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """
+        Releases a half-open probe slot for a call that ended without an outcome,
+        for example because it was cancelled.
+        """
+        if self.state == HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def snapshot(self) -> dict:
+        """
+        Describes the breaker state for health reporting.
+
+        Returns:
+            dict: State, failure counters and remaining cool-down
+        """
+        now = time.monotonic()
+        self._trim(now)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        total = len(self._outcomes)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "window_requests": total,
+            "window_error_rate": round(failures / total, 3) if total else 0.0,
+            "retry_after_seconds": round(self.retry_after(), 1)
+        }
@@ -0,0 +1,151 @@
+import re
+from typing import Iterable, List, Tuple, Union
+from utils.divergence import SentenceAligner
+from utils.text import edit_script
+
+"""
+Word Diff Module
+
+This module computes the word-level diff of a correction once, when it is
+stored, so clients highlight the changes without diffing the texts again.
+
+The sentence alignment computed by answer validation is reused, and aligned
+sentences are diffed word by word with a bounded Myers edit script. The cost
+stays linear in the text length; a sentence with more edits than the bound
+is shown as replaced whole.
+"""
+
+# Words and spaces inserted plus deleted within a sentence block before it is shown replaced whole
+MAX_BLOCK_EDITS = 128
+
+# Words and the whitespace between them, both kept so the diff gives the texts back
+_TOKEN = re.compile(r"\s+|\S+")
+
+def _block_diff(original: str, corrected: str) -> List[list]:
+    # Operations [op, text] turning one block of sentences into the other
+    if original == corrected:
+        return [[0, original]]
+    a = _TOKEN.findall(original)
+    b = _TOKEN.findall(corrected)
+    script = edit_script(a, b, MAX_BLOCK_EDITS)
+    if script is None:
+        return [[-1, original], [1, corrected]]
+    pieces = []
+    i = j = 0
+    for op, count in script:
+        if op == 1:
+            pieces.append([op, "".join(b[j:j + count])])
+            j += count
+            continue
+        pieces.append([op, "".join(a[i:i + count])])
+        i += count
+        if op == 0:
+            j += count
+    return pieces
+
+def diff_blocks(blocks: Iterable[Tuple[str, str]]) -> List[List[Union[int, str]]]:
+    """
+    Computes the compact word-level diff of a correction from aligned blocks.
+
+    Unchanged text is stored as a length into the original, so the diff
+    stays small next to the texts. Spaces between two changed words are
+    folded into a single change, and within a change the deleted text always
+    comes before the inserted one.
+
+    Args:
+        blocks (Iterable[Tuple[str, str]]): Pairs of aligned original and corrected
+            text, such as the ones validate_correction returns
+
+    Returns:
+        List[List[Union[int, str]]]: Operations in text order: [0, n] keeps the
+        next n characters of the original (Unicode code points), [-1, text]
+        deletes text from the original and [1, text] inserts text of the correction
+    """
+    merged: List[list] = []
+    for before, after in blocks:
+        for op, text in _block_diff(before, after):
+            if not text:
+                continue
+            if merged and merged[-1][0] == op:
+                merged[-1][1] += text
+            else:
+                merged.append([op, text])
+
+    diff: List[List[Union[int, str]]] = []
+    deleted = inserted = ""
+    for index, (op, text) in enumerate(merged):
+        if op == -1:
+            deleted += text
+        elif op == 1:
+            inserted += text
+        elif (deleted or inserted) and text.isspace() and index + 1 < len(merged):
+            # Only spaces separate two changes: highlight them as one
+            deleted += text
+            inserted += text
+        else:
+            diff.extend(change for change in ([-1, deleted], [1, inserted]) if change[1])
+            deleted = inserted = ""
+            diff.append([0, len(text)])
+    diff.extend(change for change in ([-1, deleted], [1, inserted]) if change[1])
+    return diff
+
+def word_diff(original: str, corrected: str) -> List[List[Union[int, str]]]:
+    """
+    Computes the compact word-level diff between two texts.
+
+    New corrections take the alignment computed by validate_correction; this
+    aligns the texts again, for corrections stored without a diff.
+
+    Args:
+        original (str): The submitted text
+        corrected (str): The corrected text
+
+    Returns:
+        List[List[Union[int, str]]]: The diff, as described in diff_blocks
+    """
+    aligner = SentenceAligner(original, corrected)
+    if not aligner.a or not aligner.b:
+        # A blank text has no sentence to align
+        return diff_blocks([(original, corrected)])
+    return diff_blocks(
+        ("".join(aligner.a[i:i + p]), "".join(aligner.b[j:j + q]))
+        for i, j, p, q, _ in aligner.blocks()
+    )
+
+def count_changes(diff: List[List[Union[int, str]]]) -> int:
+    """
+    Counts the changes of a diff built by word_diff.
+
+    Each run of deleted or inserted text between unchanged text counts as one
+    change, unless it only touches whitespace.
+
+    Args:
+        diff (List[List[Union[int, str]]]): The word diff
+
+    Returns:
+        int: The number of changed word runs
+    """
+    changes = 0
+    run = ""
+    for op, value in diff:
+        if op:
+            run += value
+            continue
+        changes += bool(run.strip())
+        run = ""
+    return changes + bool(run.strip())
+
+def count_word_changes(original: str, corrected: str) -> int:
+    """
+    Counts the word-level edits between two texts.
+
+    Each contiguous run of inserted, deleted or replaced words counts as one change.
+
+    Args:
+        original (str): The original text
+        corrected (str): The corrected text
+
+    Returns:
+        int: The number of changed word runs
+    """
+    return count_changes(word_diff(original, corrected))
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, TypeVar
+from fastapi import HTTPException, Request
+from utils.metrics import metrics
+
+"""
+Client Disconnect Module
+
+This module runs request work that is only worth finishing while the client
+is still connected. When the client goes away (tab closed, proxy timeout),
+the work is cancelled, which in turn closes the outbound Ollama request.
+"""
+
+T = TypeVar("T")
+
+# Non-standard status popularized by nginx; never seen by the departed client
+CLIENT_CLOSED_REQUEST = 499
+
+metrics.describe("styleguard_abandoned_requests_total", "counter", "Requests cancelled because the client disconnected")
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # The body was already read, so the next ASGI message is the disconnect
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T], route: str) -> T:
+    """
+    Awaits work, cancelling it if the client disconnects first.
+
+    Args:
+        request (Request): The request whose client is watched
+        work (Awaitable[T]): The work to run
+        route (str): Route name used as metrics label
+
+    Returns:
+        T: The result of the work
+
+    Raises:
+        HTTPException: 499 if the client disconnected before the work completed
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if task.cancelled():
+            metrics.inc("styleguard_abandoned_requests_total", route=route)
+            print(f"Client disconnected, cancelled {route}")
+            raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="CLIENT_CLOSED_REQUEST")
+    return task.result()
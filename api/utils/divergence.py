@@ -0,0 +1,297 @@
+import re
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import get_settings
+from utils.metrics import metrics
+from utils.text import bounded_edit_distance
+
+"""
+Correction Divergence Module
+
+This module checks how far a model answer strays from the submitted text. Both
+texts are cut into sentences and aligned, and aligned sentences are compared
+word by word with an edit distance bounded by the allowed divergence. A
+rewritten or invented sentence is rejected on its own: the original sentence
+is kept and the rest of the correction is used.
+
+Sentences that keep matching are paired in a single pass. Where the texts
+diverge, a small dynamic program over the next few sentences (as in sentence
+alignment of parallel texts) tells added, dropped, split, merged and rewritten
+sentences apart. Run-on sentences are cut into pieces and the edits allowed
+in a block are capped, so the cost stays linear in the text length, with a
+bounded factor, whatever the punctuation.
+"""
+
+settings = get_settings()
+
+metrics.describe("styleguard_correction_segments_total", "counter", "Corrected sentences by validation outcome")
+
+# A sentence ends with terminal punctuation followed by whitespace, or with a line break
+_SEGMENT = re.compile(r"\s*\S.*?(?:[.!?…]+(?=\s)|\n|$)\s*", re.S)
+
+# Sentences longer than SEGMENT_WORDS words are cut into pieces of at least
+# _MIN_PIECE_WORDS and at most MAX_SEGMENT_WORDS words
+SEGMENT_WORDS = 60
+MAX_SEGMENT_WORDS = 120
+_MIN_PIECE_WORDS = 20
+
+# A run-on sentence is cut after pairs of words whose hash has these bits clear: the
+# same words give the same cuts in both texts, so an edit only moves the cuts near it
+_CUT_MASK = 15
+
+_WORD = re.compile(r"\S+\s*")
+
+# Word edits allowed in an aligned block, whatever its length
+MAX_BLOCK_EDITS = 64
+
+# Sentences looked ahead on each side to realign the texts after a divergence
+RESYNC_WINDOW = 5
+
+# Sentences of the original and of the answer an alignment step may cover
+_STEPS = ((1, 1), (1, 0), (0, 1), (2, 1), (1, 2), (3, 1), (1, 3))
+
+# Two pieces of a run-on sentence cut at different words in each text
+_CUT_STEP = (2, 2)
+
+# A piece ending without terminal punctuation or line break was cut from a run-on sentence
+_SENTENCE_END = re.compile(r"[.!?…\n]\s*$")
+
+def split_segments(text: str) -> List[str]:
+    """
+    Cuts a text into sentences, each keeping the whitespace that follows it.
+
+    Sentences longer than SEGMENT_WORDS words are cut after pairs of words
+    chosen by their content, into pieces of at most MAX_SEGMENT_WORDS words.
+
+    Args:
+        text (str): The text to cut
+
+    Returns:
+        List[str]: The sentences, joining them gives the text back
+    """
+    segments = []
+    for segment in _SEGMENT.findall(text):
+        if len(segment.split()) <= SEGMENT_WORDS:
+            segments.append(segment)
+            continue
+        leading = len(segment) - len(segment.lstrip())
+        words = _WORD.findall(segment, leading)
+        # The whitespace before the sentence stays with its first piece
+        words[0] = segment[:leading] + words[0]
+        start = 0
+        for end, word in enumerate(words, 1):
+            size = end - start
+            pair = f"{words[end - 2].strip()} {word.strip()}" if end > 1 else word.strip()
+            if size >= MAX_SEGMENT_WORDS or size >= _MIN_PIECE_WORDS and not zlib.crc32(pair.encode()) & _CUT_MASK:
+                segments.append("".join(words[start:end]))
+                start = end
+        if start < len(words):
+            segments.append("".join(words[start:]))
+    return segments
+
+def word_distance(original: List[str], corrected: List[str]) -> Optional[int]:
+    """
+    Counts the word edits of a correction, within the allowed divergence.
+
+    The share is taken on the shorter side, so a sentence the model added to
+    or removed from a block cannot pass for a few edits, and it is capped at
+    MAX_BLOCK_EDITS so long blocks cost no more than short ones.
+
+    Args:
+        original (List[str]): Words of the original
+        corrected (List[str]): Words of the correction
+
+    Returns:
+        Optional[int]: Words inserted plus words deleted, None when more than allowed
+    """
+    shorter = min(len(original), len(corrected))
+    allowed = max(settings.correction_min_edits, int(settings.correction_max_divergence * 2 * shorter))
+    allowed = min(allowed, MAX_BLOCK_EDITS)
+    return bounded_edit_distance(original, corrected, allowed)
+
+class SentenceAligner:
+    """
+    Aligns the sentences of an original and of its correction.
+    """
+
+    def __init__(self, original: str, corrected: str):
+        self.a = split_segments(original)
+        self.b = split_segments(corrected)
+        self._a_words = [segment.split() for segment in self.a]
+        self._b_words = [segment.split() for segment in self.b]
+        self._a_cut = [not _SENTENCE_END.search(segment) for segment in self.a]
+        self._b_cut = [not _SENTENCE_END.search(segment) for segment in self.b]
+        self._cache: Dict[Tuple[int, int, int, int], Optional[int]] = {}
+
+    def distance(self, i: int, j: int, p: int, q: int) -> Optional[int]:
+        # Word edits between the blocks a[i:i + p] and b[j:j + q], None when they diverge
+        key = (i, j, p, q)
+        if key not in self._cache:
+            original = [word for words in self._a_words[i:i + p] for word in words]
+            corrected = [word for words in self._b_words[j:j + q] for word in words]
+            self._cache[key] = word_distance(original, corrected)
+        return self._cache[key]
+
+    def steps(self, i: int, j: int) -> Tuple[Tuple[int, int], ...]:
+        # Blocks that may start at a[i] and b[j]; where both texts cut a run-on
+        # sentence, the cuts may fall on different words after an edit
+        if i < len(self.a) - 1 and j < len(self.b) - 1 and self._a_cut[i] and self._b_cut[j]:
+            return _STEPS + (_CUT_STEP,)
+        return _STEPS
+
+    def words(self, i: int, j: int, p: int, q: int) -> int:
+        return sum(map(len, self._a_words[i:i + p])) + sum(map(len, self._b_words[j:j + q]))
+
+    def matches(self, i: int, j: int) -> bool:
+        return self.distance(i, j, 1, 1) is not None
+
+    def realigned(self, i: int, j: int) -> bool:
+        # Both texts end here, or this pair and the next one match
+        if i == len(self.a) and j == len(self.b):
+            return True
+        if i >= len(self.a) or j >= len(self.b) or not self.matches(i, j):
+            return False
+        if i + 1 == len(self.a) and j + 1 == len(self.b):
+            return True
+        return i + 1 < len(self.a) and j + 1 < len(self.b) and self.matches(i + 1, j + 1)
+
+    def align_gap(self, i: int, j: int) -> Optional[List[Tuple[int, int, int, int, bool]]]:
+        """
+        Explains the divergence starting at a[i] and b[j] at the lowest cost.
+
+        Paths through the next RESYNC_WINDOW sentences cost their word edits, a
+        rejected sentence counting as all its words removed or inserted. A path
+        may end on a pair of matching sentences, which the texts realign on,
+        or after a kept block, the rest being decided on the next call. The
+        fewest edits per word wins, the shortest path on ties.
+
+        Returns:
+            Optional[List[Tuple[int, int, int, int, bool]]]: Blocks (i, j, p, q, kept)
+            in text order, None when nothing within the window matches
+        """
+        p = min(RESYNC_WINDOW, len(self.a) - i)
+        q = min(RESYNC_WINDOW, len(self.b) - j)
+        pairs = [
+            (x, y) for x in range(p + 1) for y in range(q + 1)
+            if (x or y) and (i + x == len(self.a) and j + y == len(self.b)
+                             or i + x < len(self.a) and j + y < len(self.b) and self.matches(i + x, j + y))
+        ]
+        if not pairs and not any(dx and dy and dx <= p and dy <= q and self.distance(i, j, dx, dy) is not None for dx, dy in self.steps(i, j)):
+            # Not even a split or merge explains the first sentences
+            return None
+
+        inf = float("inf")
+        cost = [[inf] * (q + 1) for _ in range(p + 1)]
+        step: Dict[Tuple[int, int], Tuple[int, int, bool]] = {}
+        cost[0][0] = 0.0
+        for x in range(p + 1):
+            for y in range(q + 1):
+                for dx, dy in _STEPS + (_CUT_STEP,):
+                    if dx > x or dy > y or cost[x - dx][y - dy] == inf:
+                        continue
+                    if (dx, dy) == _CUT_STEP and _CUT_STEP not in self.steps(i + x - dx, j + y - dy):
+                        continue
+                    distance = self.distance(i + x - dx, j + y - dy, dx, dy) if dx and dy else None
+                    kept = distance is not None
+                    if not kept and max(dx, dy) > 1:
+                        # Splits and merges only explain a gap when they match
+                        continue
+                    if kept:
+                        # A sentence boundary added or removed costs one edit, so a
+                        # sentence the model added is rejected rather than taken as a split
+                        distance += abs(dx - dy)
+                    else:
+                        # A rejected sentence counts as all its words removed or inserted
+                        distance = self.words(i + x - dx, j + y - dy, dx, dy)
+                    candidate = cost[x - dx][y - dy] + distance
+                    if candidate < cost[x][y]:
+                        cost[x][y] = candidate
+                        step[x, y] = (dx, dy, kept)
+
+        def rank(end: Tuple[int, int]) -> Tuple[float, int]:
+            # A matching pair counts too: a short sentence merged into a long
+            # one matches it, but with more edits than the sentence it absorbed
+            x, y = end
+            edits, words = cost[x][y], self.words(i, j, x, y)
+            if end in pairs and i + x < len(self.a):
+                edits += self.distance(i + x, j + y, 1, 1)
+                words += self.words(i + x, j + y, 1, 1)
+            return edits / max(words, 1), x + y
+
+        ends = set(pairs) | {end for end, (_, _, kept) in step.items() if kept}
+        x, y = min((end for end in ends if cost[end[0]][end[1]] < inf), key=rank)
+        blocks = []
+        while x or y:
+            dx, dy, kept = step[x, y]
+            x, y = x - dx, y - dy
+            blocks.append((i + x, j + y, dx, dy, kept))
+        return blocks[::-1]
+
+    def blocks(self) -> Iterator[Tuple[int, int, int, int, bool]]:
+        """
+        Walks both texts from the start, pairing sentences in order while each
+        pair and the next one match, and explaining divergences with align_gap.
+
+        Yields:
+            Tuple[int, int, int, int, bool]: Blocks (i, j, p, q, kept) in text order,
+            covering every sentence of both texts; kept blocks match
+        """
+        i = j = 0
+        while i < len(self.a) and j < len(self.b):
+            if self.realigned(i, j):
+                yield i, j, 1, 1, True
+                i, j = i + 1, j + 1
+                continue
+            # Nothing matches again nearby: the sentence was rewritten
+            for block in self.align_gap(i, j) or [(i, j, 1, 1, self.matches(i, j))]:
+                yield block
+                i, j = block[0] + block[2], block[1] + block[3]
+        if i < len(self.a) or j < len(self.b):
+            # Trailing sentences of only one of the texts
+            yield i, j, len(self.a) - i, len(self.b) - j, False
+
+def validate_correction(original: str, corrected: str) -> Tuple[str, int, List[Tuple[str, str]]]:
+    """
+    Keeps the sentences of a correction that stay close to the original.
+
+    Sentences are paired in order while each pair and the next one match. At a
+    divergence, the next few sentences are explained at the lowest cost as
+    sentences the model added, dropped, split, merged or rewrote. Added
+    sentences are removed, dropped and rewritten ones are restored from the
+    original.
+
+    Args:
+        original (str): The submitted text
+        corrected (str): The model answer
+
+    Returns:
+        Tuple[str, int, List[Tuple[str, str]]]: The validated text, the number of
+        rejected sentences, and the alignment as (original, validated) pairs of
+        blocks, each side joining back into its text, for utils.diff.diff_blocks
+    """
+    aligner = SentenceAligner(original, corrected)
+    blocks: List[List[str]] = []
+    accepted = rejected = 0
+    for i, j, p, q, block_kept in aligner.blocks():
+        before = "".join(aligner.a[i:i + p])
+        if block_kept:
+            after = "".join(aligner.b[j:j + q])
+            accepted += 1
+        else:
+            # Dropped and rewritten sentences are restored, the ones the model added are removed
+            after = before
+            rejected += max(p, q)
+        if not after:
+            continue
+        # The model answer was stripped, so its last sentence may lack the space before a restored one
+        if blocks and not blocks[-1][1][-1].isspace() and not after[0].isspace():
+            after = " " + after
+        blocks.append([before, after])
+
+    metrics.inc("styleguard_correction_segments_total", accepted, outcome="accepted")
+    metrics.inc("styleguard_correction_segments_total", rejected, outcome="rejected")
+    if not accepted:
+        return original, rejected, [(original, original)]
+    blocks[0][1] = blocks[0][1].lstrip()
+    blocks[-1][1] = blocks[-1][1].rstrip()
+    return "".join(after for _, after in blocks), rejected, [tuple(block) for block in blocks]
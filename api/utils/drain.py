@@ -0,0 +1,93 @@
+import asyncio
+import signal
+import threading
+from typing import Optional
+from config import get_settings
+from utils.metrics import metrics
+from utils.scheduler import CorrectionScheduler, correction_scheduler
+
+"""
+Shutdown Drain Module
+
+This module drains correction work when the worker is asked to stop. The
+drain starts as soon as SIGTERM or SIGINT arrives, before the server waits
+for open requests: queued and new corrections are refused (create requests
+defer theirs to the next start), and running corrections get a grace period
+to finish. Whatever still runs after the grace period is cancelled, and its
+request defers it as well.
+"""
+
+settings = get_settings()
+
+metrics.describe("styleguard_drain_refused_total", "counter", "Queued corrections refused when the drain started")
+metrics.describe("styleguard_drain_cancelled_total", "counter", "Running corrections cancelled at the end of the grace period")
+
+class ShutdownDrain:
+    """
+    Drains a correction scheduler once, on the first exit signal or at shutdown.
+    """
+
+    def __init__(self, scheduler: CorrectionScheduler, grace_seconds: float):
+        """
+        Args:
+            scheduler (CorrectionScheduler): The scheduler to drain
+            grace_seconds (float): How long running corrections may take to finish
+        """
+        self.scheduler = scheduler
+        self.grace_seconds = grace_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def draining(self) -> bool:
+        return self._task is not None
+
+    def begin(self) -> None:
+        """
+        Starts the drain in the background. Later calls have no effect.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    async def wait(self) -> None:
+        """
+        Starts the drain if needed and waits for it to complete.
+        """
+        self.begin()
+        await self._task
+
+    async def _drain(self) -> None:
+        refused = self.scheduler.drain()
+        metrics.inc("styleguard_drain_refused_total", refused)
+        print(f"Draining: refused {refused} queued corrections, waiting for {self.scheduler.active} running")
+        if await self.scheduler.wait_idle(self.grace_seconds):
+            return
+        cancelled = self.scheduler.cancel_running()
+        metrics.inc("styleguard_drain_cancelled_total", cancelled)
+        print(f"Draining: grace period over, cancelled {cancelled} running corrections")
+        # Give the cancelled requests time to persist their work
+        await self.scheduler.wait_idle(5.0)
+
+    def install_signal_handlers(self) -> None:
+        """
+        Chains a drain start in front of the server's SIGTERM and SIGINT handlers.
+
+        uvicorn only runs the lifespan shutdown once open requests are done, too
+        late to drain them, so the drain has to start from the signal itself.
+        Has no effect outside the main thread.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                # Not handled by a server: keep the default behavior
+                continue
+
+            def handler(signum, frame, previous=previous):
+                loop.call_soon_threadsafe(self.begin)
+                previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+shutdown_drain = ShutdownDrain(correction_scheduler, settings.shutdown_grace_seconds)
@@ -0,0 +1,77 @@
+from fastapi import Request, Response, status
+
+"""
+HTTP Cache Utilities Module
+
+This module implements ETag-based conditional GET support. ETags are derived
+from the per-user history version, so a poll can be answered with 304 Not
+Modified before any correction row is read.
+"""
+
+# Responses are user-specific and must be revalidated before reuse
+CACHE_CONTROL = "private, no-cache"
+
+def history_etag(user_id: int, history_version: int, *parts) -> str:
+    """
+    Builds a weak ETag for a view of a user's correction history.
+
+    The tag identifies the content, not the bytes sent: gzip and identity
+    encodings of a response share it, which a strong ETag must not.
+
+    Args:
+        user_id (int): The ID of the user
+        history_version (int): The user's current history version
+        *parts: Values identifying the view (route, pagination, projection)
+
+    Returns:
+        str: The ETag value, with its W/ prefix
+    """
+    suffix = ".".join(str(part) for part in parts)
+    return f'W/"{user_id}.{history_version}.{suffix}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Checks the If-None-Match header against an ETag.
+
+    Args:
+        request (Request): The incoming request
+        etag (str): The current ETag of the resource
+
+    Returns:
+        bool: True if the client's cached copy is still current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # "*" only matches when the resource exists, which is not known before it is
+    # read; these checks run first, so the request is served in full
+    if header.strip() == "*":
+        return False
+    # If-None-Match uses the weak comparison function
+    opaque = etag.removeprefix("W/")
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+def cache_headers(etag: str) -> dict:
+    """
+    Returns the caching headers sent with a versioned response.
+
+    Args:
+        etag (str): The ETag of the response
+
+    Returns:
+        dict: The ETag, Cache-Control and Vary headers
+    """
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+def not_modified(etag: str) -> Response:
+    """
+    Builds a 304 Not Modified response.
+
+    Args:
+        etag (str): The ETag of the unchanged resource
+
+    Returns:
+        Response: An empty 304 response carrying the caching headers
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
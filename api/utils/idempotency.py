@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from config import get_settings
+from utils.metrics import metrics
+from utils.shared_store import shared_store
+
+"""
+Idempotency Module
+
+This module makes a request safe to retry when it carries an Idempotency-Key
+header. The first request with a key claims it in the shared store and does
+the work; duplicates, concurrent or later, wait for that work and receive the
+stored response, status code included, instead of repeating it. Keys are scoped per user, expire
+after IDEMPOTENCY_TTL_SECONDS and each user can hold a bounded number of them.
+"""
+
+settings = get_settings()
+
+MAX_KEY_LENGTH = 255
+
+# How often a duplicate checks for a result produced by another worker process
+POLL_INTERVAL = 0.2
+
+metrics.describe("styleguard_idempotent_requests_total", "counter", "Requests carrying an Idempotency-Key, by outcome")
+
+# Response of a request: status code and JSON body
+Result = Tuple[int, str]
+
+# Work in progress in this process: store key -> (fingerprint, future of the result).
+# The future resolves to None when the work failed and the key was released.
+_inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+def _fingerprint(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _check_fingerprint(stored: str, fingerprint: str) -> None:
+    if stored != fingerprint:
+        metrics.inc("styleguard_idempotent_requests_total", outcome="conflict")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+
+async def _run_owner(store_key: str, fingerprint: str, work: Callable[[], Awaitable[Result]]) -> Result:
+    """
+    Does the work of a claimed key and stores its response for the duplicates.
+
+    A failed or cancelled attempt releases the key, so a retry does the work again.
+    """
+    future = asyncio.get_running_loop().create_future()
+    _inflight[store_key] = (fingerprint, future)
+    try:
+        result = await work()
+    except BaseException:
+        future.set_result(None)
+        await shared_store.delete(store_key)
+        raise
+    finally:
+        _inflight.pop(store_key, None)
+
+    status_code, body = result
+    await shared_store.set(
+        store_key,
+        {"fingerprint": fingerprint, "status": status_code, "body": body},
+        ttl=settings.idempotency_ttl_seconds
+    )
+    future.set_result(result)
+    return result
+
+async def run_idempotent(
+    user_id: int,
+    key: str,
+    payload: str,
+    work: Callable[[], Awaitable[Result]]
+) -> Tuple[Result, bool]:
+    """
+    Runs work once per user and Idempotency-Key.
+
+    Args:
+        user_id (int): The ID of the user, keys are scoped per user
+        key (str): The Idempotency-Key header value
+        payload (str): The request content, a key cannot be reused for another request
+        work (Callable[[], Awaitable[Result]]): Does the work and returns the status code
+            and JSON body of the response. Raising releases the key for a retry.
+
+    Returns:
+        Tuple[Result, bool]: The status code and body, and whether they were replayed
+        from an earlier request
+
+    Raises:
+        HTTPException: 400 for an invalid key, 422 if the key was used for another request,
+            409 if the original request is still running after IDEMPOTENCY_WAIT_SECONDS
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+        )
+
+    store_key = f"idempotency:{user_id}:{key}"
+    fingerprint = _fingerprint(payload)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.idempotency_wait_seconds
+    while True:
+        local = _inflight.get(store_key)
+        if local is not None:
+            _check_fingerprint(local[0], fingerprint)
+            try:
+                result: Optional[Result] = await asyncio.wait_for(
+                    asyncio.shield(local[1]), max(deadline - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                break
+            if result is not None:
+                metrics.inc("styleguard_idempotent_requests_total", outcome="replayed")
+                return result, True
+            # The original attempt failed, claim the key for this one
+            continue
+
+        # A pending claim outlives the longest correction, so a crashed owner only
+        # blocks the key until it expires
+        if await shared_store.add(store_key, {"fingerprint": fingerprint, "owner": os.getpid()},
+                                  ttl=settings.idempotency_wait_seconds):
+            count = await shared_store.incr(f"idempotency-count:{user_id}", ttl=settings.idempotency_ttl_seconds)
+            if count > settings.idempotency_max_keys_per_user:
+                # Over the bound: serve the request without remembering it
+                await shared_store.delete(store_key)
+                metrics.inc("styleguard_idempotent_requests_total", outcome="untracked")
+                return await work(), False
+            metrics.inc("styleguard_idempotent_requests_total", outcome="new")
+            return await _run_owner(store_key, fingerprint, work), False
+
+        record = await shared_store.get(store_key)
+        if record is None:
+            # Released or expired since the claim attempt
+            continue
+        _check_fingerprint(record["fingerprint"], fingerprint)
+        if "body" in record:
+            metrics.inc("styleguard_idempotent_requests_total", outcome="replayed")
+            return (record.get("status", 200), record["body"]), True
+        if loop.time() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+
+    metrics.inc("styleguard_idempotent_requests_total", outcome="timeout")
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still in progress"
+    )
@@ -0,0 +1,93 @@
+from typing import Optional, Tuple
+from config import get_settings
+from utils.ollama import language_scores
+
+"""
+Language Profile Module
+
+This module maintains a rolling per-user language profile and uses it to
+resolve the language of a submission. Scores decay with every correction, so
+the profile follows users who switch language. Short or ambiguous texts take
+the profile's language, and when the profile is confident only a bounded
+sample of the text is scanned.
+"""
+
+settings = get_settings()
+
+# The best language must outscore the runner-up by this factor to be decisive
+AMBIGUITY_RATIO = 1.5
+
+def confident_language(profile: Optional[dict]) -> Optional[str]:
+    """
+    Returns the profile's dominant language if the profile is confident.
+
+    Args:
+        profile (Optional[dict]): The user's language profile
+
+    Returns:
+        Optional[str]: The dominant language, None if the profile is missing or uncertain
+    """
+    if not profile or not profile.get("dominant"):
+        return None
+    if profile.get("weight", 0) < settings.language_profile_min_weight:
+        return None
+    if profile.get("confidence", 0) < settings.language_profile_confidence:
+        return None
+    return profile["dominant"]
+
+def resolve_language(text: str, profile: Optional[dict]) -> Tuple[str, bool]:
+    """
+    Resolves the language of a text, using the user's profile when the text
+    alone is not conclusive.
+
+    Args:
+        text (str): The text to correct
+        profile (Optional[dict]): The user's language profile
+
+    Returns:
+        Tuple[str, bool]: The ISO language code or 'unknown', and whether it was
+        decided by the text itself rather than taken from the profile
+    """
+    dominant = confident_language(profile)
+    if dominant and len(text) <= settings.language_short_text_chars:
+        return dominant, False
+
+    sample = text[:settings.language_sample_chars] if dominant else text
+    scores = language_scores(sample)
+    best = max(scores, key=scores.get)
+    ranked = sorted(scores.values(), reverse=True)
+    if ranked[0] >= settings.language_min_matches and ranked[0] >= ranked[1] * AMBIGUITY_RATIO:
+        return best, True
+
+    # Ambiguous: any profile beats the generic prompt, even an uncertain one
+    fallback = dominant or (profile or {}).get("dominant")
+    if fallback:
+        return fallback, False
+    return (best if ranked[0] > 0 else "unknown"), False
+
+def update_profile(profile: Optional[dict], language: str) -> dict:
+    """
+    Folds a detected language into a profile. Older observations decay.
+
+    Args:
+        profile (Optional[dict]): The current profile, None for a new one
+        language (str): The language detected for the new correction
+
+    Returns:
+        dict: The updated profile
+    """
+    decay = settings.language_profile_decay
+    scores = {
+        lang: round(score * decay, 4)
+        for lang, score in ((profile or {}).get("scores") or {}).items()
+        if score * decay >= 0.01
+    }
+    scores[language] = scores.get(language, 0) + 1
+    weight = sum(scores.values())
+    dominant = max(scores, key=scores.get)
+    return {
+        "dominant": dominant,
+        "confidence": round(scores[dominant] / weight, 3),
+        "weight": round(weight, 3),
+        "scores": scores
+    }
@@ -0,0 +1,134 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+"""
+Metrics Module
+
+This module provides a minimal in-process metrics registry rendered in the
+Prometheus text exposition format. Each worker process keeps its own values;
+scrape every worker (or sum by instance) when running several of them.
+"""
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Metrics:
+    """
+    Registry of counters, gauges and summaries identified by name and labels.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self._summaries: Dict[str, Dict[LabelKey, list]] = defaultdict(dict)
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    @staticmethod
+    def _key(labels: dict) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """
+        Registers the type and help text of a metric.
+
+        Args:
+            name (str): The metric name
+            kind (str): counter, gauge or summary
+            help_text (str): A one-line description
+        """
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The metric name
+            value (float): The increment
+            **labels: The metric labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """
+        Sets a gauge.
+
+        Args:
+            name (str): The metric name
+            value (float): The new value
+            **labels: The metric labels
+        """
+        with self._lock:
+            self._gauges[name][self._key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """
+        Records an observation in a summary (count and sum).
+
+        Args:
+            name (str): The metric name
+            value (float): The observed value
+            **labels: The metric labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._summaries[name]
+            count, total = series.get(key, (0, 0.0))
+            series[key] = (count + 1, total + value)
+
+    def get(self, name: str, **labels) -> float:
+        """
+        Returns the current value of a counter or gauge, 0 if never set.
+
+        Args:
+            name (str): The metric name
+            **labels: The metric labels
+
+        Returns:
+            float: The current value
+        """
+        key = self._key(labels)
+        with self._lock:
+            if name in self._gauges and key in self._gauges[name]:
+                return self._gauges[name][key]
+            return self._counters.get(name, {}).get(key, 0)
+
+    @staticmethod
+    def _format(name: str, key: LabelKey, value: float) -> str:
+        if key:
+            labels = ",".join(f'{label}="{val}"' for label, val in key)
+            return f"{name}{{{labels}}} {value}"
+        return f"{name} {value}"
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition document
+        """
+        lines = []
+        with self._lock:
+            families = (
+                [(name, "counter", series) for name, series in self._counters.items()]
+                + [(name, "gauge", series) for name, series in self._gauges.items()]
+            )
+            for name, kind, series in sorted(families):
+                kind, help_text = self._help.get(name, (kind, name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(self._format(name, key, value) for key, value in sorted(series.items()))
+            for name, series in sorted(self._summaries.items()):
+                _, help_text = self._help.get(name, ("summary", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} summary")
+                for key, (count, total) in sorted(series.items()):
+                    lines.append(self._format(f"{name}_count", key, count))
+                    lines.append(self._format(f"{name}_sum", key, total))
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
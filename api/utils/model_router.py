@@ -0,0 +1,86 @@
+from typing import List, Optional
+from config import ModelRoute, get_settings
+from utils.metrics import metrics
+from utils.ollama_client import OllamaError
+
+"""
+Model Router Module
+
+This module picks the Ollama model of a correction from the routing table in
+MODEL_ROUTES, by input length, detected language and user tier. Each route
+may name a fallback model used when the preferred one is unavailable.
+"""
+
+settings = get_settings()
+
+metrics.describe("styleguard_model_requests_total", "counter", "Ollama generations by model and outcome")
+metrics.describe("styleguard_model_latency_seconds", "summary", "Ollama generation latency by model")
+metrics.describe("styleguard_model_fallbacks_total", "counter", "Corrections moved to the fallback model")
+
+# Ollama answers 404 for a model that is not pulled and 500 when it cannot load one
+FALLBACK_STATUS_CODES = {404, 500, 502, 503}
+
+def select_route(length: int, language: str, tier: Optional[str]) -> ModelRoute:
+    """
+    Returns the first route of the table matching the request.
+
+    Args:
+        length (int): Input length in characters
+        language (str): Detected language of the input
+        tier (Optional[str]): Tier of the requesting user
+
+    Returns:
+        ModelRoute: The matching route, model_name without fallback when none matches
+    """
+    for route in settings.model_routes:
+        if route.min_chars is not None and length < route.min_chars:
+            continue
+        if route.max_chars is not None and length > route.max_chars:
+            continue
+        if route.languages is not None and language not in route.languages:
+            continue
+        if route.tiers is not None and tier not in route.tiers:
+            continue
+        return route
+    return ModelRoute(model=settings.model_name)
+
+def candidate_models(route: ModelRoute) -> List[str]:
+    """
+    Returns the models to try for a route, in order.
+
+    Args:
+        route (ModelRoute): The selected route
+
+    Returns:
+        List[str]: The preferred model, then its fallback if any
+    """
+    if route.fallback and route.fallback != route.model:
+        return [route.model, route.fallback]
+    return [route.model]
+
+def should_fall_back(error: OllamaError) -> bool:
+    """
+    Decides whether a failure is specific to the model, so another model may succeed.
+
+    Connection failures, timeouts and an open circuit affect every model on the
+    backend and are not worth a fallback.
+
+    Args:
+        error (OllamaError): The failure of the preferred model
+
+    Returns:
+        bool: True if the fallback model should be tried
+    """
+    return error.upstream_status in FALLBACK_STATUS_CODES
+
+def record_model_outcome(model: str, seconds: float, outcome: str) -> None:
+    """
+    Records the latency and outcome of a generation.
+
+    Args:
+        model (str): The model used
+        seconds (float): The generation latency
+        outcome (str): "success" or "error"
+    """
+    metrics.inc("styleguard_model_requests_total", model=model, outcome=outcome)
+    metrics.observe("styleguard_model_latency_seconds", seconds, model=model)
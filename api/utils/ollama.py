@@ -1,8 +1,17 @@
-import httpx
-from config import get_settings
+from config import ModelRoute, get_settings
 import asyncio
 import re
-from fastapi import HTTPException, status
+import time
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from utils.ollama_client import OllamaError, generate, ollama_breaker, record_cancellation
+from utils.scheduler import correction_scheduler
+from utils.model_router import candidate_models, record_model_outcome, select_route, should_fall_back
+from utils.metrics import metrics
+from utils.timing import record, span
+from utils.prompts import PROMPT_VERSION, SYSTEM_PREFIX, build_prompt
+from utils.divergence import validate_correction
+from utils.diff import diff_blocks
 
 """
 Ollama Integration Module
@@ -13,6 +22,30 @@ for text correction in the StyleGuard application.
 
 settings = get_settings()
 
+# Common language patterns and markers
+LANGUAGE_PATTERNS = {
+    'fr': re.compile(r'\b(je|tu|nous|vous|ils|elles|le|la|les|un|une|des|et|ou|mais|donc|car|est|sont)\b'),
+    'en': re.compile(r'\b(the|a|an|of|to|in|is|are|and|or|but|for|with|that|this)\b'),
+    'es': re.compile(r'\b(el|la|los|las|un|una|unos|unas|y|o|pero|porque|como|está|están)\b'),
+    'de': re.compile(r'\b(der|die|das|ein|eine|und|oder|aber|ist|sind|für|mit|dass)\b'),
+    'it': re.compile(r'\b(il|la|lo|i|gli|le|un|una|e|o|ma|perché|come|è|sono)\b'),
+    'ru': re.compile(r'\b(я|ты|он|она|оно|мы|вы|они|и|или|но|что|как|это|этот|эта|эти|в|на|с|из|от|для)\b'),
+    'pl': re.compile(r'\b(ja|ty|on|ona|ono|my|wy|oni|one|i|lub|ale|że|jak|to|ten|ta|to|te|w|na|z|od|dla)\b'),
+}
+
+def language_scores(text: str) -> dict:
+    """
+    Counts the marker words of each supported language in the text.
+    
+    Args:
+        text (str): The text to analyze
+        
+    Returns:
+        dict: Number of marker matches per ISO language code
+    """
+    lowered = text.lower()
+    return {lang: len(pattern.findall(lowered)) for lang, pattern in LANGUAGE_PATTERNS.items()}
+
 async def detect_language(text: str) -> str:
     """
     Detects the language of the input text.
@@ -23,21 +56,8 @@ async def detect_language(text: str) -> str:
     Returns:
         str: ISO language code or 'unknown'
     """
-    # Common language patterns and markers
-    patterns = {
-        'fr': r'\b(je|tu|nous|vous|ils|elles|le|la|les|un|une|des|et|ou|mais|donc|car|est|sont)\b',
-        'en': r'\b(the|a|an|of|to|in|is|are|and|or|but|for|with|that|this)\b',
-        'es': r'\b(el|la|los|las|un|una|unos|unas|y|o|pero|porque|como|está|están)\b',
-        'de': r'\b(der|die|das|ein|eine|und|oder|aber|ist|sind|für|mit|dass)\b',
-        'it': r'\b(il|la|lo|i|gli|le|un|una|e|o|ma|perché|come|è|sono)\b',
-        'ru': r'\b(я|ты|он|она|оно|мы|вы|они|и|или|но|что|как|это|этот|эта|эти|в|на|с|из|от|для)\b',
-        'pl': r'\b(ja|ty|on|ona|ono|my|wy|oni|one|i|lub|ale|że|jak|to|ten|ta|to|te|w|na|z|od|dla)\b',
-    }
-    
     # Count matches for each language
-    matches = {}
-    for lang, pattern in patterns.items():
-        matches[lang] = len(re.findall(pattern, text.lower()))
+    matches = language_scores(text)
     
     # Determine most likely language
     if not matches or max(matches.values()) == 0:
@@ -45,12 +65,68 @@ async def detect_language(text: str) -> str:
     
     return max(matches, key=matches.get)
 
-async def correct_text(text: str) -> str:
+async def _generate_routed(prompt: str, route: ModelRoute) -> dict:
+    """
+    Runs the generation on the route's model, then on its fallback model if
+    the first one is unavailable. Both share one deadline budget.
+    
+    Args:
+        prompt (str): The per-request prompt, sent after SYSTEM_PREFIX
+        route (ModelRoute): The selected route
+        
+    Returns:
+        dict: The decoded Ollama response
+        
+    Raises:
+        OllamaError: If no model produced a response
+    """
+    deadline = time.monotonic() + settings.ollama_deadline_seconds
+    models = candidate_models(route)
+    for index, model in enumerate(models):
+        start = time.monotonic()
+        try:
+            data = await generate({
+                "model": model,
+                # Identical on every request, so Ollama reuses its cached evaluation
+                "system": SYSTEM_PREFIX,
+                "prompt": prompt,
+                "stream": False,
+                "keep_alive": settings.ollama_keep_alive,
+                "options": {"temperature": 0.1}  # Lower temperature for more precise corrections
+            }, deadline_seconds=deadline - start)
+        except OllamaError as e:
+            record_model_outcome(model, time.monotonic() - start, "error")
+            if index + 1 < len(models) and should_fall_back(e) and time.monotonic() < deadline:
+                print(f"Warning: model {model} unavailable ({e.upstream_status}), falling back to {models[index + 1]}")
+                metrics.inc("styleguard_model_fallbacks_total", model=model, fallback=models[index + 1])
+                continue
+            raise
+        record_model_outcome(model, time.monotonic() - start, "success")
+        data.setdefault("model", model)
+        return data
+
+# Generation statistics Ollama reports, kept with each correction. Durations are in nanoseconds.
+TELEMETRY_FIELDS = ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration", "load_duration")
+
+def _validate(text: str, answer: str) -> Tuple[str, int, List[list]]:
+    # Validation and diff share one alignment, both run in a worker thread
+    corrected, rejected, blocks = validate_correction(text, answer)
+    return corrected, rejected, diff_blocks(blocks)
+
+async def correct_text(
+    text: str,
+    priority_class: str = "default",
+    language: Optional[str] = None,
+    tier: Optional[str] = None
+) -> str:
     """
     Sends text to Ollama API for correction while preserving style.
     
     Args:
         text (str): The original text to correct
+        priority_class (str): Scheduling class of the request
+        language (Optional[str]): Language already resolved by the caller, detected when None
+        tier (Optional[str]): Tier of the requesting user, used for model routing
         
     Returns:
         str: The corrected text
@@ -58,80 +134,77 @@ async def correct_text(text: str) -> str:
     Raises:
         HTTPException: If the Ollama API request fails
     """
-    # Detect language for better correction context
-    language = await detect_language(text)
-    
-    # Language-specific instructions
-    lang_instructions = {
-        'fr': "Ce texte est en français. Corrigez uniquement les fautes d'orthographe et de grammaire.",
-        'en': "This text is in English. Correct only spelling and grammar mistakes.",
-        'es': "Este texto está en español. Corrige solo los errores ortográficos y gramaticales.",
-        'de': "Dieser Text ist auf Deutsch. Korrigiere nur Rechtschreib- und Grammatikfehler.",
-        'it': "Questo testo è in italiano. Correggi solo errori di ortografia e grammatica.",
-        'ru': "Этот текст на русском языке. Исправьте только орфографические и грамматические ошибки.",
-        'pl': "Ten tekst jest w języku polskim. Popraw tylko błędy ortograficzne i gramatyczne.",
-        'unknown': "Correct only spelling and grammar mistakes in this text, regardless of language."
-    }
+    corrected, _, _ = await correct_text_with_telemetry(text, priority_class, language, tier)
+    return corrected
+
+async def correct_text_with_telemetry(
+    text: str,
+    priority_class: str = "default",
+    language: Optional[str] = None,
+    tier: Optional[str] = None
+) -> Tuple[str, List[list], dict]:
+    """
+    Sends text to Ollama API for correction and returns the generation telemetry.
     
-    lang_instruction = lang_instructions.get(language, lang_instructions['unknown'])
+    The request waits for an Ollama slot in the correction scheduler, where
+    shorter texts go first. The model comes from the routing table. Sentences
+    of the answer that diverge too far from the text are replaced by the
+    original ones, and the word diff is built from the same alignment.
     
-    prompt = f"""# Correction de texte
+    Args:
+        text (str): The original text to correct
+        priority_class (str): Scheduling class of the request
+        language (Optional[str]): Language already resolved by the caller, detected when None
+        tier (Optional[str]): Tier of the requesting user, used for model routing
+        
+    Returns:
+        Tuple[str, List[list], dict]: The corrected text, its word diff (see
+        utils.diff.diff_blocks), and the model, prompt version and
+        TELEMETRY_FIELDS of the generation
+        
+    Raises:
+        HTTPException: If the Ollama API request fails
+    """
+    # Detect language for better correction context
+    if language is None:
+        language = await detect_language(text)
     
-{lang_instruction}
-
-## INSTRUCTIONS IMPORTANTES:
-1. Conserve EXACTEMENT le style, le dialecte, et le registre de langue de l'auteur
-2. Maintiens les expressions idiomatiques, argot et tournures spécifiques
-3. Ne change PAS le ton ou le niveau de formalité
-4. Corrige UNIQUEMENT:
-   - Les fautes d'orthographe
-   - Les erreurs grammaticales évidentes
-   - La ponctuation incorrecte
-5. NE REFORMULE PAS le texte
-6. NE SIMPLIFIE PAS le vocabulaire
-7. NE CHANGE PAS le dialecte ou l'accent
-8. NE RENVOIE QUE le texte corrigé
-
-## TEXTE À CORRIGER:
-{text}
-
-## RÉPONSE (texte corrigé uniquement):"""
+    prompt = build_prompt(text, language)
 
+    started = None
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                settings.ollama_api_url,
-                json={
-                    "model": settings.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.1  # Lower temperature for more precise corrections
-                }
-            )
-            response.raise_for_status()
-            corrected = response.json()["response"].strip()
-            
-            # Si la réponse est vide ou trop différente de l'original, retourner l'original
-            if not corrected or len(corrected) < len(text) * 0.5 or len(corrected) > len(text) * 2:
-                print(f"Warning: Suspicious correction result, returning original text")
-                return text
-                
-            return corrected
-    except httpx.ConnectError:
-        print("Error: Cannot connect to Ollama API. Service unavailable.")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="OLLAMA_CONNECTION_ERROR"
-        )
-    except httpx.ReadTimeout:
-        print("Error: Timeout connecting to Ollama API.")
-        raise HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail="OLLAMA_TIMEOUT_ERROR"
-        )
-    except Exception as e:
-        print(f"Error connecting to Ollama API: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OLLAMA_GENERAL_ERROR"
-        ) 
\ No newline at end of file
+        async with correction_scheduler.slot(len(text), priority_class):
+            started = time.monotonic()
+            with span("ollama"):
+                data = await _generate_routed(prompt, select_route(len(text), language, tier))
+    except OllamaError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers)
+    except asyncio.CancelledError:
+        # Closing the HTTP request makes Ollama stop generating
+        record_cancellation(len(prompt), started)
+        raise
+
+    # Generation statistics reported by Ollama, durations in nanoseconds
+    if data.get("prompt_eval_duration") is not None:
+        record("ollama_prompt_eval", data["prompt_eval_duration"] / 1e9, f"{data.get('prompt_eval_count', 0)} tokens")
+    if data.get("eval_duration") is not None:
+        record("ollama_eval", data["eval_duration"] / 1e9, f"{data.get('eval_count', 0)} tokens")
+
+    telemetry = {"model": data.get("model"), "prompt_version": PROMPT_VERSION}
+    telemetry.update({field: data.get(field) for field in TELEMETRY_FIELDS})
+
+    corrected = str(data.get("response", "")).strip()
+    
+    # Si la réponse est vide, retourner l'original
+    if not corrected:
+        print(f"Warning: Empty correction result, returning original text")
+        return text, diff_blocks([(text, text)]), telemetry
+
+    # Les phrases trop éloignées de l'original sont remplacées par l'original.
+    # The check is CPU-bound on long texts, keep it off the event loop
+    with span("validation"):
+        corrected, rejected, diff = await asyncio.to_thread(_validate, text, corrected)
+    if rejected:
+        print(f"Warning: Rejected {rejected} divergent sentences in correction result")
+        
+    return corrected, diff, telemetry
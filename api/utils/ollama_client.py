@@ -0,0 +1,322 @@
+import asyncio
+import itertools
+import random
+import time
+from collections import deque
+from typing import Deque, List, Optional
+import httpx
+from fastapi import status
+from config import get_settings
+from utils.circuit_breaker import CircuitBreaker
+from utils.metrics import metrics
+from utils.timing import record
+
+"""
+Ollama Client Module
+
+This module sends generation requests to Ollama. Every request runs within a
+deadline budget: idempotent failures (connection refused or dropped, 502/503/504)
+are retried with jittered exponential backoff while the budget allows. When
+OLLAMA_API_URLS lists several backends, an optional hedged request is sent to
+another one if the first is slower than the recent latency percentile. A
+circuit breaker guards all calls.
+"""
+
+settings = get_settings()
+
+ollama_breaker = CircuitBreaker(
+    "ollama",
+    failure_threshold=settings.ollama_breaker_failure_threshold,
+    error_rate_threshold=settings.ollama_breaker_error_rate,
+    window_seconds=settings.ollama_breaker_window_seconds,
+    min_requests=settings.ollama_breaker_min_requests,
+    open_seconds=settings.ollama_breaker_open_seconds,
+    half_open_probes=settings.ollama_breaker_half_open_probes
+)
+
+metrics.describe("styleguard_ollama_retries_total", "counter", "Ollama attempts retried after an idempotent failure")
+metrics.describe("styleguard_ollama_hedges_total", "counter", "Hedged Ollama requests by winner")
+metrics.describe("styleguard_ollama_cancelled_total", "counter", "Corrections cancelled before Ollama answered, by stage")
+metrics.describe("styleguard_ollama_cancelled_seconds_total", "counter", "Ollama generation time spent on cancelled corrections")
+metrics.describe("styleguard_ollama_recovered_seconds_total", "counter", "Estimated Ollama generation time saved by cancelling corrections")
+
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+class OllamaError(Exception):
+    """
+    Failure of an Ollama request, mapped to the HTTP error returned to clients.
+
+    Attributes:
+        status_code (int): HTTP status returned to the client
+        detail (str): Error key understood by the frontend
+        retryable (bool): Whether sending the same request again is safe and useful
+        headers (Optional[dict]): Extra response headers, such as Retry-After
+        upstream_status (Optional[int]): Status returned by Ollama, None if it did not answer
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+        retryable: bool = False,
+        headers: Optional[dict] = None,
+        upstream_status: Optional[int] = None
+    ):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retryable = retryable
+        self.headers = headers
+        self.upstream_status = upstream_status
+
+class LatencyTracker:
+    """
+    Keeps recent successful request latencies to derive the hedging delay.
+
+    Generation time grows with the text, so latencies are stored per prompt
+    character; otherwise every long text would look like a straggler.
+    """
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float, size: int) -> None:
+        self._samples.append(seconds / max(size, 1))
+
+    def percentile(self, fraction: float, min_samples: int, size: int) -> Optional[float]:
+        """
+        Returns a latency percentile, None until enough samples were collected.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95
+            min_samples (int): Samples required before answering
+            size (int): Prompt length of the request the latency is estimated for
+
+        Returns:
+            Optional[float]: The latency in seconds
+        """
+        if len(self._samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * max(size, 1)
+
+latency_tracker = LatencyTracker()
+
+def record_cancellation(size: int, started: Optional[float]) -> None:
+    """
+    Accounts for a generation cancelled because nobody waits for it anymore.
+
+    The saved time is estimated from the median latency of recent requests
+    of the same size, minus the time the generation already ran.
+
+    Args:
+        size (int): Prompt length of the cancelled request
+        started (Optional[float]): Monotonic time the request was sent, None if it was still queued
+    """
+    elapsed = time.monotonic() - started if started is not None else 0.0
+    metrics.inc("styleguard_ollama_cancelled_total", stage="generating" if started is not None else "queued")
+    metrics.inc("styleguard_ollama_cancelled_seconds_total", elapsed)
+    expected = latency_tracker.percentile(0.5, 1, size)
+    if expected is not None:
+        metrics.inc("styleguard_ollama_recovered_seconds_total", max(expected - elapsed, 0.0))
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _shared_client() -> httpx.AsyncClient:
+    """
+    Returns the HTTP client shared by every generation of this event loop.
+
+    Reusing one client keeps connections to Ollama alive between requests and
+    avoids building a new client, SSL context included, for every correction.
+    Timeouts are set per request.
+
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(timeout=settings.ollama_deadline_seconds)
+        _client_loop = loop
+    return _client
+
+async def close_client() -> None:
+    """
+    Closes the shared HTTP client and its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def _backend_urls() -> List[str]:
+    extra = [url.strip() for url in settings.ollama_api_urls.split(",") if url.strip()]
+    return extra or [settings.ollama_api_url]
+
+_backends = itertools.cycle(range(len(_backend_urls())))
+
+async def _post(client: httpx.AsyncClient, url: str, payload: dict, timeout: float) -> dict:
+    """
+    Sends a single generation request and classifies its failure.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client
+        url (str): The Ollama generate endpoint
+        payload (dict): The generation request body
+        timeout (float): Seconds left for this request
+
+    Returns:
+        dict: The decoded Ollama response
+
+    Raises:
+        OllamaError: If the request fails or the circuit is open
+    """
+    if timeout <= 0:
+        raise OllamaError(status.HTTP_504_GATEWAY_TIMEOUT, "OLLAMA_TIMEOUT_ERROR")
+    if not ollama_breaker.allow():
+        print("Error: Ollama circuit is open, failing fast.")
+        raise OllamaError(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "OLLAMA_CONNECTION_ERROR",
+            headers={"Retry-After": str(max(int(ollama_breaker.retry_after()), 1))}
+        )
+
+    try:
+        sent = time.perf_counter()
+        response = await client.send(client.build_request("POST", url, json=payload, timeout=timeout), stream=True)
+        # Without streaming, Ollama only sends the headers once the whole generation is
+        # done: this is the time of the last attempt, not the time to the first token
+        answered = time.perf_counter() - sent
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+    except httpx.ConnectError:
+        ollama_breaker.record_failure()
+        print("Error: Cannot connect to Ollama API. Service unavailable.")
+        raise OllamaError(status.HTTP_503_SERVICE_UNAVAILABLE, "OLLAMA_CONNECTION_ERROR", retryable=True)
+    except httpx.TimeoutException:
+        ollama_breaker.record_failure()
+        print("Error: Timeout connecting to Ollama API.")
+        raise OllamaError(status.HTTP_504_GATEWAY_TIMEOUT, "OLLAMA_TIMEOUT_ERROR")
+    except httpx.TransportError as e:
+        # Connection dropped mid-generation: nothing was committed, resending is safe
+        ollama_breaker.record_failure()
+        print(f"Error: Ollama connection dropped: {e}")
+        raise OllamaError(status.HTTP_500_INTERNAL_SERVER_ERROR, "OLLAMA_GENERAL_ERROR", retryable=True)
+    except BaseException:
+        ollama_breaker.release()
+        raise
+
+    if response.status_code >= 500:
+        ollama_breaker.record_failure()
+    else:
+        ollama_breaker.record_success()
+    if response.status_code >= 400:
+        print(f"Error: Ollama API returned status {response.status_code}")
+        raise OllamaError(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "OLLAMA_GENERAL_ERROR",
+            retryable=response.status_code in RETRYABLE_STATUS_CODES,
+            upstream_status=response.status_code
+        )
+    record("ollama_response", answered)
+    try:
+        return response.json()
+    except ValueError:
+        print("Error: Ollama API returned an invalid response")
+        raise OllamaError(status.HTTP_500_INTERNAL_SERVER_ERROR, "OLLAMA_GENERAL_ERROR")
+
+async def _hedged_post(client: httpx.AsyncClient, payload: dict, deadline: float) -> dict:
+    """
+    Sends a request and, if it is slower than the latency percentile, a second
+    one to the next backend. The first success wins and the other is cancelled.
+    With a single backend no hedge is sent.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client
+        payload (dict): The generation request body
+        deadline (float): Monotonic time at which the budget runs out
+
+    Returns:
+        dict: The decoded Ollama response
+    """
+    urls = _backend_urls()
+    first = next(_backends)
+    size = len(payload.get("prompt", ""))
+    hedge_delay = None
+    # A hedge sent to the same backend only doubles its load
+    if settings.ollama_hedge_enabled and len(urls) > 1:
+        hedge_delay = latency_tracker.percentile(
+            settings.ollama_hedge_percentile,
+            settings.ollama_hedge_min_samples,
+            size
+        )
+
+    start = time.monotonic()
+    if hedge_delay is None or hedge_delay >= deadline - start:
+        result = await _post(client, urls[first], payload, deadline - start)
+        latency_tracker.record(time.monotonic() - start, size)
+        return result
+
+    primary = asyncio.create_task(_post(client, urls[first], payload, deadline - start))
+
+    tasks = {primary}
+    hedged = False
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if not done:
+            hedge_url = urls[(first + 1) % len(urls)]
+            tasks.add(asyncio.create_task(_post(client, hedge_url, payload, deadline - time.monotonic())))
+            hedged = True
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if hedged:
+                        metrics.inc("styleguard_ollama_hedges_total", winner="primary" if task is primary else "hedge")
+                    latency_tracker.record(time.monotonic() - start, size)
+                    return task.result()
+        # Every attempt failed: surface the primary's error
+        raise primary.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+async def generate(payload: dict, deadline_seconds: Optional[float] = None) -> dict:
+    """
+    Runs an Ollama generation within a deadline budget.
+
+    Args:
+        payload (dict): The generation request body
+        deadline_seconds (Optional[float]): Time budget, defaults to ollama_deadline_seconds
+
+    Returns:
+        dict: The decoded Ollama response
+
+    Raises:
+        OllamaError: If no attempt succeeded within the budget
+    """
+    budget = deadline_seconds or settings.ollama_deadline_seconds
+    deadline = time.monotonic() + budget
+    attempt = 0
+    client = _shared_client()
+    while True:
+        attempt += 1
+        try:
+            return await _hedged_post(client, payload, deadline)
+        except OllamaError as e:
+            if not e.retryable or attempt >= settings.ollama_retry_max_attempts:
+                raise
+            # Full jitter keeps retries from synchronizing across requests
+            backoff = random.uniform(0, min(
+                settings.ollama_retry_max_delay,
+                settings.ollama_retry_base_delay * 2 ** (attempt - 1)
+            ))
+            if time.monotonic() + backoff >= deadline:
+                raise
+            metrics.inc("styleguard_ollama_retries_total", reason=e.detail)
+            await asyncio.sleep(backoff)
@@ -0,0 +1,140 @@
+import asyncio
+import cProfile
+import hmac
+import json
+import os
+import random
+import time
+from typing import List, Optional
+from config import get_settings
+from utils.timing import RequestTimings, timed_request
+
+"""
+Profiling Module
+
+This module provides an ASGI middleware that profiles selected requests. A
+request is profiled when it carries the X-Profile header with the configured
+admin token, or when it is drawn by the sampling rate. Profiled requests get
+a cProfile capture and their wall-clock spans written to a bounded directory;
+the oldest profiles are removed first.
+
+cProfile follows the event loop thread, so a capture also contains whatever
+other requests ran concurrently; the spans are specific to the request. Only
+one capture runs at a time, other selected requests keep just their spans.
+"""
+
+settings = get_settings()
+
+PROFILE_HEADER = b"x-profile"
+
+_capture_active = False
+
+def _selected(scope: dict) -> bool:
+    """
+    Decides whether a request is profiled.
+
+    Args:
+        scope (dict): The ASGI connection scope
+
+    Returns:
+        bool: True if the request carries the admin token or is sampled
+    """
+    if settings.profiling_token:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, settings.profiling_token.encode())
+    return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+def _write_profile(
+    profiler: Optional[cProfile.Profile],
+    timings: RequestTimings,
+    scope: dict,
+    status_code: int,
+    duration: float
+) -> None:
+    """
+    Writes a profile and removes the oldest ones beyond the configured limit.
+
+    Args:
+        profiler (Optional[cProfile.Profile]): The CPU profile, None if another capture was running
+        timings (RequestTimings): The request's wall-clock spans
+        scope (dict): The ASGI connection scope
+        status_code (int): The response status
+        duration (float): Total request duration in seconds
+    """
+    directory = settings.profiling_dir
+    os.makedirs(directory, exist_ok=True)
+    path_slug = scope["path"].strip("/").replace("/", "_") or "root"
+    now = time.time()
+    base = os.path.join(
+        directory,
+        f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1_000_000) % 1_000_000:06d}"
+        f"-{scope['method']}-{path_slug}"
+    )
+
+    if profiler is not None:
+        profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}.json", "w", encoding="utf-8") as handle:
+        json.dump({
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "cpu_profile": f"{os.path.basename(base)}.prof" if profiler is not None else None,
+            "spans": [
+                {"name": name, "start_ms": round(start * 1000, 3), "duration_ms": round(span * 1000, 3)}
+                for name, start, span in timings.spans
+            ]
+        }, handle, indent=2)
+
+    # Rotate: keep the newest profiling_max_files requests
+    names: List[str] = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    for name in names[:max(len(names) - settings.profiling_max_files, 0)]:
+        stem = os.path.join(directory, name[:-len(".json")])
+        for suffix in (".json", ".prof"):
+            try:
+                os.remove(stem + suffix)
+            except FileNotFoundError:
+                pass
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware capturing a CPU profile and spans for selected requests.
+    Does nothing unless PROFILING_TOKEN or PROFILING_SAMPLE_RATE is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _capture_active
+        if scope["type"] != "http" or not _selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = None
+        if not _capture_active:
+            _capture_active = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            with timed_request() as timings:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                _capture_active = False
+            try:
+                await asyncio.to_thread(_write_profile, profiler, timings, scope, status_code, duration)
+            except OSError as e:
+                print(f"Error writing request profile: {e}")
@@ -0,0 +1,62 @@
+from typing import Dict
+
+"""
+Prompt Templates Module
+
+This module holds the versioned prompt templates used for corrections. The
+layout keeps the longest part stable: a fixed system prefix, shared by every
+request, then the language hint, then the user text. The prefix is sent as
+Ollama's system prompt, so it is the same token sequence at the start of every
+request and Ollama can reuse its evaluated KV cache instead of evaluating the
+instructions again. The templates are assembled once at import time.
+
+Bump PROMPT_VERSION whenever a template changes, corrections record it.
+"""
+
+PROMPT_VERSION = "2"
+
+SYSTEM_PREFIX = """# Correction de texte
+
+## INSTRUCTIONS IMPORTANTES:
+1. Conserve EXACTEMENT le style, le dialecte, et le registre de langue de l'auteur
+2. Maintiens les expressions idiomatiques, argot et tournures spécifiques
+3. Ne change PAS le ton ou le niveau de formalité
+4. Corrige UNIQUEMENT:
+   - Les fautes d'orthographe
+   - Les erreurs grammaticales évidentes
+   - La ponctuation incorrecte
+5. NE REFORMULE PAS le texte
+6. NE SIMPLIFIE PAS le vocabulaire
+7. NE CHANGE PAS le dialecte ou l'accent
+8. NE RENVOIE QUE le texte corrigé"""
+
+# Language-specific instructions
+LANGUAGE_HINTS: Dict[str, str] = {
+    'fr': "Ce texte est en français. Corrigez uniquement les fautes d'orthographe et de grammaire.",
+    'en': "This text is in English. Correct only spelling and grammar mistakes.",
+    'es': "Este texto está en español. Corrige solo los errores ortográficos y gramaticales.",
+    'de': "Dieser Text ist auf Deutsch. Korrigiere nur Rechtschreib- und Grammatikfehler.",
+    'it': "Questo testo è in italiano. Correggi solo errori di ortografia e grammatica.",
+    'ru': "Этот текст на русском языке. Исправьте только орфографические и грамматические ошибки.",
+    'pl': "Ten tekst jest w języku polskim. Popraw tylko błędy ortograficzne i gramatyczne.",
+    'unknown': "Correct only spelling and grammar mistakes in this text, regardless of language."
+}
+
+_PROMPT_HEADS: Dict[str, str] = {
+    language: f"{hint}\n\n## TEXTE À CORRIGER:\n"
+    for language, hint in LANGUAGE_HINTS.items()
+}
+_PROMPT_TAIL = "\n\n## RÉPONSE (texte corrigé uniquement):"
+
+def build_prompt(text: str, language: str) -> str:
+    """
+    Builds the per-request part of the prompt: the language hint, then the text.
+
+    Args:
+        text (str): The text to correct
+        language (str): ISO language code or 'unknown'
+
+    Returns:
+        str: The prompt to send along with SYSTEM_PREFIX
+    """
+    return _PROMPT_HEADS.get(language, _PROMPT_HEADS['unknown']) + text + _PROMPT_TAIL
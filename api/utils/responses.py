@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+"""
+Response Utilities Module
+
+This module provides a fast JSON response path that serializes plain row
+data directly, bypassing ORM hydration and Pydantic re-validation.
+"""
+
+def _default(value: Any) -> Any:
+    """
+    Fallback encoder for the standard json module.
+
+    Args:
+        value (Any): A value json cannot serialize natively
+
+    Returns:
+        Any: A JSON-serializable representation
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes content to JSON bytes, using orjson when it is installed.
+
+    Args:
+        content (Any): The content to serialize
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with the fastest available encoder.
+
+    Content must already be made of plain dicts, lists and scalars.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def rows_to_dicts(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+    """
+    Converts row tuples into dictionaries without building ORM objects.
+
+    Args:
+        keys (Sequence[str]): The column names, in row order
+        rows (Iterable[Sequence[Any]]): The row tuples
+
+    Returns:
+        list[dict]: One dictionary per row
+    """
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,257 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import Dict, List, Set, Tuple
+from fastapi import HTTPException, status
+from config import get_settings
+from utils.metrics import metrics
+from utils.timing import span
+
+"""
+Scheduler Module
+
+This module orders pending correction work in front of Ollama. Jobs run
+shortest-first by estimated cost (input length), so one large document no
+longer blocks every short message queued behind it. Waiting jobs age: their
+effective cost shrinks with the time they spent queued, so large jobs are
+never starved. Priority classes scale the cost of a job.
+
+The queue lives in each worker process: OLLAMA_MAX_CONCURRENCY is divided
+between the WEB_CONCURRENCY workers, and a worker only reorders its own jobs.
+
+On shutdown the scheduler drains: queued and new jobs are refused with
+SchedulerDraining while the running ones are given time to finish.
+"""
+
+settings = get_settings()
+
+metrics.describe("styleguard_scheduler_wait_seconds", "summary", "Time spent queued before reaching Ollama")
+metrics.describe("styleguard_scheduler_queued", "gauge", "Correction jobs waiting for an Ollama slot")
+
+def _parse_pairs(spec: str) -> Dict[str, str]:
+    """
+    Parses a "key=value,key=value" setting.
+
+    Args:
+        spec (str): The setting value
+
+    Returns:
+        Dict[str, str]: The parsed pairs
+    """
+    pairs = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            pairs[key.strip()] = value.strip()
+    return pairs
+
+_user_classes = _parse_pairs(settings.scheduler_user_classes)
+
+def priority_class_for(user_id: int, endpoint_class: str) -> str:
+    """
+    Resolves the priority class of a correction: the user's configured class
+    when there is one, otherwise the class of the endpoint it came from.
+
+    Args:
+        user_id (int): The ID of the requesting user
+        endpoint_class (str): The class assigned by the endpoint
+
+    Returns:
+        str: The priority class name
+    """
+    return _user_classes.get(str(user_id), endpoint_class)
+
+class SchedulerDraining(HTTPException):
+    """
+    Raised to jobs that cannot start because the worker is shutting down.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SERVICE_DRAINING",
+            headers={"Retry-After": "5"}
+        )
+
+class CorrectionScheduler:
+    """
+    Admission queue limiting concurrent Ollama work, ordered by aged cost.
+
+    A job's priority key is cost * class_weight - aging_rate * waited_seconds.
+    Since the waited time grows at the same pace for every queued job, the key
+    can be computed once at enqueue time as cost * weight + aging_rate * enqueue_time,
+    which keeps the queue a plain heap.
+    """
+
+    def __init__(self, max_concurrency: int, aging_rate: float, class_weights: Dict[str, float]):
+        """
+        Args:
+            max_concurrency (int): Jobs allowed to run at the same time
+            aging_rate (float): Cost units (characters) a queued job gains per second
+            class_weights (Dict[str, float]): Cost multiplier per priority class
+        """
+        self.max_concurrency = max(max_concurrency, 1)
+        self.aging_rate = aging_rate
+        self.class_weights = class_weights
+        self._active = 0
+        self._heap: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._holders: Set[asyncio.Task] = set()
+        self.draining = False
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._heap if not future.done())
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrency and self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            if future.done():
+                continue  # Waiter cancelled while queued
+            self._active += 1
+            future.set_result(None)
+        metrics.set("styleguard_scheduler_queued", self.queued)
+
+    async def acquire(self, cost: int, priority_class: str = "default") -> float:
+        """
+        Waits for an Ollama slot.
+
+        Args:
+            cost (int): Estimated cost of the job, its input length
+            priority_class (str): Priority class of the job
+
+        Returns:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            SchedulerDraining: If the scheduler drains before the job could start
+        """
+        if self.draining:
+            raise SchedulerDraining()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if self._active < self.max_concurrency and not self._heap:
+            self._active += 1
+            metrics.observe("styleguard_scheduler_wait_seconds", 0.0, priority=priority_class)
+            return 0.0
+
+        weight = self.class_weights.get(priority_class, 1.0)
+        key = cost * weight + self.aging_rate * start
+        future = loop.create_future()
+        heapq.heappush(self._heap, (key, next(self._sequence), future))
+        metrics.set("styleguard_scheduler_queued", self.queued)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before the cancellation
+                self.release()
+            else:
+                future.cancel()
+                metrics.set("styleguard_scheduler_queued", self.queued)
+            raise
+        waited = loop.time() - start
+        metrics.observe("styleguard_scheduler_wait_seconds", waited, priority=priority_class)
+        return waited
+
+    def release(self) -> None:
+        """
+        Frees a slot and starts the next queued job.
+        """
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, cost: int, priority_class: str = "default"):
+        """
+        Holds an Ollama slot for the duration of the block.
+
+        Args:
+            cost (int): Estimated cost of the job, its input length
+            priority_class (str): Priority class of the job
+
+        Yields:
+            float: Seconds spent waiting in the queue
+        """
+        with span("queue"):
+            waited = await self.acquire(cost, priority_class)
+        task = asyncio.current_task()
+        self._holders.add(task)
+        try:
+            yield waited
+        finally:
+            self._holders.discard(task)
+            self.release()
+
+    def drain(self) -> int:
+        """
+        Stops admitting jobs: queued jobs and later ones fail with SchedulerDraining.
+        Running jobs are not affected.
+
+        Returns:
+            int: The number of queued jobs refused
+        """
+        self.draining = True
+        refused = 0
+        for _, _, future in self._heap:
+            if not future.done():
+                future.set_exception(SchedulerDraining())
+                refused += 1
+        self._heap.clear()
+        metrics.set("styleguard_scheduler_queued", 0)
+        return refused
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Waits for the running jobs to finish.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if no job is running anymore
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._active and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        return not self._active
+
+    def cancel_running(self) -> int:
+        """
+        Cancels the tasks holding a slot, once the shutdown grace period is over.
+
+        Returns:
+            int: The number of cancelled tasks
+        """
+        for task in self._holders:
+            task.cancel()
+        return len(self._holders)
+
+def worker_concurrency(total: int, workers: int) -> int:
+    """
+    Splits the Ollama concurrency limit between the worker processes.
+
+    Each worker schedules its own jobs, so the limit is divided rather than
+    shared. A worker always keeps one slot, so with more workers than the
+    limit Ollama receives one correction per worker.
+
+    Args:
+        total (int): Corrections allowed at the same time across all workers
+        workers (int): Number of worker processes
+
+    Returns:
+        int: Corrections one worker may send at the same time
+    """
+    return max(total // max(workers, 1), 1)
+
+correction_scheduler = CorrectionScheduler(
+    worker_concurrency(settings.ollama_max_concurrency, settings.web_concurrency),
+    settings.scheduler_aging_rate,
+    {name: float(weight) for name, weight in _parse_pairs(settings.scheduler_class_weights).items()}
+)
@@ -5,8 +5,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from config import get_settings
-from database import get_session
+from database import get_read_session
 from models import User
+from utils.timing import span
 
 """
 Security Utilities Module
@@ -107,19 +108,16 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_session)
-) -> User:
+async def authenticate_access_token(token: str, db: AsyncSession) -> User:
     """
-    Validates the access token and returns the current user.
+    Validates an access token and loads its user.
     
     Args:
-        token (str): The JWT token from the request
+        token (str): The JWT access token
         db (AsyncSession): The database session
         
     Returns:
-        User: The current authenticated user
+        User: The user the token was issued to
         
     Raises:
         HTTPException: If the token is invalid or expired
@@ -143,9 +141,33 @@ async def get_current_user(
         )
     return user
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_session)
+) -> User:
+    """
+    Validates the access token and returns the current user.
+    
+    Args:
+        token (str): The JWT token from the request
+        db (AsyncSession): The database session
+        
+    Returns:
+        User: The current authenticated user
+        
+    Raises:
+        HTTPException: If the token is invalid or expired
+    """
+    with span("auth"):
+        user = await authenticate_access_token(token, db)
+        # End the read transaction: a slow request would otherwise keep the
+        # connection checked out and pin the WAL snapshot
+        await db.commit()
+        return user
+
 async def get_refresh_user(
     token: str,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ) -> User:
     """
     Validates the refresh token and returns the user.
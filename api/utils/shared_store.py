@@ -0,0 +1,172 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from config import get_settings
+
+"""
+Shared Store Module
+
+This module provides a small key-value store backed by a local SQLite file.
+Every worker process of the API opens the same file, so state kept here
+(leases, counters, cached results) stays consistent when uvicorn runs
+with several workers.
+"""
+
+settings = get_settings()
+
+class SharedStore:
+    """
+    Cross-process key-value store with per-key expiry and atomic operations.
+
+    Values are JSON-encoded. Blocking SQLite calls run in a worker thread so
+    the event loop is never stalled by lock contention between processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the SQLite file shared by all workers
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "expires_at REAL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _run(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    async def _execute(self, sql: str, params: tuple = ()) -> list:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl is not None else None
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the value stored under a key.
+
+        Args:
+            key (str): The key to read
+            default (Any): Returned when the key is missing or expired
+
+        Returns:
+            Any: The decoded value
+        """
+        rows = await self._execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        )
+        return json.loads(rows[0][0]) if rows else default
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, replacing any previous one.
+
+        Args:
+            key (str): The key to write
+            value (Any): A JSON-serializable value
+            ttl (Optional[float]): Lifetime in seconds, None never expires
+        """
+        await self._execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, json.dumps(value), self._expiry(ttl))
+        )
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Stores a value only if the key is absent or expired.
+
+        This is an atomic claim across processes, suitable for leases and
+        for electing the single worker that performs a piece of work.
+
+        Args:
+            key (str): The key to claim
+            value (Any): A JSON-serializable value
+            ttl (Optional[float]): Lifetime in seconds, None never expires
+
+        Returns:
+            bool: True if this call stored the value
+        """
+        rows = await self._execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE kv.expires_at IS NOT NULL AND kv.expires_at <= ? "
+            "RETURNING key",
+            (key, json.dumps(value), self._expiry(ttl), time.time())
+        )
+        return bool(rows)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Atomically increments an integer counter, starting from 0.
+
+        An expired counter restarts from 0, which makes fixed-window counters trivial.
+
+        Args:
+            key (str): The counter key
+            amount (int): The increment
+            ttl (Optional[float]): Lifetime of a newly created counter in seconds
+
+        Returns:
+            int: The counter value after the increment
+        """
+        now = time.time()
+        rows = await self._execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= ? "
+            "THEN excluded.value ELSE CAST(kv.value AS INTEGER) + ? END, "
+            "expires_at = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= ? "
+            "THEN excluded.expires_at ELSE kv.expires_at END "
+            "RETURNING value",
+            (key, str(amount), self._expiry(ttl), now, amount, now)
+        )
+        return int(rows[0][0])
+
+    async def delete(self, key: str) -> None:
+        """
+        Removes a key.
+
+        Args:
+            key (str): The key to remove
+        """
+        await self._execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    async def purge_expired(self) -> int:
+        """
+        Removes every expired key.
+
+        Returns:
+            int: The number of removed keys
+        """
+        rows = await self._execute(
+            "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ? RETURNING key",
+            (time.time(),)
+        )
+        return len(rows)
+
+shared_store = SharedStore(settings.shared_store_path)
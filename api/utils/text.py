@@ -0,0 +1,177 @@
+import re
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+
+"""
+Text Utilities Module
+
+This module provides helpers that derive compact metadata from correction
+texts at write time, so history listings never need the full texts.
+"""
+
+PREVIEW_LENGTH = 120
+
+_WHITESPACE = re.compile(r"\s+")
+
+def make_preview(text: str, length: int = PREVIEW_LENGTH) -> str:
+    """
+    Builds a single-line preview of a text.
+
+    Args:
+        text (str): The text to preview
+        length (int): Maximum number of characters kept
+
+    Returns:
+        str: The collapsed text, truncated with an ellipsis if needed
+    """
+    collapsed = _WHITESPACE.sub(" ", text[:length * 2]).strip()
+    if len(collapsed) <= length and len(text) <= length * 2:
+        return collapsed
+    return collapsed[:length - 1].rstrip() + "…"
+
+def _common_affixes(a: Sequence, b: Sequence) -> Tuple[int, int]:
+    # Lengths of the common prefix and of the common suffix after it
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    limit -= start
+    while end < limit and a[-1 - end] == b[-1 - end]:
+        end += 1
+    return start, end
+
+def _furthest_reaching(a: Sequence, b: Sequence, max_distance: int, trace: Optional[list] = None) -> Optional[int]:
+    # Myers' forward search, recording the furthest points before each round in trace
+    n, m = len(a), len(b)
+    offset = max_distance + 1
+    # Furthest x reached on each diagonal k = x - y, -1 when not reached yet
+    furthest = [-1] * (2 * max_distance + 3)
+    for d in range(max_distance + 1):
+        if trace is not None:
+            trace.append(furthest[:])
+        # Diagonals of the same parity as d, clipped to the grid
+        low = max(-d, -m)
+        low += (low - d) % 2
+        for k in range(low, min(d, n) + 1, 2):
+            if d == 0:
+                x = 0
+            else:
+                # Come down from diagonal k + 1 (insertion) or right from k - 1 (deletion)
+                down = furthest[offset + k + 1] if k < d else -1
+                if down - k > m:
+                    down = -1
+                right = furthest[offset + k - 1] if k > -d else -1
+                right = right + 1 if 0 <= right < n else -1
+                x = down if down > right else right
+                if x < 0:
+                    continue
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            furthest[offset + k] = x
+            if x >= n and y >= m:
+                return d
+    return None
+
+def bounded_edit_distance(a: Sequence, b: Sequence, max_distance: int) -> Optional[int]:
+    """
+    Computes the insertion/deletion edit distance between two token sequences,
+    giving up as soon as it exceeds max_distance.
+
+    Uses Myers' greedy algorithm restricted to the 2k+1 diagonals around the
+    main one, so the cost is O((n + m)·k) time and O(k) memory for a bound k,
+    and close to linear when the sequences are similar. A replaced token
+    counts as one deletion and one insertion.
+
+    Args:
+        a (Sequence): The first sequence, usually words
+        b (Sequence): The second sequence
+        max_distance (int): The bound k
+
+    Returns:
+        Optional[int]: The distance, None if it is larger than max_distance
+    """
+    start, end = _common_affixes(a, b)
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    n, m = len(a), len(b)
+    if not n or not m:
+        return n + m if n + m <= max_distance else None
+    if abs(n - m) > max_distance:
+        return None
+    # Every insertion or deletion changes one word count by one: a cheap lower bound
+    counts = Counter(a)
+    counts.subtract(b)
+    if sum(map(abs, counts.values())) > max_distance:
+        return None
+    return _furthest_reaching(a, b, max_distance)
+
+def edit_script(a: Sequence, b: Sequence, max_distance: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Computes a shortest edit script between two token sequences, giving up as
+    soon as it needs more than max_distance insertions and deletions.
+
+    Runs the search of bounded_edit_distance while recording the furthest
+    points of each round, then walks them back from the end, so memory grows
+    with the square of the bound rather than with the sequence lengths.
+
+    Args:
+        a (Sequence): The first sequence, usually words
+        b (Sequence): The second sequence
+        max_distance (int): The bound k
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: Runs of (operation, token count) in
+        order, 0 keeping tokens of both, -1 deleting tokens of a and 1 inserting
+        tokens of b; None if the distance is larger than max_distance
+    """
+    start, end = _common_affixes(a, b)
+    core_a, core_b = a[start:len(a) - end], b[start:len(b) - end]
+    n, m = len(core_a), len(core_b)
+
+    runs: List[Tuple[int, int]] = []
+    if n and m:
+        counts = Counter(core_a)
+        counts.subtract(core_b)
+        if sum(map(abs, counts.values())) > max_distance:
+            return None
+        trace: list = []
+        distance = _furthest_reaching(core_a, core_b, max_distance, trace)
+        if distance is None:
+            return None
+        offset = max_distance + 1
+        x, y = n, m
+        for d in range(distance, 0, -1):
+            # Find the move of round d that reached (x, y), as the search chose it
+            furthest = trace[d]
+            k = x - y
+            down = furthest[offset + k + 1] if k < d else -1
+            if down - k > m:
+                down = -1
+            right = furthest[offset + k - 1] if k > -d else -1
+            right = right + 1 if 0 <= right < n else -1
+            begin = max(down, right)
+            runs.append((0, x - begin))
+            if down >= right:
+                runs.append((1, 1))
+                x, y = begin, begin - k - 1
+            else:
+                runs.append((-1, 1))
+                x, y = begin - 1, begin - k
+        runs.append((0, x))
+        runs.reverse()
+    elif n + m > max_distance:
+        return None
+    else:
+        runs = [(-1, n), (1, m)]
+
+    script: List[Tuple[int, int]] = []
+    for op, count in [(0, start)] + runs + [(0, end)]:
+        if not count:
+            continue
+        if script and script[-1][0] == op:
+            script[-1] = (op, script[-1][1] + count)
+        else:
+            script.append((op, count))
+    return script
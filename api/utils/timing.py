@@ -0,0 +1,166 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+"""
+Request Timing Module
+
+This module records wall-clock spans for the phases of a request (auth,
+language detection, queue wait, Ollama, database write...). Code marks a
+phase with span(); the spans land on the timings of the current request,
+or nowhere when no request is being timed, so instrumented code costs only
+a context variable lookup. ServerTimingMiddleware reports them to clients in
+the Server-Timing header.
+"""
+
+class RequestTimings:
+    """
+    Spans recorded during one request.
+
+    Attributes:
+        started (float): perf_counter() value at the start of the request
+        spans (List[Tuple[str, float, float]]): Name, start offset and duration of each span, in seconds
+        descriptions (Dict[str, str]): Extra detail per phase, such as token counts
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []
+        self.descriptions: Dict[str, str] = {}
+
+    def add(self, name: str, duration: float, start: Optional[float] = None) -> None:
+        """
+        Records a span.
+
+        Args:
+            name (str): The phase name
+            duration (float): The span duration in seconds
+            start (Optional[float]): perf_counter() value at the start of the span, defaults to now - duration
+        """
+        if start is None:
+            start = time.perf_counter() - duration
+        self.spans.append((name, start - self.started, duration))
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Sums the spans by phase, in recording order.
+
+        Returns:
+            Dict[str, float]: Total seconds spent per phase
+        """
+        totals: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current_timings() -> Optional[RequestTimings]:
+    """
+    Returns the timings of the request being handled, None if it is not timed.
+    """
+    return _current.get()
+
+@contextmanager
+def timed_request():
+    """
+    Times the request handled inside the block. Tasks created within share
+    the timings; a nested call reuses the timings already started.
+
+    Yields:
+        RequestTimings: The request's timings
+    """
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def span(name: str):
+    """
+    Records the wall-clock duration of a block on the current request's timings.
+
+    Args:
+        name (str): The phase name
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start, start)
+
+def record(name: str, seconds: float, description: Optional[str] = None) -> None:
+    """
+    Records a duration measured elsewhere, for example reported by Ollama.
+
+    Args:
+        name (str): The phase name
+        seconds (float): The duration in seconds
+        description (Optional[str]): Extra detail shown with the duration
+    """
+    timings = _current.get()
+    if timings is None:
+        return
+    timings.add(name, seconds)
+    if description is not None:
+        timings.descriptions[name] = description
+
+def server_timing_header(timings: RequestTimings) -> str:
+    """
+    Formats timings as a Server-Timing header value.
+
+    Args:
+        timings (RequestTimings): The request's timings
+
+    Returns:
+        str: The header value, durations in milliseconds
+    """
+    metrics = []
+    for name, seconds in timings.totals().items():
+        metric = f"{name};dur={seconds * 1000:.1f}"
+        if name in timings.descriptions:
+            metric += f';desc="{timings.descriptions[name]}"'
+        metrics.append(metric)
+    metrics.append(f"total;dur={(time.perf_counter() - timings.started) * 1000:.1f}")
+    return ", ".join(metrics)
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware timing the requests under a path prefix and sending the
+    breakdown in the Server-Timing header.
+    """
+
+    def __init__(self, app, path_prefix: str = "/"):
+        """
+        Args:
+            app: The wrapped ASGI application
+            path_prefix (str): Only requests under this path are timed
+        """
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        with timed_request() as timings:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing_header(timings).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)